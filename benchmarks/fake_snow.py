@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# Copyright 2026 Snowflake Inc.
+# Generated with Cortex Code
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Stand-in for the ``snow`` CLI used by the benchmark harness.
+
+Every invocation is appended to ``$SNOW_BENCH_LOG`` (JSON lines), sleeps
+``$SNOW_BENCH_LATENCY_MS`` (default 50) to model the CLI's connection and
+round-trip cost, and answers with canned JSON describing a fresh account:
+no network rules/policies or PATs exist, PATs and external volumes can be
+created and verified.
+
+Extra responses can be supplied in ``$SNOW_BENCH_RESPONSES``, a JSON list of
+``{"match": <regex>, "stdout": <json>, "returncode": <int>, "stderr": <str>}``
+checked before the defaults against the query (or ``snow`` arguments).
+"""
+
+import json
+import os
+import re
+import sys
+import time
+
+SNOWFLAKE_IAM_USER_ARN = "arn:aws:iam::123456789012:user/bench-snowflake-user"
+
+# (pattern, stdout, returncode, stderr) -- first match wins.
+DEFAULT_RESPONSES = [
+    (r"^connection test", {"Account": "BENCH_ACCOUNT", "User": "BENCH_ADMIN"}, 0, ""),
+    (r"^connection list", [{"connection_name": "bench", "is_default": True}], 0, ""),
+    (r"\b(ADD|ROTATE) PAT\b", [{"token_secret": "bench-token-secret"}], 0, ""),
+    (r"^SHOW USER PATS\b", [], 0, ""),
+    (r"^DESC NETWORK (RULE|POLICY)\b", None, 1, "Object does not exist or not authorized."),
+    (
+        r"^DESC EXTERNAL VOLUME\b",
+        [
+            {
+                "parent_property": "STORAGE_LOCATIONS",
+                "property": "STORAGE_LOCATION_1",
+                "property_value": json.dumps(
+                    {
+                        "STORAGE_AWS_IAM_USER_ARN": SNOWFLAKE_IAM_USER_ARN,
+                        "STORAGE_AWS_EXTERNAL_ID": "bench_external_id",
+                    }
+                ),
+            }
+        ],
+        0,
+        "",
+    ),
+    (
+        r"SYSTEM\$VERIFY_EXTERNAL_VOLUME",
+        [
+            {
+                "SYSTEM$VERIFY_EXTERNAL_VOLUME": json.dumps(
+                    {"success": True, "storageLocationSelectionResult": "PASSED"}
+                )
+            }
+        ],
+        0,
+        "",
+    ),
+    (r"^(SHOW|SELECT)\b", [], 0, ""),
+]
+
+
+def _load_responses() -> list[tuple]:
+    """Custom responses from $SNOW_BENCH_RESPONSES followed by the defaults."""
+    responses = []
+    path = os.environ.get("SNOW_BENCH_RESPONSES")
+    if path:
+        for item in json.loads(open(path).read()):
+            responses.append(
+                (
+                    item["match"],
+                    item.get("stdout"),
+                    item.get("returncode", 0),
+                    item.get("stderr", ""),
+                )
+            )
+    return responses + DEFAULT_RESPONSES
+
+
+def _statement(args: list[str], stdin: str) -> str:
+    """The SQL being run, or the ``snow`` arguments for non-SQL commands."""
+    for flag in ("--query", "-q"):
+        if flag in args:
+            return args[args.index(flag) + 1].strip()
+    if "--stdin" in args:
+        return stdin.strip()
+    return " ".join(args)
+
+
+def main() -> int:
+    args = sys.argv[1:]
+    stdin = sys.stdin.read() if "--stdin" in args else ""
+    statement = _statement(args, stdin)
+
+    log_path = os.environ.get("SNOW_BENCH_LOG")
+    if log_path:
+        with open(log_path, "a") as f:
+            f.write(json.dumps({"args": args, "statement": statement}) + "\n")
+
+    time.sleep(float(os.environ.get("SNOW_BENCH_LATENCY_MS", "50")) / 1000)
+
+    if "--stdin" in args or "-f" in args:
+        # Scripts: success with no rows, like `snow sql` for DDL.
+        return 0
+
+    for pattern, stdout, returncode, stderr in _load_responses():
+        if re.search(pattern, statement, re.IGNORECASE):
+            if stdout is not None:
+                print(json.dumps(stdout))
+            if stderr:
+                print(stderr, file=sys.stderr)
+            return returncode
+
+    print("[]")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,741 @@
+#!/usr/bin/env python3
+# Copyright 2026 Snowflake Inc.
+# Generated with Cortex Code
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+End-to-end benchmarks for the snow-utils CLIs.
+
+Each scenario runs the real click commands in a fresh child process with:
+
+- ``fake_snow.py`` on PATH as ``snow`` (records every invocation, adds a
+  fixed latency per call and returns canned JSON)
+- moto's in-process S3/IAM/STS in place of AWS
+- a private cache dir seeded with synthetic GitHub IP ranges (offline)
+
+and reports wall time, ``snow`` subprocess count, AWS API call count and
+peak RSS. Results are compared with ``baseline.json``; call counts must not
+grow and time/RSS must stay within a tolerance, otherwise the run fails.
+
+Usage:
+    python benchmarks/run.py                      # compare with baseline
+    python benchmarks/run.py -s pat-create        # one scenario
+    python benchmarks/run.py --update-baseline    # record a new baseline
+    python benchmarks/run.py startup              # snow-utils cold start vs targets
+    python benchmarks/run.py imports              # import-time budgets per CLI module
+    python benchmarks/run.py masking              # masking engine throughput vs reference
+"""
+
+import json
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import click
+
+BENCH_DIR = Path(__file__).resolve().parent
+FAKE_SNOW = BENCH_DIR / "fake_snow.py"
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+
+# Metrics that are deterministic and must never grow.
+COUNT_METRICS = ("subprocesses", "aws_calls")
+
+
+@dataclass
+class Scenario:
+    """A CLI invocation to measure, with optional unmeasured setup."""
+
+    name: str
+    cli: str  # "pat", "network", "extvolume" or "apply"
+    args: list[str]
+    setup: list[tuple[str, list[str]]] = field(default_factory=list)
+    prepare: Callable[[Path], None] | None = None  # runs in the child, inside mock_aws
+
+
+def _write_manifest(workdir: Path, users: int = 50) -> None:
+    entries = [
+        {"user": f"BENCH_SA_{i:03d}", "role": "BENCH_ROLE", "db": "BENCH_DB", "cidrs": "10.0.0.0/8"}
+        for i in range(users)
+    ]
+    (workdir / "users.json").write_text(json.dumps({"users": entries}))
+
+
+def _write_state(workdir: Path, users: int = 50) -> None:
+    entries = [
+        {"user": f"BENCH_SA_{i:03d}", "role": "BENCH_ROLE", "db": "BENCH_DB", "cidrs": "10.0.0.0/8"}
+        for i in range(users)
+    ]
+    (workdir / "state.json").write_text(json.dumps({"service_users": entries}))
+
+
+def _write_rotation_manifest(workdir: Path, users: int = 50) -> None:
+    entries = [{"user": f"BENCH_SA_{i:03d}", "role": "BENCH_ROLE"} for i in range(users)]
+    (workdir / "pats.json").write_text(json.dumps({"pats": entries}))
+
+
+def _fill_bucket(workdir: Path, objects: int = 3000) -> None:
+    import boto3
+
+    s3 = boto3.client("s3", region_name="us-west-2")
+    for i in range(objects):
+        s3.put_object(Bucket="bench-data", Key=f"data/part-{i:05d}.parquet", Body=b"x")
+
+
+def _bulk_values(count: int = 2500) -> str:
+    return ",".join(f"198.{i // 256 % 256}.{i % 256}.0/24" for i in range(count))
+
+
+SCENARIOS = [
+    Scenario(
+        "pat-create",
+        "pat",
+        [
+            "create", "--user", "BENCH_SA", "--role", "BENCH_ROLE", "--db", "BENCH_DB",
+            "--no-local", "--extra-cidrs", "203.0.113.0/24", "--env-path", ".env", "--yes",
+        ],
+    ),
+    Scenario(
+        "pat-create-many",
+        "pat",
+        ["create-many", "--manifest", "users.json", "--no-local", "--env-dir", "envs", "--yes"],
+        prepare=_write_manifest,
+    ),
+    Scenario(
+        "pat-rotate-many",
+        "pat",
+        ["rotate-many", "--manifest", "pats.json", "--env-dir", "envs", "--workers", "8", "--yes"],
+        prepare=_write_rotation_manifest,
+    ),
+    Scenario(
+        "state-apply",
+        "apply",
+        ["--state", "state.json", "--yes"],
+        prepare=_write_state,
+    ),
+    Scenario(
+        "network-rule-create-gh",
+        "network",
+        ["rule", "create", "--name", "BENCH_GH_NETWORK_RULE", "--db", "BENCH_DB",
+         "--allow-gh", "--no-local", "--yes"],
+    ),
+    Scenario(
+        "network-rule-create-bulk",
+        "network",
+        ["rule", "create", "--name", "BENCH_BULK_NETWORK_RULE", "--db", "BENCH_DB",
+         "--values", _bulk_values(), "--no-local", "--yes"],
+    ),
+    Scenario(
+        "extvolume-create",
+        "extvolume",
+        ["--no-prefix", "create", "--bucket", "bench-data"],
+    ),
+    Scenario(
+        "extvolume-delete",
+        "extvolume",
+        ["--no-prefix", "delete", "--bucket", "bench-data", "--delete-bucket", "--force", "--yes"],
+        setup=[("extvolume", ["--no-prefix", "create", "--bucket", "bench-data", "--skip-verify"])],
+        prepare=_fill_bucket,
+    ),
+]
+
+
+# Cold-start ceilings for the snow-utils dispatcher, in ms (median of fresh
+# processes printing help: interpreter start plus imports, no Snowflake/AWS work).
+STARTUP_TARGETS_MS = {
+    "--help": 150,
+    "pat --help": 250,
+    "pat verify --help": 250,
+    "networks --help": 250,
+    "networks rule list --help": 250,
+    "extvolume --help": 250,
+}
+
+# Import-time budgets in ms (cumulative ``python -X importtime`` of the module)
+# and modules that must not be loaded just by importing it; heavy dependencies
+# are imported inside the commands that use them.
+IMPORT_BUDGETS_MS = {
+    "snow_utils.cli": 40,
+    "snow_utils.network": 100,
+    "snow_utils.pat": 120,
+    "snow_utils.extvolume": 120,
+}
+DEFERRED_IMPORTS = ("asyncio", "boto3", "botocore", "requests")
+FORBIDDEN_IMPORTS = {"snow_utils.pat": ("snow_utils.network",)}
+
+
+def _get_cli(name: str) -> click.Command:
+    if name == "pat":
+        from snow_utils.pat import cli
+    elif name == "network":
+        from snow_utils.network import cli
+    elif name == "apply":
+        from snow_utils.reconcile import apply_command as cli
+    else:
+        from snow_utils.extvolume import cli
+    return cli
+
+
+def _invoke(cli_name: str, args: list[str]) -> None:
+    _get_cli(cli_name).main(args=args, prog_name=cli_name, standalone_mode=False)
+
+
+def _seed_presets(cache_dir: Path) -> None:
+    """Synthetic GitHub meta (a few thousand IPv4 CIDRs, like the real feed)."""
+    rng = random.Random(0)
+    actions = sorted(
+        {f"{rng.randint(1, 223)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.0/24"
+         for _ in range(4000)}
+    )
+    actions += [f"2a01:111:f403:{i:x}::/64" for i in range(200)]
+    path = cache_dir / "presets" / "github.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"fetched_at": time.time(), "data": {"actions": actions}}))
+
+
+def _bench_env(workdir: Path, latency_ms: int) -> dict[str, str]:
+    """Environment for a scenario child: fake snow first on PATH, hermetic settings."""
+    bin_dir = workdir / "bin"
+    bin_dir.mkdir(exist_ok=True)
+    snow = bin_dir / "snow"
+    snow.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_SNOW}" "$@"\n')
+    snow.chmod(0o755)
+
+    env = {
+        k: v
+        for k, v in os.environ.items()
+        if not k.startswith(("AWS_", "SNOW_UTILS_", "SNOWFLAKE_", "SA_", "NW_RULE_"))
+    }
+    if env.get("PYTHONPATH"):
+        # The child runs in the scenario's work dir.
+        env["PYTHONPATH"] = os.pathsep.join(
+            str(Path(p).resolve()) for p in env["PYTHONPATH"].split(os.pathsep) if p
+        )
+    env.update(
+        {
+            "PATH": f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+            "HOME": str(workdir),
+            "SNOW_BENCH_LOG": str(workdir / "snow-calls.jsonl"),
+            "SNOW_BENCH_LATENCY_MS": str(latency_ms),
+            "SNOW_UTILS_BACKEND": "cli",
+            "SNOW_UTILS_CACHE_DIR": str(workdir / "cache"),
+            "SNOW_UTILS_OFFLINE": "1",
+            "SNOW_UTILS_INVENTORY_TTL": "0",
+            "AWS_ACCESS_KEY_ID": "testing",
+            "AWS_SECRET_ACCESS_KEY": "testing",
+            "AWS_SESSION_TOKEN": "testing",
+            "AWS_DEFAULT_REGION": "us-west-2",
+            "AWS_REGION": "us-west-2",
+        }
+    )
+    return env
+
+
+def run_scenario(scenario: Scenario, latency_ms: int) -> dict:
+    """Run one scenario in a child process and return its metrics."""
+    with tempfile.TemporaryDirectory(prefix=f"snow-utils-bench-{scenario.name}-") as tmp:
+        workdir = Path(tmp)
+        _seed_presets(workdir / "cache")
+        env = _bench_env(workdir, latency_ms)
+        result_path = workdir / "result.json"
+
+        proc = subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), "child", scenario.name,
+             "--result", str(result_path)],
+            cwd=workdir,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0 or not result_path.exists():
+            raise click.ClickException(
+                f"Scenario {scenario.name} failed:\n{proc.stdout[-2000:]}\n{proc.stderr[-2000:]}"
+            )
+
+        metrics = json.loads(result_path.read_text())
+        log = Path(env["SNOW_BENCH_LOG"])
+        metrics["subprocesses"] = len(log.read_text().splitlines()) if log.exists() else 0
+        return metrics
+
+
+def compare(
+    results: dict[str, dict], baseline: dict, time_tolerance: float, rss_tolerance: float
+) -> list[str]:
+    """Return human-readable regressions of ``results`` against ``baseline``."""
+    regressions = []
+    for name, metrics in results.items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        for metric in COUNT_METRICS:
+            if metrics[metric] > base[metric]:
+                regressions.append(f"{name}: {metric} {base[metric]} -> {metrics[metric]}")
+        # Small absolute slack so sub-second scenarios do not flap on noise.
+        if metrics["wall_s"] > base["wall_s"] * (1 + time_tolerance) + 0.25:
+            regressions.append(f"{name}: wall_s {base['wall_s']:.2f} -> {metrics['wall_s']:.2f}")
+        if metrics["peak_rss_mb"] > base["peak_rss_mb"] * (1 + rss_tolerance):
+            regressions.append(
+                f"{name}: peak_rss_mb {base['peak_rss_mb']:.0f} -> {metrics['peak_rss_mb']:.0f}"
+            )
+    return regressions
+
+
+def _format_delta(value: float, base: float | None, fmt: str) -> str:
+    if base is None:
+        return format(value, fmt)
+    pct = (value - base) / base * 100 if base else 0.0
+    return f"{format(value, fmt)} ({pct:+.0f}%)"
+
+
+@click.group(invoke_without_command=True)
+@click.option(
+    "--scenario", "-s", "names", multiple=True, help="Scenario(s) to run (default: all)"
+)
+@click.option(
+    "--baseline",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=DEFAULT_BASELINE,
+    show_default=True,
+    help="Baseline file to compare with or update",
+)
+@click.option("--update-baseline", is_flag=True, help="Record results as the new baseline")
+@click.option(
+    "--latency-ms", default=50, show_default=True, help="Simulated latency per snow call"
+)
+@click.option(
+    "--repeat",
+    default=3,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Runs per scenario; the fastest is reported",
+)
+@click.option(
+    "--time-tolerance",
+    default=0.25,
+    show_default=True,
+    help="Allowed wall time growth over baseline (fraction)",
+)
+@click.option(
+    "--rss-tolerance",
+    default=0.20,
+    show_default=True,
+    help="Allowed peak RSS growth over baseline (fraction)",
+)
+@click.option("-o", "--output", type=click.Choice(["text", "json"]), default="text")
+@click.pass_context
+def cli(
+    ctx: click.Context,
+    names: tuple[str, ...],
+    baseline: Path,
+    update_baseline: bool,
+    latency_ms: int,
+    repeat: int,
+    time_tolerance: float,
+    rss_tolerance: float,
+    output: str,
+) -> None:
+    """Run the benchmark scenarios and compare them with the baseline."""
+    if ctx.invoked_subcommand is not None:
+        return
+
+    known = {s.name: s for s in SCENARIOS}
+    unknown = [n for n in names if n not in known]
+    if unknown:
+        raise click.ClickException(f"Unknown scenario(s) {unknown}; available: {list(known)}")
+    selected = [known[n] for n in names] if names else SCENARIOS
+
+    stored = json.loads(baseline.read_text()) if baseline.exists() else {}
+    if stored and not update_baseline and stored.get("latency_ms") != latency_ms:
+        raise click.ClickException(
+            f"Baseline was recorded with --latency-ms {stored.get('latency_ms')}; "
+            "use the same value or --update-baseline"
+        )
+
+    results = {}
+    for scenario in selected:
+        if output == "text":
+            click.echo(f"Running {scenario.name}...", err=True)
+        runs = [run_scenario(scenario, latency_ms) for _ in range(repeat)]
+        results[scenario.name] = min(runs, key=lambda m: m["wall_s"])
+
+    if output == "json":
+        click.echo(json.dumps(results, indent=2))
+    else:
+        base_scenarios = stored.get("scenarios", {})
+        click.echo(
+            f"\n{'SCENARIO':<26} {'WALL (s)':>16} {'SNOW CALLS':>16} "
+            f"{'AWS CALLS':>16} {'PEAK RSS (MB)':>16}"
+        )
+        for name, m in results.items():
+            base = base_scenarios.get(name, {})
+            click.echo(
+                f"{name:<26} "
+                f"{_format_delta(m['wall_s'], base.get('wall_s'), '.2f'):>16} "
+                f"{_format_delta(m['subprocesses'], base.get('subprocesses'), 'd'):>16} "
+                f"{_format_delta(m['aws_calls'], base.get('aws_calls'), 'd'):>16} "
+                f"{_format_delta(m['peak_rss_mb'], base.get('peak_rss_mb'), '.0f'):>16}"
+            )
+
+    if update_baseline:
+        merged = {**stored.get("scenarios", {}), **results}
+        baseline.write_text(
+            json.dumps({"latency_ms": latency_ms, "scenarios": merged}, indent=2) + "\n"
+        )
+        click.echo(f"\n✓ Baseline written to {baseline}", err=True)
+        return
+
+    if not stored:
+        click.echo(f"\n⚠ No baseline at {baseline}; run with --update-baseline", err=True)
+        return
+
+    regressions = compare(results, stored, time_tolerance, rss_tolerance)
+    if regressions:
+        raise click.ClickException(
+            "Performance regressions:\n" + "\n".join(f"  ✗ {r}" for r in regressions)
+        )
+    click.echo("\n✓ No regressions against baseline", err=True)
+
+
+@cli.command()
+@click.option(
+    "--repeat",
+    default=10,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Fresh processes per command; the median is reported",
+)
+@click.option(
+    "--target-scale",
+    default=1.0,
+    show_default=True,
+    help="Multiply the targets (e.g. 2 on slow CI runners)",
+)
+def startup(repeat: int, target_scale: float) -> None:
+    """Measure snow-utils cold start against STARTUP_TARGETS_MS."""
+    with tempfile.TemporaryDirectory(prefix="snow-utils-startup-") as tmp:
+        env = _bench_env(Path(tmp), 0)
+        failures = []
+        click.echo(f"{'COMMAND':<36} {'MEDIAN (ms)':>12} {'TARGET (ms)':>12}")
+        for command, target in STARTUP_TARGETS_MS.items():
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                subprocess.run(
+                    [sys.executable, "-m", "snow_utils.cli", *command.split()],
+                    env=env,
+                    capture_output=True,
+                    check=True,
+                )
+                timings.append((time.perf_counter() - started) * 1000)
+            median = statistics.median(timings)
+            limit = target * target_scale
+            mark = "✓" if median <= limit else "✗"
+            click.echo(f"{'snow-utils ' + command:<36} {median:>12.0f} {limit:>12.0f} {mark}")
+            if median > limit:
+                failures.append(f"snow-utils {command}: {median:.0f} ms > {limit:.0f} ms")
+
+    if failures:
+        raise click.ClickException(
+            "Cold start over target:\n" + "\n".join(f"  ✗ {f}" for f in failures)
+        )
+
+
+def _import_profile(module: str, env: dict[str, str]) -> tuple[float, set[str]]:
+    """Cumulative import time of ``module`` (ms) and every module it loaded."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = 0.0
+    loaded = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, total, name = line.split("|")
+        loaded.add(name.strip())
+        if name.strip() == module:
+            cumulative = int(total) / 1000
+    return cumulative, loaded
+
+
+@cli.command()
+@click.option(
+    "--repeat",
+    default=5,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Fresh processes per module; the median is reported",
+)
+@click.option(
+    "--budget-scale",
+    default=1.0,
+    show_default=True,
+    help="Multiply the budgets (e.g. 2 on slow CI runners)",
+)
+def imports(repeat: int, budget_scale: float) -> None:
+    """Check CLI module import time and deferred imports against IMPORT_BUDGETS_MS."""
+    with tempfile.TemporaryDirectory(prefix="snow-utils-imports-") as tmp:
+        env = _bench_env(Path(tmp), 0)
+        failures = []
+        click.echo(f"{'MODULE':<24} {'MEDIAN (ms)':>12} {'BUDGET (ms)':>12}")
+        for module, budget in IMPORT_BUDGETS_MS.items():
+            profiles = [_import_profile(module, env) for _ in range(repeat)]
+            median = statistics.median(ms for ms, _ in profiles)
+            limit = budget * budget_scale
+            mark = "✓" if median <= limit else "✗"
+            click.echo(f"{module:<24} {median:>12.0f} {limit:>12.0f} {mark}")
+            if median > limit:
+                failures.append(f"{module}: {median:.0f} ms > {limit:.0f} ms")
+
+            loaded = profiles[0][1]
+            for name in (*DEFERRED_IMPORTS, *FORBIDDEN_IMPORTS.get(module, ())):
+                if name in loaded:
+                    failures.append(f"{module} imports {name} at module load")
+
+    if failures:
+        raise click.ClickException(
+            "Import check failed:\n" + "\n".join(f"  ✗ {f}" for f in failures)
+        )
+
+
+def _masking_payload(rows: int) -> list[dict]:
+    """SHOW-style rows (network rules, PATs, volume properties) with sensitive values."""
+    payload = []
+    for i in range(rows):
+        kind = i % 3
+        if kind == 0:
+            payload.append({
+                "created_on": "2026-01-01 00:00:00.000 -0800",
+                "name": f"RULE_{i:06d}",
+                "database_name": "BENCH_DB",
+                "schema_name": "NETWORKS",
+                "owner": "ACCOUNTADMIN",
+                "type": "IPV4",
+                "mode": "INGRESS",
+                "value_list": [f"10.{i % 256}.{j}.0/24" for j in range(8)] + ["192.0.2.10"],
+                "comment": "benchmark rule",
+            })
+        elif kind == 1:
+            payload.append({
+                "name": f"SA_{i:06d}_PAT",
+                "user_name": f"SA_{i:06d}",
+                "role_restriction": "BENCH_ROLE",
+                "expires_at": "2026-12-31 00:00:00.000 -0800",
+                "status": "ACTIVE",
+                "comment": None,
+                "mins_to_bypass_network_policy_requirement": 0,
+            })
+        else:
+            payload.append({
+                "parent_property": "STORAGE_LOCATIONS",
+                "property": "STORAGE_LOCATION_1",
+                "property_type": "String",
+                "storage_aws_role_arn": f"arn:aws:iam::123456789012:role/bench-role-{i}",
+                "storage_aws_iam_user_arn": "arn:aws:iam::210987654321:user/sf-user",
+                "storage_aws_external_id": f"BENCH_SFCRole=2_{i:08d}abcdef=",
+                "account_id": "123456789012",
+                "details": {"nested": [{"ip_address": "203.0.113.7", "note": "x" * 40}]},
+            })
+    return payload
+
+
+def _reference_mask(data: dict | list, sensitive_keys: list[str] | None = None) -> dict | list:
+    """The original recursive masking walk, for comparison."""
+    import re
+
+    from snow_utils_common.snow_common import (
+        mask_arn,
+        mask_aws_account_id,
+        mask_external_id,
+        mask_ip_address,
+    )
+
+    if sensitive_keys is None:
+        sensitive_keys = ["AWS", "arn", "account", "external", "ip", "address"]
+
+    def should_mask_key(key: str) -> bool:
+        key_lower = key.lower()
+        return any(sk.lower() in key_lower for sk in sensitive_keys)
+
+    def mask_value(key: str, value):
+        if isinstance(value, str):
+            if "arn:aws:" in value:
+                return mask_arn(value)
+            elif re.match(r"^\d{12}$", value):
+                return mask_aws_account_id(value)
+            elif re.match(r"^\d+\.\d+\.\d+\.\d+(/\d+)?$", value):
+                return mask_ip_address(value)
+            elif should_mask_key(key) and len(value) > 6:
+                return mask_external_id(value)
+        return value
+
+    def recurse(obj, parent_key=""):
+        if isinstance(obj, dict):
+            return {k: recurse(v, k) for k, v in obj.items()}
+        elif isinstance(obj, list):
+            return [recurse(item, parent_key) for item in obj]
+        else:
+            return mask_value(parent_key, obj)
+
+    return recurse(data)
+
+
+def _best_of(repeat: int, fn: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+@cli.command()
+@click.option("--rows", default=30000, show_default=True, help="Rows in the payload")
+@click.option("--repeat", default=5, show_default=True, type=click.IntRange(min=1))
+@click.option(
+    "--min-speedup",
+    default=1.5,
+    show_default=True,
+    help="Fail unless mask_json_sensitive is this many times faster than the reference",
+)
+def masking(rows: int, repeat: int, min_speedup: float) -> None:
+    """Masking throughput on a large payload: reference walk vs JsonMasker."""
+    from snow_utils_common import mask_json_sensitive, mask_ndjson
+
+    payload = _masking_payload(rows)
+    lines = [json.dumps(row) for row in payload]
+    megabytes = sum(len(line) + 1 for line in lines) / 1e6
+
+    expected = _reference_mask(payload)
+    if mask_json_sensitive(payload) != expected:
+        raise click.ClickException("mask_json_sensitive output differs from the reference")
+    if [json.loads(line) for line in mask_ndjson(lines)] != expected:
+        raise click.ClickException("mask_ndjson output differs from the reference")
+
+    # Deeply nested documents must not hit the recursion limit.
+    deep: list = []
+    for _ in range(sys.getrecursionlimit() * 2):
+        deep = [deep]
+    mask_json_sensitive(deep)
+
+    results = {
+        "reference (recursive)": _best_of(repeat, lambda: _reference_mask(payload)),
+        "mask_json_sensitive": _best_of(repeat, lambda: mask_json_sensitive(payload)),
+        "mask_ndjson (decode+mask+encode)": _best_of(
+            repeat, lambda: sum(1 for _ in mask_ndjson(lines))
+        ),
+        "json loads+dumps only": _best_of(
+            repeat, lambda: sum(1 for line in lines if json.dumps(json.loads(line)))
+        ),
+    }
+
+    click.echo(f"{rows} rows, {megabytes:.1f} MB as NDJSON\n")
+    click.echo(f"{'ENGINE':<36} {'TIME (ms)':>10} {'ROWS/S':>10} {'MB/S':>8}")
+    for name, seconds in results.items():
+        click.echo(
+            f"{name:<36} {seconds * 1000:>10.0f} {rows / seconds:>10.0f} "
+            f"{megabytes / seconds:>8.1f}"
+        )
+
+    speedup = results["reference (recursive)"] / results["mask_json_sensitive"]
+    click.echo(f"\nmask_json_sensitive speedup over reference: {speedup:.2f}x")
+    if speedup < min_speedup:
+        raise click.ClickException(f"Speedup {speedup:.2f}x < {min_speedup:.2f}x")
+
+
+def _serialize_moto() -> None:
+    """moto's in-memory backends are not thread-safe; handle one request at a time."""
+    from moto.core.botocore_stubber import BotocoreStubber
+
+    handle = BotocoreStubber.__call__
+    lock = threading.Lock()
+
+    def locked(self, *args, **kwargs):
+        with lock:
+            return handle(self, *args, **kwargs)
+
+    BotocoreStubber.__call__ = locked
+
+
+@cli.command(hidden=True)
+@click.argument("name")
+@click.option("--result", type=click.Path(dir_okay=False, path_type=Path), required=True)
+def child(name: str, result: Path) -> None:
+    """Run one scenario in this process (invoked by the parent runner)."""
+    try:
+        import boto3
+        from moto import mock_aws
+    except ImportError:
+        raise click.ClickException("Benchmarks need moto: uv sync (it is a dev dependency)")
+
+    _serialize_moto()
+    scenario = next(s for s in SCENARIOS if s.name == name)
+    workdir = Path.cwd()
+    log = Path(os.environ["SNOW_BENCH_LOG"])
+
+    aws_calls = 0
+
+    def count_call(**kwargs) -> None:
+        nonlocal aws_calls
+        aws_calls += 1
+
+    with mock_aws():
+        boto3.setup_default_session()
+        boto3.DEFAULT_SESSION.events.register("before-call", count_call)
+
+        # Imported inside the mock so module-level clients are mocked too.
+        from snow_utils_common import reset_inventory
+
+        for cli_name, args in scenario.setup:
+            _invoke(cli_name, args)
+        if scenario.prepare:
+            scenario.prepare(workdir)
+
+        # Only the measured command counts.
+        log.unlink(missing_ok=True)
+        reset_inventory()
+        aws_calls = 0
+
+        started = time.perf_counter()
+        _invoke(scenario.cli, scenario.args)
+        wall = time.perf_counter() - started
+
+    result.write_text(
+        json.dumps(
+            {
+                "wall_s": round(wall, 3),
+                "aws_calls": aws_calls,
+                # ru_maxrss is KiB on Linux, bytes on macOS.
+                "peak_rss_mb": round(
+                    resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                    / (1024 * 1024 if sys.platform == "darwin" else 1024),
+                    1,
+                ),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    cli()
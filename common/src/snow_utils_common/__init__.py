@@ -4,54 +4,172 @@
 Snow-utils common utilities shared across all skills.
 """
 
-from .network_presets import (
-    NetworkRuleMode,
-    NetworkRuleType,
-    collect_ipv4_cidrs,
-    get_github_actions_ips,
-    get_google_ips,
-    get_local_ip,
-    get_valid_types_for_mode,
-    validate_mode_type,
-)
-from .snow_common import (
-    discover_snowflake_connection,
-    get_snow_cli_options,
-    is_masking_enabled,
-    mask_arn,
-    mask_aws_account_id,
-    mask_external_id,
-    mask_ip_address,
-    mask_json_sensitive,
-    mask_sensitive_string,
-    run_snow_sql,
-    run_snow_sql_file,
-    run_snow_sql_stdin,
-    set_masking,
-    set_snow_cli_options,
-)
+# Submodules are imported on first attribute access (PEP 562) so that, e.g.,
+# ``from snow_utils_common import run_snow_sql`` does not load requests or
+# asyncio; CLI start-up only pays for what a command uses.
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .aio import arun_snow_sql, arun_snow_sql_stdin
+    from .inventory import Inventory, get_inventory, invalidate_inventory, reset_inventory
+    from .manifest import (
+        load_manifest,
+        load_manifest_document,
+        manifest_entries,
+        split_list_value,
+    )
+    from .network_presets import (
+        NetworkRuleMode,
+        NetworkRuleType,
+        aggregate_ipv4_cidrs,
+        collect_ipv4_cidrs,
+        format_aggregation_summary,
+        get_github_actions_ips,
+        get_google_ips,
+        get_local_ip,
+        get_valid_types_for_mode,
+        set_preset_options,
+        validate_mode_type,
+    )
+    from .snow_common import (
+        JsonMasker,
+        discover_snowflake_connection,
+        get_snow_cli_options,
+        is_masking_enabled,
+        iter_snow_sql,
+        mask_arn,
+        mask_aws_account_id,
+        mask_external_id,
+        mask_ip_address,
+        mask_json_sensitive,
+        mask_ndjson,
+        mask_sensitive_string,
+        run_snow_sql,
+        run_snow_sql_file,
+        run_snow_sql_stdin,
+        set_masking,
+        set_snow_cli_options,
+    )
+    from .snow_session import SnowSession, close_snow_session, get_snow_session
+    from .steps import StepGraph
+    from .tracing import (
+        instrument_boto3_client,
+        instrument_boto3_session,
+        setup_tracing,
+        span,
+        traced,
+    )
+
+_EXPORTS = {
+    "Inventory": "inventory",
+    "JsonMasker": "snow_common",
+    "NetworkRuleMode": "network_presets",
+    "NetworkRuleType": "network_presets",
+    "SnowSession": "snow_session",
+    "StepGraph": "steps",
+    "aggregate_ipv4_cidrs": "network_presets",
+    "arun_snow_sql": "aio",
+    "arun_snow_sql_stdin": "aio",
+    "close_snow_session": "snow_session",
+    "collect_ipv4_cidrs": "network_presets",
+    "discover_snowflake_connection": "snow_common",
+    "format_aggregation_summary": "network_presets",
+    "get_github_actions_ips": "network_presets",
+    "get_google_ips": "network_presets",
+    "get_inventory": "inventory",
+    "get_local_ip": "network_presets",
+    "get_snow_cli_options": "snow_common",
+    "get_snow_session": "snow_session",
+    "get_valid_types_for_mode": "network_presets",
+    "instrument_boto3_client": "tracing",
+    "instrument_boto3_session": "tracing",
+    "invalidate_inventory": "inventory",
+    "is_masking_enabled": "snow_common",
+    "iter_snow_sql": "snow_common",
+    "load_manifest": "manifest",
+    "load_manifest_document": "manifest",
+    "mask_arn": "snow_common",
+    "mask_aws_account_id": "snow_common",
+    "mask_external_id": "snow_common",
+    "mask_ip_address": "snow_common",
+    "mask_json_sensitive": "snow_common",
+    "mask_ndjson": "snow_common",
+    "manifest_entries": "manifest",
+    "mask_sensitive_string": "snow_common",
+    "reset_inventory": "inventory",
+    "run_snow_sql": "snow_common",
+    "run_snow_sql_file": "snow_common",
+    "run_snow_sql_stdin": "snow_common",
+    "set_masking": "snow_common",
+    "set_preset_options": "network_presets",
+    "set_snow_cli_options": "snow_common",
+    "setup_tracing": "tracing",
+    "span": "tracing",
+    "split_list_value": "manifest",
+    "traced": "tracing",
+    "validate_mode_type": "network_presets",
+}
 
 __all__ = [
+    "Inventory",
+    "JsonMasker",
     "NetworkRuleMode",
     "NetworkRuleType",
+    "SnowSession",
+    "StepGraph",
+    "aggregate_ipv4_cidrs",
+    "arun_snow_sql",
+    "arun_snow_sql_stdin",
+    "close_snow_session",
     "collect_ipv4_cidrs",
     "discover_snowflake_connection",
+    "format_aggregation_summary",
     "get_github_actions_ips",
     "get_google_ips",
+    "get_inventory",
     "get_local_ip",
     "get_snow_cli_options",
+    "get_snow_session",
     "get_valid_types_for_mode",
+    "instrument_boto3_client",
+    "instrument_boto3_session",
+    "invalidate_inventory",
     "is_masking_enabled",
+    "iter_snow_sql",
+    "load_manifest",
+    "load_manifest_document",
+    "manifest_entries",
     "mask_arn",
     "mask_aws_account_id",
     "mask_external_id",
     "mask_ip_address",
     "mask_json_sensitive",
+    "mask_ndjson",
     "mask_sensitive_string",
+    "reset_inventory",
     "run_snow_sql",
     "run_snow_sql_file",
     "run_snow_sql_stdin",
     "set_masking",
+    "set_preset_options",
     "set_snow_cli_options",
+    "setup_tracing",
+    "span",
+    "split_list_value",
+    "traced",
     "validate_mode_type",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# Copyright 2026 Snowflake Inc.
+# Generated with Cortex Code
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Asyncio counterparts of the ``run_snow_sql*`` runners.
+
+``arun_snow_sql`` and ``arun_snow_sql_stdin`` start ``snow sql`` as asyncio
+subprocesses, so many statements can be in flight on one event loop
+without tying up a thread each. The number of concurrent ``snow``
+processes per loop is capped by ``SNOW_UTILS_MAX_SUBPROCESSES`` (default 16).
+
+With the session backend statements run on the shared connector session
+in a worker thread, since the Snowflake connector has no asyncio API.
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import weakref
+
+import click
+
+from .inventory import invalidate_inventory
+from .snow_common import _run_session_query, _run_session_script, get_snow_cli_options
+from .tracing import _summarize, span
+
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def max_subprocesses() -> int:
+    """Concurrent ``snow`` processes per event loop (SNOW_UTILS_MAX_SUBPROCESSES)."""
+    try:
+        return max(1, int(os.environ.get("SNOW_UTILS_MAX_SUBPROCESSES", "16")))
+    except ValueError:
+        return 16
+
+
+def _subprocess_slot() -> asyncio.Semaphore:
+    """Return the running loop's subprocess semaphore."""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(max_subprocesses())
+    return semaphore
+
+
+async def _communicate(cmd: list[str], input: str | None = None) -> tuple[int, str, str]:
+    """Run a command as an asyncio subprocess and return (returncode, stdout, stderr)."""
+    async with _subprocess_slot():
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await proc.communicate(input.encode() if input is not None else None)
+        except asyncio.CancelledError:
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+            raise
+    return proc.returncode, stdout.decode(), stderr.decode()
+
+
+async def arun_snow_sql(
+    query: str, *, format: str = "json", check: bool = True, role: str | None = None
+) -> dict | list | None:
+    """Awaitable run_snow_sql (same arguments and return value)."""
+    options = get_snow_cli_options()
+    with span("snow sql", "snow", query=_summarize(query)):
+        try:
+            if options.use_session:
+                return await asyncio.to_thread(
+                    _run_session_query, query, format=format, check=check, role=role
+                )
+
+            cmd = ["snow", "sql", *options.get_flags(), "--query", query, "--format", format]
+            if role:
+                cmd.extend(["--role", role])
+
+            if options.debug:
+                click.echo(f"[DEBUG] Running: {' '.join(cmd)}")
+
+            returncode, stdout, stderr = await _communicate(cmd)
+
+            if options.debug and stderr:
+                click.echo(f"[DEBUG] stderr: {stderr}")
+
+            if check and returncode != 0:
+                raise click.ClickException(f"snow sql failed: {stderr}")
+
+            if format == "json" and stdout.strip():
+                try:
+                    return json.loads(stdout)
+                except json.JSONDecodeError:
+                    return None
+            return None
+        finally:
+            invalidate_inventory(query)
+
+
+async def arun_snow_sql_stdin(sql: str, *, check: bool = True) -> subprocess.CompletedProcess:
+    """Awaitable run_snow_sql_stdin (same arguments and return value)."""
+    options = get_snow_cli_options()
+    with span("snow sql --stdin", "snow", sql=_summarize(sql)):
+        try:
+            if options.use_session:
+                return await asyncio.to_thread(_run_session_script, sql, check=check)
+
+            cmd = ["snow", "sql", *options.get_flags(), "--stdin"]
+
+            if options.debug:
+                click.echo(f"[DEBUG] Running: {' '.join(cmd)}")
+                click.echo(f"[DEBUG] SQL:\n{sql}")
+
+            returncode, stdout, stderr = await _communicate(cmd, input=sql)
+
+            if options.debug and stderr:
+                click.echo(f"[DEBUG] stderr: {stderr}")
+            if options.debug and stdout:
+                click.echo(f"[DEBUG] stdout: {stdout}")
+
+            if check and returncode != 0:
+                raise click.ClickException(f"snow sql failed: {stderr}")
+
+            return subprocess.CompletedProcess(cmd, returncode, stdout, stderr)
+        finally:
+            invalidate_inventory(sql)
@@ -94,7 +94,8 @@ def do_run_setup(db_name: str, script_dir: Path) -> bool:
 @click.option("--database", "-d", help="Database name (or set SNOW_UTILS_DB env var)")
 @click.option("--run-setup", is_flag=True, help="Run setup if infrastructure missing")
 @click.option("--suggest", is_flag=True, help="Output suggested defaults as JSON")
-def check(database: str | None, run_setup: bool, suggest: bool):
+@click.option("--quiet", "-q", is_flag=True, help="Print nothing; report through the exit code")
+def check(database: str | None, run_setup: bool, suggest: bool, quiet: bool):
     """Check if snow-utils infrastructure is set up.
 
     Non-interactive - all values via CLI args or env vars.
@@ -127,6 +128,11 @@ def check(database: str | None, run_setup: bool, suggest: bool):
 
     db_name = database or os.environ.get("SNOW_UTILS_DB") or default_db
 
+    if quiet:
+        if check_database_exists(db_name):
+            sys.exit(0)
+        sys.exit(0 if run_setup and do_run_setup(db_name, script_dir) else 1)
+
     # Display snow CLI version info
     try:
         ver_result = subprocess.run(
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# Copyright 2026 Snowflake Inc.
+# Generated with Cortex Code
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Small persistent JSON cache shared by snow-utils commands.
+
+Entries live under ``$SNOW_UTILS_CACHE_DIR`` (default
+``$XDG_CACHE_HOME/snow-utils`` or ``~/.cache/snow-utils``). The cache is
+best-effort: unreadable or corrupt entries are treated as missing and
+write failures are ignored, so a broken cache never fails a command.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+
+def get_cache_dir() -> Path:
+    """Return the snow-utils cache directory (not created)."""
+    if os.environ.get("SNOW_UTILS_CACHE_DIR"):
+        return Path(os.environ["SNOW_UTILS_CACHE_DIR"]).expanduser()
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base).expanduser() / "snow-utils"
+
+
+def cache_path(name: str) -> Path:
+    """Return the file path of cache entry ``name`` (e.g. ``presets/github.json``)."""
+    return get_cache_dir() / name
+
+
+def read_cache(name: str) -> Any | None:
+    """Read a cache entry, returning None when missing or unreadable."""
+    try:
+        return json.loads(cache_path(name).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def write_cache(name: str, data: Any) -> None:
+    """Atomically write a cache entry (temp file + rename)."""
+    path = cache_path(name)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+    except OSError:
+        pass
+
+
+def clear_cache(pattern: str) -> None:
+    """Delete cache entries matching a glob relative to the cache dir."""
+    for path in get_cache_dir().glob(pattern):
+        try:
+            path.unlink()
+        except OSError:
+            pass
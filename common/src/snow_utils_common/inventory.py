@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+# Copyright 2026 Snowflake Inc.
+# Generated with Cortex Code
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Account metadata snapshot shared by snow-utils commands.
+
+SHOW and DESC results are loaded once per invocation and answered from
+memory afterwards. Every statement run through ``run_snow_sql*`` is
+scanned for DDL and grants; entries for the object kinds it touches
+(network rules and policies, users, roles, authentication policies,
+external volumes) are dropped, so reads after a write always go back to
+Snowflake.
+
+SHOW snapshots can also be persisted between invocations by setting
+``SNOW_UTILS_INVENTORY_TTL`` to a number of seconds (default 0 = off).
+
+``iter_query`` / ``iter_show`` stream rows instead of loading them; a
+streamed result is memoized only when it is complete and small
+(``STREAM_MEMO_ROWS``), so listing a large account keeps memory flat.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+
+import click
+
+from .disk_cache import clear_cache, read_cache, write_cache
+
+# Object kind (as written in DESC/DDL) -> plural used by SHOW.
+KINDS = {
+    "NETWORK RULE": "NETWORK RULES",
+    "NETWORK POLICY": "NETWORK POLICIES",
+    "USER": "USERS",
+    "EXTERNAL VOLUME": "EXTERNAL VOLUMES",
+    "ROLE": "ROLES",
+    "AUTHENTICATION POLICY": "AUTHENTICATION POLICIES",
+}
+
+# Streamed results with more rows than this are not memoized.
+STREAM_MEMO_ROWS = 1000
+
+_READ_ONLY_RE = re.compile(r"^\s*(SHOW|DESC|DESCRIBE|SELECT|LIST)\b", re.IGNORECASE)
+_WRITE_RE = re.compile(r"\b(CREATE|ALTER|DROP|UNDROP|REPLACE|GRANT|REVOKE)\b", re.IGNORECASE)
+_KIND_RES = {
+    "NETWORK RULE": re.compile(
+        r"\bNETWORK\s+RULES?\b|\bDROP\s+(DATABASE|SCHEMA)\b", re.IGNORECASE
+    ),
+    "NETWORK POLICY": re.compile(r"\bNETWORK\s+POLIC(Y|IES)\b", re.IGNORECASE),
+    "USER": re.compile(r"\bUSERS?\b", re.IGNORECASE),
+    "EXTERNAL VOLUME": re.compile(r"\bEXTERNAL\s+VOLUMES?\b", re.IGNORECASE),
+    "ROLE": re.compile(r"\bROLES?\b", re.IGNORECASE),
+    "AUTHENTICATION POLICY": re.compile(r"\bAUTHENTICATION\s+POLIC(Y|IES)\b", re.IGNORECASE),
+}
+
+
+def _inventory_ttl() -> int:
+    """Persisted snapshot TTL in seconds (SNOW_UTILS_INVENTORY_TTL, 0 = off)."""
+    try:
+        return max(0, int(os.environ.get("SNOW_UTILS_INVENTORY_TTL", "0")))
+    except ValueError:
+        return 0
+
+
+def _slug(kind: str) -> str:
+    return kind.lower().replace(" ", "-")
+
+
+def kinds_touched_by(sql: str) -> set[str]:
+    """Return the object kinds a statement or script may modify."""
+    statements = [s for s in sql.split(";") if s.strip() and not _READ_ONLY_RE.match(s)]
+    touched: set[str] = set()
+    for statement in statements:
+        if _WRITE_RE.search(statement):
+            touched.update(k for k, pattern in _KIND_RES.items() if pattern.search(statement))
+    return touched
+
+
+class Inventory:
+    """Memoized SHOW/DESC results for one invocation.
+
+    Entries are keyed by (kind, statement, role) because what a SHOW returns
+    depends on the role's privileges. Missing objects are cached as ``None``
+    so repeated existence checks cost nothing either.
+    """
+
+    def __init__(self, ttl: int | None = None) -> None:
+        self.ttl = _inventory_ttl() if ttl is None else ttl
+        self._entries: dict[tuple[str, str, str], Any] = {}
+        self._lock = threading.RLock()
+
+    def query(
+        self, kind: str, sql: str, role: str | None = None, check: bool = False
+    ) -> list[dict] | None:
+        """Run a read-only statement once and memoize its rows.
+
+        A failed statement is not memoized: it cannot be told apart from a
+        transient error, so the next call asks again.
+
+        Args:
+            kind: Object kind the rows describe (key of KINDS), used for invalidation
+            sql: SHOW/DESC statement
+            role: Role to run it with
+            check: Raise on failure instead of returning None
+
+        Returns:
+            Rows, or None when the statement failed (e.g. object does not exist)
+        """
+        from .snow_common import run_snow_sql
+
+        key = self._key(kind, sql, role)
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+        rows = run_snow_sql(sql, role=role, check=check)
+        if rows is not None:
+            with self._lock:
+                self._entries[key] = rows
+        return rows
+
+    async def aquery(
+        self, kind: str, sql: str, role: str | None = None, check: bool = False
+    ) -> list[dict] | None:
+        """Awaitable query(); shares the same memoized entries."""
+        from .aio import arun_snow_sql
+
+        key = self._key(kind, sql, role)
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+        rows = await arun_snow_sql(sql, role=role, check=check)
+        if rows is not None:
+            with self._lock:
+                self._entries[key] = rows
+        return rows
+
+    def iter_query(
+        self, kind: str, sql: str, role: str | None = None, check: bool = False
+    ) -> Iterator[dict]:
+        """Like query(), but yield rows as Snowflake returns them.
+
+        Memoized rows are replayed. Otherwise the rows are streamed and
+        memoized only if the caller reads them all, there are at most
+        STREAM_MEMO_ROWS of them and ``check`` is set (without it, a failed
+        statement cannot be told apart from an empty result).
+        """
+        key = self._key(kind, sql, role)
+        with self._lock:
+            hit = key in self._entries
+            cached = self._entries.get(key)
+        if hit:
+            yield from cached or []
+            return
+        yield from self._stream(key, sql, role, check, memoize=check)
+
+    def _stream(
+        self, key: tuple[str, str, str], sql: str, role: str | None, check: bool, memoize: bool
+    ) -> Iterator[dict]:
+        """Yield a statement's rows; returns them (or None) for memoizing."""
+        from .snow_common import iter_snow_sql
+
+        rows: list[dict] | None = [] if memoize else None
+        for row in iter_snow_sql(sql, role=role, check=check):
+            if rows is not None:
+                rows.append(row)
+                if len(rows) > STREAM_MEMO_ROWS:
+                    rows = None
+            yield row
+        if rows is not None:
+            with self._lock:
+                self._entries[key] = rows
+        return rows
+
+    def describe(self, kind: str, name: str, role: str | None = None) -> list[dict] | None:
+        """Memoized ``DESC <kind> <name>``; None (not memoized) if it fails, e.g. no such object."""
+        return self.query(kind, f"DESC {kind} {name}", role=role)
+
+    async def adescribe(self, kind: str, name: str, role: str | None = None) -> list[dict] | None:
+        """Awaitable describe()."""
+        return await self.aquery(kind, f"DESC {kind} {name}", role=role)
+
+    def show(self, kind: str, scope: str | None = None, role: str | None = None) -> list[dict]:
+        """Memoized ``SHOW <kinds> [IN SCHEMA scope]``, persisted when a TTL is set.
+
+        A failed SHOW (e.g. the schema does not exist) reads as no rows but
+        is neither memoized nor persisted, so the next call asks again.
+        """
+        sql = f"SHOW {KINDS[kind]}" + (f" IN SCHEMA {scope}" if scope else "")
+        rows = self._cached_show(kind, sql, role)
+        if rows is not None:
+            return rows
+        rows = self.query(kind, sql, role=role)
+        if rows is None:
+            return []
+        self._persist_show(kind, sql, role, rows)
+        return rows
+
+    def iter_show(
+        self,
+        kind: str,
+        scope: str | None = None,
+        role: str | None = None,
+        missing_ok: bool = False,
+    ) -> Iterator[dict]:
+        """Streaming show().
+
+        Cached and persisted snapshots are replayed; otherwise rows are
+        yielded as they arrive and kept only when small (see iter_query).
+        Unlike show(), a failed SHOW raises click.ClickException (after the
+        rows that did arrive), so a partial stream never passes for a
+        complete one. With ``missing_ok``, a SHOW that returns nothing
+        because the scope does not exist yields no rows instead.
+        """
+        sql = f"SHOW {KINDS[kind]}" + (f" IN SCHEMA {scope}" if scope else "")
+        rows = self._cached_show(kind, sql, role)
+        if rows is not None:
+            yield from rows
+            return
+        key = self._key(kind, sql, role)
+        empty = True
+        try:
+            for row in self._stream(key, sql, role, True, True):
+                empty = False
+                yield row
+        except click.ClickException as e:
+            if missing_ok and empty and "does not exist" in e.message:
+                return
+            raise
+        with self._lock:
+            rows = self._entries.get(key)
+        if rows is not None:
+            self._persist_show(kind, sql, role, rows)
+
+    async def ashow(
+        self, kind: str, scope: str | None = None, role: str | None = None
+    ) -> list[dict]:
+        """Awaitable show()."""
+        sql = f"SHOW {KINDS[kind]}" + (f" IN SCHEMA {scope}" if scope else "")
+        rows = self._cached_show(kind, sql, role)
+        if rows is not None:
+            return rows
+        rows = await self.aquery(kind, sql, role=role)
+        if rows is None:
+            return []
+        self._persist_show(kind, sql, role, rows)
+        return rows
+
+    def _cached_show(self, kind: str, sql: str, role: str | None) -> list[dict] | None:
+        """SHOW rows from memory or a fresh persisted snapshot, else None."""
+        key = self._key(kind, sql, role)
+        with self._lock:
+            if self._entries.get(key) is not None:
+                return self._entries[key]
+
+        if self.ttl:
+            entry = read_cache(self._cache_name(kind, sql, role))
+            if isinstance(entry, dict) and time.time() - entry.get("fetched_at", 0) < self.ttl:
+                rows = entry.get("rows") or []
+                with self._lock:
+                    self._entries[key] = rows
+                return rows
+        return None
+
+    def _persist_show(self, kind: str, sql: str, role: str | None, rows: list[dict]) -> None:
+        if self.ttl:
+            entry = {"fetched_at": time.time(), "rows": rows}
+            write_cache(self._cache_name(kind, sql, role), entry)
+
+    def exists(
+        self, kind: str, name: str, scope: str | None = None, role: str | None = None
+    ) -> bool:
+        """Whether SHOW lists an object named ``name`` (case-insensitive)."""
+        return any(r.get("name", "").upper() == name.upper() for r in self.show(kind, scope, role))
+
+    def invalidate(self, kinds: set[str] | None = None) -> None:
+        """Drop cached entries for ``kinds`` (all kinds when None)."""
+        kinds = set(KINDS) if kinds is None else kinds
+        if not kinds:
+            return
+        with self._lock:
+            for key in [k for k in self._entries if k[0] in kinds]:
+                del self._entries[key]
+        # Persisted entries are dropped even with the TTL off: other caches
+        # (e.g. the PAT audit) live in the same namespace.
+        for kind in kinds:
+            clear_cache(f"inventory/{_slug(kind)}-*.json")
+
+    def invalidate_for_sql(self, sql: str) -> None:
+        """Drop entries for the object kinds a statement or script may modify."""
+        self.invalidate(kinds_touched_by(sql))
+
+    @staticmethod
+    def _key(kind: str, sql: str, role: str | None) -> tuple[str, str, str]:
+        return (kind, " ".join(sql.split()).upper(), (role or "").upper())
+
+    @staticmethod
+    def _cache_name(kind: str, sql: str, role: str | None) -> str:
+        """Persisted entry name, scoped to the connection, role and statement."""
+        connection = os.environ.get("SNOWFLAKE_DEFAULT_CONNECTION_NAME", "")
+        digest = hashlib.sha1(f"{connection}|{role or ''}|{sql}".upper().encode()).hexdigest()
+        return f"inventory/{_slug(kind)}-{digest[:16]}.json"
+
+
+_inventory: Inventory | None = None
+_inventory_lock = threading.Lock()
+
+
+def get_inventory() -> Inventory:
+    """Return the process-wide inventory, creating it on first use."""
+    global _inventory
+    with _inventory_lock:
+        if _inventory is None:
+            _inventory = Inventory()
+        return _inventory
+
+
+def reset_inventory() -> None:
+    """Forget everything cached in memory (persisted snapshots are kept)."""
+    global _inventory
+    with _inventory_lock:
+        _inventory = None
+
+
+def invalidate_inventory(sql: str | None = None) -> None:
+    """Invalidate entries affected by ``sql`` (everything when None).
+
+    Persisted entries are dropped even before anything was read in this
+    process.
+    """
+    inventory = get_inventory()
+    if sql is None:
+        inventory.invalidate()
+    else:
+        inventory.invalidate_for_sql(sql)
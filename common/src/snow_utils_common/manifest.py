@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# Copyright 2026 Snowflake Inc.
+# Generated with Cortex Code
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Manifest loading for bulk commands.
+
+A manifest is a list of entries (one per user, volume, ...) stored as
+YAML, JSON or CSV. YAML/JSON files may also wrap the list in a mapping
+under a named key (e.g. ``users:``).
+"""
+
+import csv
+import json
+import re
+from pathlib import Path
+
+import click
+
+
+def load_manifest(path: str | Path, key: str | None = None) -> list[dict]:
+    """Load manifest entries from a YAML, JSON or CSV file.
+
+    Args:
+        path: Manifest file (.yaml/.yml, .json or .csv)
+        key: Top-level key holding the entry list when the file is a mapping
+
+    Returns:
+        List of entry dicts with empty values removed
+
+    Raises:
+        click.ClickException: If the file is missing, unsupported or malformed
+    """
+    return manifest_entries(load_manifest_document(path), path, key)
+
+
+def load_manifest_document(path: str | Path) -> object:
+    """Parse a YAML, JSON or CSV manifest file without interpreting it.
+
+    CSV files parse to a list of row dicts; YAML/JSON files to whatever they
+    contain (e.g. a mapping with several entry lists).
+
+    Raises:
+        click.ClickException: If the file is missing, unsupported or malformed
+    """
+    path = Path(path)
+    if not path.exists():
+        raise click.ClickException(f"Manifest not found: {path}")
+
+    suffix = path.suffix.lower()
+    text = path.read_text()
+
+    if suffix == ".csv":
+        return list(csv.DictReader(text.splitlines()))
+    if suffix == ".json":
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            raise click.ClickException(f"Invalid JSON manifest {path}: {e}")
+    if suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise click.ClickException(
+                "YAML manifests require PyYAML (pip install pyyaml). "
+                "Use a .json or .csv manifest instead."
+            )
+        try:
+            return yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise click.ClickException(f"Invalid YAML manifest {path}: {e}")
+    raise click.ClickException(
+        f"Unsupported manifest format '{suffix}'. Use .yaml, .yml, .json or .csv"
+    )
+
+
+def manifest_entries(rows: object, path: str | Path, key: str | None = None) -> list[dict]:
+    """Validate a parsed manifest (or its ``key`` list) and clean its entries.
+
+    Raises:
+        click.ClickException: If there is no list of entry mappings
+    """
+    if isinstance(rows, dict) and key:
+        rows = rows.get(key)
+    if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+        expected = f"a list of entries (or a mapping with '{key}:')" if key else "a list of entries"
+        raise click.ClickException(f"Manifest {path} must contain {expected}")
+
+    return [
+        {k.strip(): v for k, v in row.items() if k and v not in (None, "")} for row in rows
+    ]
+
+
+def split_list_value(value: str | list | None) -> list[str]:
+    """Split a manifest list field given as a list or a ';'/','/space separated string."""
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(v).strip() for v in value if str(v).strip()]
+    return [v for v in re.split(r"[;,\s]+", str(value)) if v]
@@ -20,13 +20,33 @@ Provides:
 - NetworkRuleMode and NetworkRuleType enums
 - Mode/type validation
 - IPv4 preset fetchers (GitHub Actions, Google App Scripts, local IP)
-- CIDR collection utility
+- CIDR collection and aggregation utilities
+
+The GitHub and Google feeds are cached on disk (see ``disk_cache``) for
+``SNOW_UTILS_PRESET_TTL`` seconds (default 6 hours) and revalidated with
+ETag/If-Modified-Since once stale. ``SNOW_UTILS_OFFLINE=1`` serves cached
+feeds regardless of age without touching the network.
 """
 
+import heapq
+import ipaddress
+import os
+import time
 from enum import Enum
 from functools import lru_cache
+from typing import Any
+
+import click
+
+from .disk_cache import read_cache, write_cache
+from .tracing import span
+
+DEFAULT_PRESET_TTL = 6 * 60 * 60
 
-import requests
+_preset_options = {
+    "refresh": False,
+    "offline": os.environ.get("SNOW_UTILS_OFFLINE", "").lower() in ("1", "true", "yes"),
+}
 
 
 class NetworkRuleMode(str, Enum):
@@ -72,6 +92,97 @@ def _is_ipv4_cidr(cidr: str) -> bool:
     return ":" not in cidr
 
 
+def set_preset_options(refresh: bool | None = None, offline: bool | None = None) -> None:
+    """Configure preset feed caching for this process.
+
+    Args:
+        refresh: Ignore the cache TTL and download the feeds again
+        offline: Never hit the network; serve cached feeds however old
+    """
+    previous = dict(_preset_options)
+    if refresh is not None:
+        _preset_options["refresh"] = refresh
+    if offline is not None:
+        _preset_options["offline"] = offline
+    # Keep the in-memory feeds across commands of a long-lived process
+    # (snow-utils shell) unless a refresh is asked for or the mode changed.
+    if refresh or _preset_options != previous:
+        get_github_actions_ips.cache_clear()
+        get_google_ips.cache_clear()
+
+
+def _preset_ttl() -> int:
+    """Preset cache TTL in seconds (SNOW_UTILS_PRESET_TTL)."""
+    try:
+        return int(os.environ.get("SNOW_UTILS_PRESET_TTL", DEFAULT_PRESET_TTL))
+    except ValueError:
+        return DEFAULT_PRESET_TTL
+
+
+def _fetch_json_cached(name: str, url: str) -> Any:
+    """Fetch a JSON feed through the on-disk preset cache.
+
+    A fresh entry is returned as-is; a stale one is revalidated with a
+    conditional GET. If the feed cannot be reached, stale data is served
+    with a warning rather than failing the command.
+    """
+    cache_name = f"presets/{name}.json"
+    entry = read_cache(cache_name)
+    if not isinstance(entry, dict) or "data" not in entry:
+        entry = None
+
+    if _preset_options["offline"]:
+        if entry is None:
+            raise click.ClickException(
+                f"Offline mode: no cached {name} IP ranges. Run once online to populate the cache."
+            )
+        return entry["data"]
+
+    refresh = _preset_options["refresh"]
+    if entry and not refresh and time.time() - entry.get("fetched_at", 0) < _preset_ttl():
+        return entry["data"]
+
+    import requests  # deferred: only needed when the cache cannot answer
+
+    headers = {}
+    if entry and not refresh:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        with span(f"GET {name} IP ranges", "http", url=url) as current:
+            response = requests.get(url, headers=headers, timeout=30)
+            if current is not None:
+                current.attrs["status"] = response.status_code
+        if response.status_code == 304 and entry:
+            entry["fetched_at"] = time.time()
+            write_cache(cache_name, entry)
+            return entry["data"]
+        response.raise_for_status()
+        data = response.json()
+    except (requests.RequestException, ValueError) as e:
+        if entry is None:
+            raise
+        click.echo(
+            f"Warning: could not refresh {name} IP ranges ({e}); using cached copy", err=True
+        )
+        return entry["data"]
+
+    write_cache(
+        cache_name,
+        {
+            "url": url,
+            "fetched_at": time.time(),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "data": data,
+        },
+    )
+    return data
+
+
 @lru_cache(maxsize=1)
 def get_github_actions_ips() -> tuple[str, ...]:
     """
@@ -85,9 +196,7 @@ def get_github_actions_ips() -> tuple[str, ...]:
 
     See: https://api.github.com/meta
     """
-    response = requests.get("https://api.github.com/meta", timeout=30)
-    response.raise_for_status()
-    all_ips = response.json().get("actions", [])
+    all_ips = _fetch_json_cached("github", "https://api.github.com/meta").get("actions", [])
     return tuple(ip for ip in all_ips if _is_ipv4_cidr(ip))
 
 
@@ -101,9 +210,9 @@ def get_google_ips() -> tuple[str, ...]:
 
     See: https://www.gstatic.com/ipranges/goog.json
     """
-    response = requests.get("https://www.gstatic.com/ipranges/goog.json", timeout=30)
-    response.raise_for_status()
-    prefixes = response.json().get("prefixes", [])
+    prefixes = _fetch_json_cached("google", "https://www.gstatic.com/ipranges/goog.json").get(
+        "prefixes", []
+    )
     return tuple(p["ipv4Prefix"] for p in prefixes if "ipv4Prefix" in p)
 
 
@@ -113,7 +222,10 @@ def get_local_ip() -> str:
 
     Uses ipify.org API to detect the public IP of the current machine.
     """
-    response = requests.get("https://api.ipify.org", timeout=10)
+    import requests
+
+    with span("GET local IP", "http", url="https://api.ipify.org"):
+        response = requests.get("https://api.ipify.org", timeout=10)
     response.raise_for_status()
     return f"{response.text.strip()}/32"
 
@@ -151,3 +263,118 @@ def collect_ipv4_cidrs(
         cidrs.extend(extra_cidrs)
 
     return list(dict.fromkeys(cidrs))
+
+
+def _parse_ipv4_networks(cidrs: list[str]) -> list[ipaddress.IPv4Network]:
+    """Parse IPv4 CIDRs/addresses, rejecting anything else."""
+    networks = []
+    for cidr in cidrs:
+        try:
+            network = ipaddress.ip_network(cidr.strip(), strict=False)
+        except ValueError as e:
+            raise click.ClickException(f"Invalid IPv4 CIDR '{cidr}': {e}")
+        if not isinstance(network, ipaddress.IPv4Network):
+            raise click.ClickException(f"Not an IPv4 CIDR: '{cidr}'")
+        networks.append(network)
+    return networks
+
+
+def _merge_to_limit(blocks: list[tuple[int, int]], max_entries: int) -> list[tuple[int, int]]:
+    """Greedily merge neighbouring blocks into supernets until at most ``max_entries`` remain.
+
+    ``blocks`` are sorted, disjoint ``(first, last)`` address ranges of CIDR
+    blocks. Each step merges the neighbouring pair whose covering supernet
+    adds the fewest extra addresses; blocks swallowed by that supernet are
+    absorbed as well.
+    """
+    count = len(blocks)
+    first = [b[0] for b in blocks]
+    last = [b[1] for b in blocks]
+    prev = list(range(-1, count - 1))
+    nxt = [i + 1 if i + 1 < count else -1 for i in range(count)]
+    alive = [True] * count
+    version = [0] * count
+
+    def supernet(i: int, j: int) -> tuple[int, int]:
+        host_bits = (first[i] ^ last[j]).bit_length()
+        start = first[i] >> host_bits << host_bits
+        return start, start + (1 << host_bits) - 1
+
+    def push(heap: list, i: int) -> None:
+        j = nxt[i]
+        if j == -1:
+            return
+        start, end = supernet(i, j)
+        extra = (end - start + 1) - (last[i] - first[i] + 1) - (last[j] - first[j] + 1)
+        heapq.heappush(heap, (extra, first[i], i, version[i], j, version[j]))
+
+    heap: list = []
+    for i in range(count):
+        push(heap, i)
+
+    remaining = count
+    while remaining > max_entries and heap:
+        _, _, i, vi, j, vj = heapq.heappop(heap)
+        if not (alive[i] and alive[j]) or version[i] != vi or version[j] != vj:
+            continue
+        first[i], last[i] = supernet(i, j)
+        version[i] += 1
+        # Absorb j and any neighbour now covered by the supernet.
+        alive[j] = False
+        nxt[i] = nxt[j]
+        remaining -= 1
+        while nxt[i] != -1 and first[nxt[i]] <= last[i]:
+            alive[nxt[i]] = False
+            nxt[i] = nxt[nxt[i]]
+            remaining -= 1
+        if nxt[i] != -1:
+            prev[nxt[i]] = i
+        while prev[i] != -1 and last[prev[i]] >= first[i]:
+            alive[prev[i]] = False
+            prev[i] = prev[prev[i]]
+            remaining -= 1
+        if prev[i] != -1:
+            nxt[prev[i]] = i
+            version[prev[i]] += 1
+            push(heap, prev[i])
+        push(heap, i)
+
+    return [(first[i], last[i]) for i in range(count) if alive[i]]
+
+
+def aggregate_ipv4_cidrs(cidrs: list[str], max_entries: int | None = None) -> list[str]:
+    """
+    Collapse IPv4 CIDRs into the minimal covering set.
+
+    Overlapping, nested and adjacent prefixes are merged without changing
+    the set of allowed addresses. With ``max_entries``, neighbouring
+    prefixes are additionally merged into their smallest common supernet
+    (cheapest first) until the list fits -- this is lossy: the result
+    allows addresses that were not in the input.
+
+    Args:
+        cidrs: IPv4 CIDRs or bare addresses
+        max_entries: Optional upper bound on the number of prefixes
+
+    Returns:
+        Aggregated CIDRs sorted by address
+    """
+    if max_entries is not None and max_entries < 1:
+        raise click.ClickException("max_entries must be at least 1")
+
+    collapsed = list(ipaddress.collapse_addresses(_parse_ipv4_networks(cidrs)))
+    if max_entries is None or len(collapsed) <= max_entries:
+        return [str(n) for n in collapsed]
+
+    blocks = [(int(n.network_address), int(n.broadcast_address)) for n in collapsed]
+    merged = _merge_to_limit(blocks, max_entries)
+    networks = [
+        ipaddress.IPv4Network((start, 32 - (end - start + 1).bit_length() + 1))
+        for start, end in merged
+    ]
+    return [str(n) for n in ipaddress.collapse_addresses(networks)]
+
+
+def format_aggregation_summary(before: int, after: int) -> str:
+    """Describe the effect of :func:`aggregate_ipv4_cidrs` for CLI output."""
+    return f"Aggregated CIDRs: {before} → {after} (saved {before - after})"
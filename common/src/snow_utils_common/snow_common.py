@@ -19,14 +19,25 @@ Common utilities for Snowflake CLI tools.
 Shared functionality for snow CLI wrapper functions and options.
 """
 
+import codecs
 import json
+import os
 import re
+import functools
 import subprocess
+import tempfile
+from collections.abc import Callable, Iterable, Iterator
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO
 
 import click
 
+from .inventory import invalidate_inventory
+from .tracing import _summarize, get_tracer, traced
+
+BACKENDS = ("cli", "session")
+
 
 @dataclass
 class SnowCLIOptions:
@@ -35,6 +46,12 @@ class SnowCLIOptions:
     verbose: bool = False
     debug: bool = False
     mask_sensitive: bool = True
+    backend: str = field(default_factory=lambda: os.environ.get("SNOW_UTILS_BACKEND") or "cli")
+
+    @property
+    def use_session(self) -> bool:
+        """Whether statements run on the in-process session instead of ``snow sql``."""
+        return self.backend == "session"
 
     def get_flags(self) -> list[str]:
         """Get CLI flags based on options."""
@@ -74,10 +91,17 @@ def mask_external_id(value: str) -> str:
     return f"{value[:3]}{'*' * (len(value) - 6)}{value[-3:]}"
 
 
+_ARN_RE = re.compile(r"(arn:aws:[^:]+:[^:]*:)(\d{12})(:.+)")
+_IP_RE = re.compile(r"^\d+\.\d+\.\d+\.\d+(/\d+)?$")
+# Both numeric leaf patterns in one pass; lastgroup tells which one matched.
+_NUMERIC_LEAF_RE = re.compile(r"(?P<account>\d{12}$)|(?P<ip>\d+\.\d+\.\d+\.\d+(/\d+)?$)")
+
+DEFAULT_SENSITIVE_KEYS = ("AWS", "arn", "account", "external", "ip", "address")
+
+
 def mask_arn(value: str) -> str:
     """Mask ARN account ID portion."""
-    pattern = r"(arn:aws:[^:]+:[^:]*:)(\d{12})(:.+)"
-    match = re.match(pattern, value)
+    match = _ARN_RE.match(value)
     if match:
         return f"{match.group(1)}{mask_aws_account_id(match.group(2))}{match.group(3)}"
     return value
@@ -93,9 +117,7 @@ def mask_sensitive_string(value: str, mask_type: str = "auto") -> str:
     )
     if is_account_id:
         return mask_aws_account_id(value)
-    is_ip = mask_type == "ip" or (
-        mask_type == "auto" and re.match(r"^\d+\.\d+\.\d+\.\d+(/\d+)?$", value)
-    )
+    is_ip = mask_type == "ip" or (mask_type == "auto" and _IP_RE.match(value))
     if is_ip:
         return mask_ip_address(value)
     elif mask_type == "arn" or (mask_type == "auto" and value.startswith("arn:aws:")):
@@ -105,39 +127,134 @@ def mask_sensitive_string(value: str, mask_type: str = "auto") -> str:
     return value
 
 
-def mask_json_sensitive(data: dict | list, sensitive_keys: list[str] | None = None) -> dict | list:
-    """Recursively mask sensitive values in JSON data."""
-    if not _snow_cli_options.mask_sensitive:
-        return data
-
-    if sensitive_keys is None:
-        sensitive_keys = ["AWS", "arn", "account", "external", "ip", "address"]
+class JsonMasker:
+    """Masks sensitive values in JSON data.
 
-    def should_mask_key(key: str) -> bool:
-        key_lower = key.lower()
-        return any(sk.lower() in key_lower for sk in sensitive_keys)
+    String leaves are masked by content (ARNs, 12-digit account IDs, IPv4
+    addresses) or, for other strings longer than 6 characters, by the name
+    of the key they sit under (see ``sensitive_keys``). Patterns are
+    compiled once, each leaf is classified in a single pass, key decisions
+    are memoized, and the walk is iterative, so deeply nested documents
+    cannot hit the recursion limit.
+    """
 
-    def mask_value(key: str, value):
-        if isinstance(value, str):
-            if "arn:aws:" in value:
-                return mask_arn(value)
-            elif re.match(r"^\d{12}$", value):
-                return mask_aws_account_id(value)
-            elif re.match(r"^\d+\.\d+\.\d+\.\d+(/\d+)?$", value):
+    _MAX_KEYS = 4096
+
+    def __init__(self, sensitive_keys: Iterable[str] | None = None) -> None:
+        keys = DEFAULT_SENSITIVE_KEYS if sensitive_keys is None else sensitive_keys
+        self.sensitive_keys = tuple(k.lower() for k in keys)
+        self._key_cache: dict[str, bool] = {}
+
+    def is_sensitive_key(self, key: str) -> bool:
+        """Whether values under ``key`` are masked as secrets."""
+        sensitive = self._key_cache.get(key)
+        if sensitive is None:
+            key_lower = key.lower()
+            sensitive = any(sk in key_lower for sk in self.sensitive_keys)
+            if len(self._key_cache) < self._MAX_KEYS:
+                self._key_cache[key] = sensitive
+        return sensitive
+
+    def mask_string(self, key: str, value: str) -> str:
+        """Mask one string leaf found under ``key``."""
+        if "arn:aws:" in value:
+            return mask_arn(value)
+        if value[:1].isdigit():
+            match = _NUMERIC_LEAF_RE.match(value)
+            if match:
+                if match.lastgroup == "account":
+                    return mask_aws_account_id(value)
                 return mask_ip_address(value)
-            elif should_mask_key(key) and len(value) > 6:
-                return mask_external_id(value)
+        if len(value) > 6 and self.is_sensitive_key(key):
+            return mask_external_id(value)
         return value
 
-    def recurse(obj, parent_key=""):
-        if isinstance(obj, dict):
-            return {k: recurse(v, k) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [recurse(item, parent_key) for item in obj]
-        else:
-            return mask_value(parent_key, obj)
+    def mask(self, data: Any) -> Any:
+        """Return a masked copy of ``data`` (dicts and lists are copied)."""
+        if isinstance(data, str):
+            return self.mask_string("", data)
+        if not isinstance(data, (dict, list)):
+            return data
+
+        mask_string = self.mask_string
+        result: dict | list = {} if isinstance(data, dict) else []
+        # (source container, copy to fill, key its leaves are masked under)
+        stack = [(data, result, "")]
+        while stack:
+            source, target, parent_key = stack.pop()
+            if isinstance(source, dict):
+                for key, value in source.items():
+                    if isinstance(value, str):
+                        target[key] = mask_string(key, value)
+                    elif isinstance(value, dict):
+                        target[key] = child = {}
+                        stack.append((value, child, key))
+                    elif isinstance(value, list):
+                        target[key] = child = []
+                        stack.append((value, child, key))
+                    else:
+                        target[key] = value
+            else:
+                append = target.append
+                for value in source:
+                    if isinstance(value, str):
+                        append(mask_string(parent_key, value))
+                    elif isinstance(value, dict):
+                        append(child := {})
+                        stack.append((value, child, parent_key))
+                    elif isinstance(value, list):
+                        append(child := [])
+                        stack.append((value, child, parent_key))
+                    else:
+                        append(value)
+        return result
+
+    def mask_rows(self, rows: Iterable[Any]) -> Iterator[Any]:
+        """Mask rows one at a time, e.g. as they stream from iter_snow_sql."""
+        for row in rows:
+            yield self.mask(row)
+
+    def mask_ndjson(self, lines: Iterable[str | bytes]) -> Iterator[str]:
+        """Mask newline-delimited JSON, yielding one masked JSON line per row.
+
+        Blank lines are skipped; lines are yielded without a newline.
+        """
+        loads, dumps = json.loads, json.dumps
+        for line in lines:
+            if line.strip():
+                yield dumps(self.mask(loads(line)))
+
+
+@functools.lru_cache(maxsize=16)
+def _json_masker(sensitive_keys: tuple[str, ...] | None) -> JsonMasker:
+    """Shared JsonMasker per set of sensitive keys, so key decisions are reused."""
+    return JsonMasker(sensitive_keys)
+
 
-    return recurse(data)
+def mask_json_sensitive(data: dict | list, sensitive_keys: list[str] | None = None) -> dict | list:
+    """Mask sensitive values in JSON data (see JsonMasker)."""
+    if not _snow_cli_options.mask_sensitive:
+        return data
+    keys = None if sensitive_keys is None else tuple(sensitive_keys)
+    return _json_masker(keys).mask(data)
+
+
+def mask_ndjson(
+    lines: Iterable[str | bytes], sensitive_keys: list[str] | None = None
+) -> Iterator[str]:
+    """Streaming mask_json_sensitive for newline-delimited JSON rows.
+
+    Yields one JSON line (without newline) per non-blank input line; rows
+    are passed through unchanged when masking is disabled.
+    """
+    if not _snow_cli_options.mask_sensitive:
+        return (
+            (line if isinstance(line, str) else line.decode()).rstrip("\r\n")
+            for line in lines
+            if line.strip()
+        )
+    keys = None if sensitive_keys is None else tuple(sensitive_keys)
+    return _json_masker(keys).mask_ndjson(lines)
 
 
 def set_masking(enabled: bool) -> None:
@@ -152,11 +269,23 @@ def is_masking_enabled() -> bool:
 
 
 def set_snow_cli_options(
-    verbose: bool = False, debug: bool = False, mask_sensitive: bool = True
+    verbose: bool = False,
+    debug: bool = False,
+    mask_sensitive: bool = True,
+    backend: str | None = None,
 ) -> None:
-    """Set global snow CLI options."""
+    """Set global snow CLI options.
+
+    Args:
+        backend: "cli" (one ``snow sql`` process per call) or "session"
+            (one reused in-process connection). Defaults to SNOW_UTILS_BACKEND or "cli".
+    """
     global _snow_cli_options
+    if backend is not None and backend not in BACKENDS:
+        raise click.ClickException(f"Unknown backend '{backend}'. Valid backends: {BACKENDS}")
     _snow_cli_options = SnowCLIOptions(verbose=verbose, debug=debug, mask_sensitive=mask_sensitive)
+    if backend:
+        _snow_cli_options.backend = backend
 
 
 def get_snow_cli_options() -> SnowCLIOptions:
@@ -164,10 +293,36 @@ def get_snow_cli_options() -> SnowCLIOptions:
     return _snow_cli_options
 
 
+def _invalidates_inventory(scan_sql: bool = True) -> Callable:
+    """Invalidate cached SHOW/DESC metadata after a statement runs.
+
+    With ``scan_sql`` the first argument is scanned for the object kinds
+    it modifies; otherwise (SQL files) everything is invalidated.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(sql, *args, **kwargs):
+            try:
+                return fn(sql, *args, **kwargs)
+            finally:
+                if not kwargs.get("dry_run"):
+                    invalidate_inventory(sql if scan_sql else None)
+
+        return wrapper
+
+    return decorator
+
+
+@traced("snow sql", "snow", arg="query")
+@_invalidates_inventory()
 def run_snow_sql(
     query: str, *, format: str = "json", check: bool = True, role: str | None = None
 ) -> dict | list | None:
     """Execute a snow sql command and return parsed JSON output."""
+    if _snow_cli_options.use_session:
+        return _run_session_query(query, format=format, check=check, role=role)
+
     cmd = ["snow", "sql", *_snow_cli_options.get_flags(), "--query", query, "--format", format]
     if role:
         cmd.extend(["--role", role])
@@ -191,6 +346,124 @@ def run_snow_sql(
     return None
 
 
+def iter_snow_sql(
+    query: str, *, check: bool = True, role: str | None = None
+) -> Iterator[dict]:
+    """Execute a read-only snow sql query and yield its rows as they arrive.
+
+    Unlike run_snow_sql, the output is never held in memory as a whole: the
+    JSON array ``snow sql`` writes is decoded row by row while the process
+    runs. Closing the iterator early terminates the query.
+
+    Raises:
+        click.ClickException: With ``check``, when the query fails (raised
+            after the rows that did arrive have been yielded)
+    """
+    # Not span(): the caller's own spans run between rows and must not nest here.
+    tracer = get_tracer()
+    current = None
+    if tracer.enabled:
+        current = tracer.start_span("snow sql", "snow", query=_summarize(query))
+    error: Exception | None = None
+    try:
+        if _snow_cli_options.use_session:
+            yield from _iter_session_query(query, check=check, role=role)
+        else:
+            yield from _iter_cli_query(query, check=check, role=role)
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        if current is not None:
+            tracer.end_span(current, error)
+
+
+def _iter_cli_query(query: str, *, check: bool, role: str | None) -> Iterator[dict]:
+    """CLI-backend body of iter_snow_sql (one ``snow sql`` process)."""
+    cmd = ["snow", "sql", *_snow_cli_options.get_flags(), "--query", query, "--format", "json"]
+    if role:
+        cmd.extend(["--role", role])
+
+    if _snow_cli_options.debug:
+        click.echo(f"[DEBUG] Running: {' '.join(cmd)}")
+
+    # stderr goes to a file: a pipe nobody reads could fill up and stall snow.
+    with tempfile.TemporaryFile() as stderr_file:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file)
+        try:
+            try:
+                yield from _iter_json_array(proc.stdout)
+            except ValueError as e:
+                if _snow_cli_options.debug:
+                    click.echo(f"[DEBUG] unreadable JSON output: {e}")
+            returncode = proc.wait()
+        finally:
+            proc.stdout.close()
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+
+        stderr_file.seek(0)
+        stderr = stderr_file.read().decode(errors="replace")
+
+    if _snow_cli_options.debug and stderr:
+        click.echo(f"[DEBUG] stderr: {stderr}")
+
+    if check and returncode != 0:
+        raise click.ClickException(f"snow sql failed: {stderr}")
+
+
+_NUMBER_START = frozenset("-0123456789")
+# What may follow a decoded number prefix in a longer number; "" is the buffer end.
+_NUMBER_CONTINUE = frozenset(["", *".eE+-0123456789"])
+
+
+def _iter_json_array(stream: BinaryIO, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """Yield the items of a JSON array read incrementally from a binary stream.
+
+    Each item is decoded with ``json``'s C scanner as soon as it is complete.
+    Empty input yields nothing; malformed or truncated input raises
+    ValueError after the items decoded so far.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")()
+    buffer, pos, state = "", 0, "start"  # start -> first -> value <-> separator
+    while True:
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            if state == "start":
+                if char != "[":
+                    raise ValueError(f"expected a JSON array, got {char!r}")
+                pos, state = pos + 1, "first"
+            elif state == "separator" or (state == "first" and char == "]"):
+                if char == "]":
+                    return
+                if char != ",":
+                    raise ValueError(f"expected ',' or ']', got {char!r}")
+                pos, state = pos + 1, "value"
+            else:
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    break  # incomplete item: read more
+                if buffer[pos] in _NUMBER_START and buffer[end : end + 1] in _NUMBER_CONTINUE:
+                    break  # the number may continue in the next chunk ("1" -> "1.5")
+                yield item
+                pos, state = end, "separator"
+
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            if state == "start":
+                return  # snow prints nothing when the query fails
+            raise ValueError("truncated JSON array")
+        buffer = buffer[pos:] + text.decode(chunk)
+        pos = 0
+
+
 def discover_snowflake_connection(connection_name: str | None = None) -> dict:
     """Snowflake connection discovery via snow CLI.
 
@@ -267,8 +540,13 @@ def discover_snowflake_connection(connection_name: str | None = None) -> dict:
     return info
 
 
+@traced("snow sql --stdin", "snow", arg="sql")
+@_invalidates_inventory()
 def run_snow_sql_stdin(sql: str, *, check: bool = True) -> subprocess.CompletedProcess:
     """Execute multi-statement SQL via stdin."""
+    if _snow_cli_options.use_session:
+        return _run_session_script(sql, check=check)
+
     cmd = ["snow", "sql", *_snow_cli_options.get_flags(), "--stdin"]
 
     if _snow_cli_options.debug:
@@ -288,6 +566,8 @@ def run_snow_sql_stdin(sql: str, *, check: bool = True) -> subprocess.CompletedP
     return result
 
 
+@traced("snow sql -f", "snow", arg="path")
+@_invalidates_inventory(scan_sql=False)
 def run_snow_sql_file(
     sql_file: str | Path,
     variables: dict[str, str] | None = None,
@@ -312,22 +592,16 @@ def run_snow_sql_file(
 
     if dry_run:
         click.echo(f"\n--- {path.name} ---")
-        template_text = path.read_text()
-        if variables:
-            from jinja2 import Environment
-            env = Environment(
-                variable_start_string="{{",
-                variable_end_string="}}",
-                comment_start_string="{#",
-                comment_end_string="#}",
-                keep_trailing_newline=True,
-            )
-            rendered = env.from_string(template_text).render(**variables)
-            click.echo(rendered)
-        else:
-            click.echo(template_text)
+        click.echo(_render_sql_template(path.read_text(), variables or None))
         return None
 
+    if _snow_cli_options.use_session:
+        sql = _render_sql_template(path.read_text(), variables or {})
+        result = _run_session_script(sql, check=False)
+        if check and result.returncode != 0:
+            raise click.ClickException(f"snow sql -f {path.name} failed: {result.stderr}")
+        return result
+
     cmd = ["snow", "sql", *_snow_cli_options.get_flags(), "-f", str(path),
            "--enable-templating", "ALL"]
     if variables:
@@ -347,3 +621,94 @@ def run_snow_sql_file(
     if check and result.returncode != 0:
         raise click.ClickException(f"snow sql -f {path.name} failed: {result.stderr}")
     return result
+
+
+def _render_sql_template(template_text: str, variables: dict[str, str] | None) -> str:
+    """Render a Jinja SQL template the way ``snow sql --enable-templating ALL`` does."""
+    if variables is None:
+        return template_text
+    from jinja2 import Environment
+
+    env = Environment(
+        variable_start_string="{{",
+        variable_end_string="}}",
+        comment_start_string="{#",
+        comment_end_string="#}",
+        keep_trailing_newline=True,
+    )
+    return env.from_string(template_text).render(**variables)
+
+
+def _run_session_query(
+    query: str, *, format: str = "json", check: bool = True, role: str | None = None
+) -> dict | list | None:
+    """Session-backend counterpart of run_snow_sql (same return shape)."""
+    from .snow_session import get_snow_session
+
+    if _snow_cli_options.debug:
+        click.echo(f"[DEBUG] Session query (role={role or 'default'}): {query}")
+
+    try:
+        rows = get_snow_session().query(query, role=role)
+    except click.ClickException:
+        raise
+    except Exception as e:
+        if _snow_cli_options.debug:
+            click.echo(f"[DEBUG] error: {e}")
+        if check:
+            raise click.ClickException(f"snow sql failed: {e}")
+        return None
+
+    # Like the CLI backend: [] for a query without rows, None only on failure.
+    if format == "json":
+        return rows
+    return None
+
+
+def _iter_session_query(
+    query: str, *, check: bool = True, role: str | None = None
+) -> Iterator[dict]:
+    """Session-backend counterpart of iter_snow_sql."""
+    from .snow_session import get_snow_session
+
+    if _snow_cli_options.debug:
+        click.echo(f"[DEBUG] Session query (role={role or 'default'}): {query}")
+
+    try:
+        yield from get_snow_session().iter_query(query, role=role)
+    except click.ClickException:
+        raise
+    except Exception as e:
+        if _snow_cli_options.debug:
+            click.echo(f"[DEBUG] error: {e}")
+        if check:
+            raise click.ClickException(f"snow sql failed: {e}")
+
+
+def _run_session_script(sql: str, *, check: bool = True) -> subprocess.CompletedProcess:
+    """Session-backend counterpart of run_snow_sql_stdin.
+
+    Returns a CompletedProcess so callers can keep checking ``returncode``
+    and ``stderr``; ``stdout`` holds the per-statement rows as JSON.
+    """
+    from .snow_session import get_snow_session
+
+    args = ["snow-session", "--stdin"]
+    if _snow_cli_options.debug:
+        click.echo(f"[DEBUG] Session script:\n{sql}")
+
+    try:
+        results = get_snow_session().execute_script(sql)
+    except click.ClickException:
+        raise
+    except Exception as e:
+        if _snow_cli_options.debug:
+            click.echo(f"[DEBUG] error: {e}")
+        if check:
+            raise click.ClickException(f"snow sql failed: {e}")
+        return subprocess.CompletedProcess(args, 1, stdout="", stderr=str(e))
+
+    stdout = json.dumps(results)
+    if _snow_cli_options.debug:
+        click.echo(f"[DEBUG] stdout: {stdout}")
+    return subprocess.CompletedProcess(args, 0, stdout=stdout, stderr="")
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# Copyright 2026 Snowflake Inc.
+# Generated with Cortex Code
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+In-process Snowflake session backend.
+
+Keeps one authenticated connector session per connection (name and
+``SNOWFLAKE_*`` overrides) and runs every statement on it, instead of
+forking a ``snow sql`` process (and logging in again) per statement.
+Selected with ``--backend session`` or ``SNOW_UTILS_BACKEND=session``.
+
+The connection is resolved the same way the snow CLI resolves it: the
+connection named by ``SNOWFLAKE_DEFAULT_CONNECTION_NAME`` (or the configured
+default) from ``~/.snowflake/config.toml`` / ``connections.toml``.
+"""
+
+import atexit
+import os
+import threading
+from collections.abc import Iterator
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+
+import click
+
+# Env overrides the snow CLI applies on top of the named connection.
+_ENV_OVERRIDES = {
+    "role": "SNOWFLAKE_ROLE",
+    "database": "SNOWFLAKE_DATABASE",
+    "schema": "SNOWFLAKE_SCHEMA",
+    "warehouse": "SNOWFLAKE_WAREHOUSE",
+}
+
+
+def _env_overrides() -> dict[str, str]:
+    """Connection parameters set through _ENV_OVERRIDES in the environment."""
+    return {param: os.environ[var] for param, var in _ENV_OVERRIDES.items() if os.environ.get(var)}
+
+
+def _to_json_value(value: Any) -> Any:
+    """Convert connector values to what ``snow sql --format json`` emits."""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, bytes):
+        return value.hex()
+    return value
+
+
+def _rows_from_cursor(cursor: Any) -> list[dict]:
+    """Fetch all rows of a DictCursor as JSON-compatible dicts."""
+    if not cursor.description:
+        return []
+    return [{k: _to_json_value(v) for k, v in row.items()} for row in cursor.fetchall()]
+
+
+class SnowSession:
+    """A lazily opened, reusable Snowflake connection.
+
+    Statements are serialized with a lock so worker threads can share the
+    session safely. Each call starts from the same role a fresh ``snow sql``
+    process would use (``role`` argument, else the connection default), so
+    ``USE ROLE`` inside one script never leaks into the next call.
+    """
+
+    def __init__(
+        self, connection_name: str | None = None, overrides: dict[str, str] | None = None
+    ) -> None:
+        self.connection_name = connection_name
+        # Connection parameters over the named connection; None reads _ENV_OVERRIDES.
+        self.overrides = overrides
+        self._conn: Any = None
+        self._lock = threading.RLock()
+        self._default_role: str | None = None
+        self._active_role: str | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the underlying connection has been opened."""
+        return self._conn is not None
+
+    @property
+    def account(self) -> str | None:
+        """Account identifier of the open connection."""
+        return self.connect().account
+
+    def connect(self) -> Any:
+        """Open the connection on first use and return it."""
+        with self._lock:
+            if self._conn is not None:
+                return self._conn
+            try:
+                import snowflake.connector
+            except ImportError as e:
+                raise click.ClickException(
+                    "The session backend requires snowflake-connector-python "
+                    "(installed with snowflake-cli). Use --backend cli instead."
+                ) from e
+
+            kwargs: dict[str, Any] = {}
+            if self.connection_name:
+                kwargs["connection_name"] = self.connection_name
+            kwargs.update(_env_overrides() if self.overrides is None else self.overrides)
+
+            try:
+                self._conn = snowflake.connector.connect(**kwargs)
+            except Exception as e:
+                raise click.ClickException(f"Failed to open Snowflake session: {e}")
+
+            cursor = self._conn.cursor()
+            try:
+                row = cursor.execute("SELECT CURRENT_ROLE()").fetchone()
+            finally:
+                cursor.close()
+            self._default_role = row[0] if row else None
+            self._active_role = self._default_role
+            return self._conn
+
+    def close(self) -> None:
+        """Close the connection if it was opened."""
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                finally:
+                    self._conn = None
+                    self._active_role = None
+
+    def _use_role(self, role: str | None) -> None:
+        """Switch to ``role`` unless it is already active."""
+        if not role:
+            return
+        if self._active_role and self._active_role.upper() == role.upper():
+            return
+        cursor = self._conn.cursor()
+        try:
+            cursor.execute(f"USE ROLE {role}")
+        finally:
+            cursor.close()
+        self._active_role = role
+
+    def query(self, sql: str, role: str | None = None) -> list[dict]:
+        """Run a single statement and return its rows."""
+        from snowflake.connector import DictCursor
+
+        with self._lock:
+            conn = self.connect()
+            self._use_role(role or self._default_role)
+            cursor = conn.cursor(DictCursor)
+            try:
+                cursor.execute(sql)
+                return _rows_from_cursor(cursor)
+            finally:
+                cursor.close()
+
+    def iter_query(
+        self, sql: str, role: str | None = None, batch_size: int = 1000
+    ) -> Iterator[dict]:
+        """Run a single statement and yield its rows, ``batch_size`` at a time.
+
+        The session stays locked until the iterator is exhausted or closed,
+        so consume it in the thread that started it.
+        """
+        from snowflake.connector import DictCursor
+
+        with self._lock:
+            conn = self.connect()
+            self._use_role(role or self._default_role)
+            cursor = conn.cursor(DictCursor)
+            try:
+                cursor.execute(sql)
+                if not cursor.description:
+                    return
+                while batch := cursor.fetchmany(batch_size):
+                    for row in batch:
+                        yield {k: _to_json_value(v) for k, v in row.items()}
+            finally:
+                cursor.close()
+
+    def execute_script(self, sql: str) -> list[list[dict]]:
+        """Run a multi-statement script and return the rows of each statement."""
+        from snowflake.connector import DictCursor
+
+        with self._lock:
+            conn = self.connect()
+            self._use_role(self._default_role)
+            # The script may switch roles; re-assert on the next call.
+            self._active_role = None
+            results = []
+            for cursor in conn.execute_string(sql, cursor_class=DictCursor):
+                try:
+                    results.append(_rows_from_cursor(cursor))
+                finally:
+                    cursor.close()
+            return results
+
+
+# Sessions by (SNOWFLAKE_HOME, connection name, env overrides), so a long-lived
+# process (snow-utils shell) follows the environment of each command.
+_sessions: dict[tuple, SnowSession] = {}
+_session_lock = threading.Lock()
+
+
+def get_snow_session() -> SnowSession:
+    """Return the session for the current environment, creating it on first use."""
+    connection_name = os.environ.get("SNOWFLAKE_DEFAULT_CONNECTION_NAME") or None
+    overrides = _env_overrides()
+    key = (os.environ.get("SNOWFLAKE_HOME"), connection_name, tuple(sorted(overrides.items())))
+    with _session_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _sessions[key] = SnowSession(connection_name, overrides)
+        return session
+
+
+def close_snow_session() -> None:
+    """Close all sessions of this process (registered with atexit)."""
+    with _session_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+atexit.register(close_snow_session)
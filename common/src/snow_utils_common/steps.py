@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# Copyright 2026 Snowflake Inc.
+# Generated with Cortex Code
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Dependency-graph step scheduler.
+
+Runs provisioning steps on a thread pool as soon as the steps they depend
+on have finished, so independent steps (e.g. S3 bucket and IAM policy
+creation) overlap instead of running strictly one after another.
+"""
+
+import contextvars
+import os
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any
+
+import click
+
+from .tracing import span
+
+
+def default_max_workers() -> int:
+    """Worker count for step graphs (SNOW_UTILS_MAX_WORKERS, default 4)."""
+    try:
+        return max(1, int(os.environ.get("SNOW_UTILS_MAX_WORKERS", "4")))
+    except ValueError:
+        return 4
+
+
+@dataclass
+class Step:
+    """A named unit of work and the steps it depends on."""
+
+    name: str
+    fn: Callable[[], Any]
+    deps: tuple[str, ...] = field(default_factory=tuple)
+
+
+class StepGraph:
+    """Run steps concurrently while honouring their dependencies.
+
+    When a step fails, no new steps are started, steps already running are
+    allowed to finish, and the first error is re-raised unchanged. Callers
+    can therefore keep their existing ``try/except`` rollback logic: every
+    "created" flag set by a finished step is visible before the exception
+    reaches them.
+
+    Results are published in ``results`` as steps finish, so a step can read
+    the return value of any step it depends on.
+    """
+
+    def __init__(self, max_workers: int | None = None) -> None:
+        self.max_workers = max_workers or default_max_workers()
+        self._steps: dict[str, Step] = {}
+        self.results: dict[str, Any] = {}
+
+    def add(self, name: str, fn: Callable[[], Any], deps: Iterable[str] = ()) -> None:
+        """Register a step; ``deps`` must name steps added earlier."""
+        if name in self._steps:
+            raise click.ClickException(f"Duplicate step '{name}'")
+        missing = [d for d in deps if d not in self._steps]
+        if missing:
+            raise click.ClickException(f"Step '{name}' depends on unknown step(s): {missing}")
+        self._steps[name] = Step(name, fn, tuple(deps))
+
+    def run(self) -> dict[str, Any]:
+        """Run all steps and return their results keyed by step name."""
+        results = self.results
+        pending = dict(self._steps)
+        running: dict[Future, str] = {}
+        error: BaseException | None = None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                if error is None:
+                    ready = [s for s in pending.values() if all(d in results for d in s.deps)]
+                    for step in ready:
+                        del pending[step.name]
+                        ctx = contextvars.copy_context()
+                        running[pool.submit(ctx.run, self._run_step, step)] = step.name
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except BaseException as e:
+                        if error is None:
+                            error = e
+
+        if error is not None:
+            raise error
+        return results
+
+    @staticmethod
+    def _run_step(step: Step) -> Any:
+        # Runs in a copy of the caller's context so the span nests under it.
+        with span(f"step: {step.name}"):
+            return step.fn()
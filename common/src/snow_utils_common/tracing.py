@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+# Copyright 2026 Snowflake Inc.
+# Generated with Cortex Code
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Lightweight tracing for snow-utils commands.
+
+Workflow steps, ``snow`` subprocesses, boto3 calls, HTTP preset fetches and
+backoff waits are recorded as nested spans when tracing is enabled with
+``--trace`` / ``--trace-file`` (see ``setup_tracing``). At the end of the
+command a summary table is printed to stderr and, with a trace file, the
+spans are written as Chrome trace JSON (open in Perfetto or
+chrome://tracing) or, for ``*.otlp.json`` files, as OTLP/JSON.
+
+When tracing is off, ``span`` does nothing beyond a flag check.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import click
+
+
+@dataclass
+class Span:
+    """A timed operation; ``parent_id`` links it to the enclosing span."""
+
+    name: str
+    category: str
+    span_id: str
+    parent_id: str | None
+    thread_id: int
+    start_ns: int
+    end_ns: int | None = None
+    attrs: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def duration_s(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+
+class Tracer:
+    """Collects finished spans for one process."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.trace_id = os.urandom(16).hex()
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def start_span(
+        self, name: str, category: str = "step", parent: Span | None = None, **attrs: Any
+    ) -> Span:
+        """Start a span under ``parent`` (default: the current span)."""
+        parent = parent or _current_span.get()
+        return Span(
+            name=name,
+            category=category,
+            span_id=os.urandom(8).hex(),
+            parent_id=parent.span_id if parent else None,
+            thread_id=threading.get_ident(),
+            start_ns=time.time_ns(),
+            attrs=attrs,
+        )
+
+    def end_span(self, span: Span, error: BaseException | str | None = None) -> None:
+        """Finish a span and record it."""
+        span.end_ns = time.time_ns()
+        if error is not None:
+            span.error = str(error) or type(error).__name__
+        with self._lock:
+            self.spans.append(span)
+
+
+_tracer = Tracer()
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar(
+    "snow_utils_span", default=None
+)
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer."""
+    return _tracer
+
+
+def is_tracing_enabled() -> bool:
+    """Whether spans are being recorded."""
+    return _tracer.enabled
+
+
+@contextmanager
+def span(name: str, category: str = "step", **attrs: Any) -> Iterator[Span | None]:
+    """Record the enclosed block as a span nested under the current one."""
+    if not _tracer.enabled:
+        yield None
+        return
+
+    current = _tracer.start_span(name, category, **attrs)
+    token = _current_span.set(current)
+    error: BaseException | None = None
+    try:
+        yield current
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        _current_span.reset(token)
+        _tracer.end_span(current, error)
+
+
+def traced(name: str, category: str = "step", arg: str | None = None) -> Callable:
+    """Decorator form of ``span``.
+
+    Args:
+        name: Span name
+        category: Span category (step, snow, aws, http, wait)
+        arg: Record the function's first positional argument under this
+            attribute name (truncated), e.g. the SQL text of a statement
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _tracer.enabled:
+                return fn(*args, **kwargs)
+            attrs = {arg: _summarize(args[0])} if arg and args else {}
+            with span(name, category, **attrs):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _summarize(value: Any, limit: int = 200) -> str:
+    text = " ".join(str(value).split())
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+# =============================================================================
+# boto3 instrumentation
+# =============================================================================
+
+_SPAN_KEY = "snow_utils_span"
+
+
+def _before_aws_call(model: Any = None, context: dict | None = None, **kwargs: Any) -> None:
+    if _tracer.enabled and context is not None and model is not None:
+        service = model.service_model.service_name
+        context[_SPAN_KEY] = _tracer.start_span(f"{service}.{model.name}", "aws")
+
+
+def _after_aws_call(context: dict | None = None, exception: Any = None, **kwargs: Any) -> None:
+    current = (context or {}).pop(_SPAN_KEY, None)
+    if current is not None:
+        _tracer.end_span(current, exception)
+
+
+def instrument_boto3_session(session: Any) -> None:
+    """Record every API call made by clients of a boto3 session as an ``aws`` span."""
+    events = session.events
+    events.register("before-call", _before_aws_call, unique_id="snow-utils-trace-before")
+    events.register("after-call", _after_aws_call, unique_id="snow-utils-trace-after")
+    events.register("after-call-error", _after_aws_call, unique_id="snow-utils-trace-error")
+
+
+def instrument_boto3_client(client: Any) -> None:
+    """Like ``instrument_boto3_session`` for a client created before tracing was set up."""
+    instrument_boto3_session(client.meta)
+
+
+def _instrument_boto3() -> None:
+    try:
+        import boto3
+    except ImportError:
+        return
+    if boto3.DEFAULT_SESSION is None:
+        boto3.setup_default_session()
+    instrument_boto3_session(boto3.DEFAULT_SESSION)
+
+
+# =============================================================================
+# Setup and export
+# =============================================================================
+
+
+def setup_tracing(ctx: click.Context, trace: bool, trace_file: Path | None) -> None:
+    """Enable tracing for a CLI invocation.
+
+    Opens a root span for the invoked subcommand and, when the click
+    context closes, ends it, prints the summary table and writes the trace
+    file (if given).
+    """
+    if not trace and trace_file is None:
+        return
+
+    _tracer.enabled = True
+    _instrument_boto3()
+    name = " ".join(filter(None, [ctx.info_name, ctx.invoked_subcommand]))
+    root = _tracer.start_span(name, "command")
+    token = _current_span.set(root)
+
+    def finish() -> None:
+        _current_span.reset(token)
+        _tracer.end_span(root)
+        _tracer.enabled = False
+        spans, _tracer.spans = _tracer.spans, []
+        click.echo(format_summary(spans, root), err=True)
+        if trace_file is not None:
+            write_trace(trace_file, spans)
+            click.echo(f"Trace written to {trace_file}", err=True)
+
+    ctx.call_on_close(finish)
+
+
+def format_summary(spans: list[Span], root: Span | None = None) -> str:
+    """Per-span-name totals, slowest first."""
+    totals: dict[tuple[str, str], list[float]] = {}
+    for s in spans:
+        if s is root:
+            continue
+        totals.setdefault((s.category, s.name), []).append(s.duration_s)
+
+    rows = sorted(totals.items(), key=lambda item: sum(item[1]), reverse=True)
+    width = max([len(name) for _, name in totals] + [4])
+    width = min(width, 60)
+    lines = [
+        "",
+        f"{'SPAN':<{width}}  {'CATEGORY':<8} {'COUNT':>5} {'TOTAL':>9} {'AVG':>9} {'MAX':>9}",
+    ]
+    for (category, name), durations in rows:
+        label = name if len(name) <= width else name[: width - 3] + "..."
+        lines.append(
+            f"{label:<{width}}  {category:<8} {len(durations):>5} "
+            f"{sum(durations):>8.2f}s {sum(durations) / len(durations):>8.2f}s "
+            f"{max(durations):>8.2f}s"
+        )
+    if root is not None:
+        lines.append(f"\nTotal wall time: {root.duration_s:.2f}s ({root.name})")
+    return "\n".join(lines)
+
+
+def write_trace(path: Path, spans: list[Span]) -> None:
+    """Write spans as Chrome trace JSON, or OTLP/JSON for ``*.otlp.json`` paths."""
+    path = Path(path)
+    if path.name.endswith(".otlp.json"):
+        data = _to_otlp(spans)
+    else:
+        data = _to_chrome_trace(spans)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=1))
+
+
+def _to_chrome_trace(spans: list[Span]) -> dict:
+    t0 = min((s.start_ns for s in spans), default=0)
+    pid = os.getpid()
+    events = []
+    for s in sorted(spans, key=lambda s: s.start_ns):
+        args = dict(s.attrs)
+        if s.error:
+            args["error"] = s.error
+        events.append(
+            {
+                "name": s.name,
+                "cat": s.category,
+                "ph": "X",
+                "ts": (s.start_ns - t0) / 1000,
+                "dur": ((s.end_ns or s.start_ns) - s.start_ns) / 1000,
+                "pid": pid,
+                "tid": s.thread_id,
+                "args": args,
+            }
+        )
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def _to_otlp(spans: list[Span]) -> dict:
+    def attributes(values: dict[str, Any]) -> list[dict]:
+        return [{"key": k, "value": {"stringValue": str(v)}} for k, v in values.items()]
+
+    otlp_spans = []
+    for s in spans:
+        item = {
+            "traceId": _tracer.trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            "kind": 1,
+            "startTimeUnixNano": str(s.start_ns),
+            "endTimeUnixNano": str(s.end_ns or s.start_ns),
+            "attributes": attributes({"category": s.category, **s.attrs}),
+            "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+        }
+        if s.parent_id:
+            item["parentSpanId"] = s.parent_id
+        otlp_spans.append(item)
+
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": attributes({"service.name": "snow-utils"})},
+                "scopeSpans": [
+                    {"scope": {"name": "snow_utils_common.tracing"}, "spans": otlp_spans}
+                ],
+            }
+        ]
+    }
@@ -0,0 +1,580 @@
+#!/usr/bin/env python3
+# Copyright 2026 Snowflake Inc.
+# Generated with Cortex Code
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Asyncio API for network, PAT and external volume operations.
+
+Awaitable counterparts of the core functions in ``snow_utils.network``,
+``snow_utils.pat`` and ``snow_utils.extvolume`` for embedding snow-utils in
+async services. Snowflake statements run as asyncio subprocesses
+(``arun_snow_sql*``); SQL generation and result parsing are shared with the
+sync functions, which the CLIs keep using.
+
+AWS functions take async clients from ``aws_client()``: aiobotocore clients
+when aiobotocore is installed, otherwise boto3 clients whose calls run in
+the default thread pool. Request parameters, propagation schedules and the
+cached account ID are shared with ``snow_utils.extvolume``.
+
+Example:
+    async with aws_client("iam") as iam:
+        policy_arn = await create_iam_policy(iam, "my-policy", "my-bucket")
+"""
+
+import asyncio
+import functools
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any
+
+import click
+from botocore.exceptions import ClientError
+from snow_utils_common import (
+    NetworkRuleMode,
+    NetworkRuleType,
+    arun_snow_sql,
+    arun_snow_sql_stdin,
+    get_inventory,
+    span,
+)
+
+from snow_utils import extvolume, network, pat
+
+# =============================================================================
+# AWS Clients
+# =============================================================================
+
+
+class ThreadedAwsClient:
+    """Awaitable facade over a boto3 client; each call runs in a worker thread."""
+
+    def __init__(self, client: Any) -> None:
+        self._client = client
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await asyncio.to_thread(attr, *args, **kwargs)
+
+        return call
+
+
+@asynccontextmanager
+async def aws_client(
+    service: str, region_name: str | None = None, **kwargs: Any
+) -> AsyncIterator[Any]:
+    """Open an async AWS client (aiobotocore if installed, else a shared threaded boto3 one)."""
+    try:
+        from aiobotocore.session import get_session
+    except ImportError:
+        get_session = None
+
+    if get_session is None:
+        yield ThreadedAwsClient(extvolume.get_aws_client(service, region_name, **kwargs))
+        return
+
+    async with get_session().create_client(service, region_name=region_name, **kwargs) as client:
+        yield client
+
+
+# =============================================================================
+# Network Rules and Policies
+# =============================================================================
+
+
+async def get_policy_rule_refs(
+    policy_name: str, admin_role: str = "accountadmin"
+) -> list[str] | None:
+    """Awaitable network.get_policy_rule_refs."""
+    desc = await get_inventory().adescribe("NETWORK POLICY", policy_name, role=admin_role)
+    return network.parse_policy_rule_refs(desc)
+
+
+async def get_rule_shard_values(
+    name: str, db: str, schema: str, admin_role: str = "accountadmin", include_base: bool = False
+) -> dict[str, list[str]]:
+    """Awaitable network.get_rule_shard_values; the shards are described concurrently."""
+    inventory = get_inventory()
+    rows = await inventory.ashow("NETWORK RULE", scope=f"{db}.{schema}", role=admin_role)
+    shards = network.filter_rule_shards(rows, name, include_base)
+    descs = await asyncio.gather(
+        *(
+            inventory.adescribe("NETWORK RULE", f"{db}.{schema}.{shard}", role=admin_role)
+            for shard in shards
+        )
+    )
+    return {
+        shard: network.parse_network_rule_values(desc[0] if desc else None) or []
+        for shard, desc in zip(shards, descs, strict=True)
+    }
+
+
+async def create_network_rule(
+    name: str,
+    db: str,
+    schema: str,
+    values: list[str],
+    mode: NetworkRuleMode = NetworkRuleMode.INGRESS,
+    rule_type: NetworkRuleType = NetworkRuleType.IPV4,
+    comment: str = "",
+    force: bool = False,
+    admin_role: str = "accountadmin",
+) -> list[str]:
+    """Awaitable network.create_network_rule (sharding included, no dry run)."""
+    network.check_mode_type(mode, rule_type)
+    expected_policy = network.get_expected_policy_name(name)
+
+    if len(values) > network.get_max_values_per_rule():
+        existing, refs = await asyncio.gather(
+            get_rule_shard_values(name, db, schema, admin_role, include_base=True),
+            get_policy_rule_refs(expected_policy, admin_role=admin_role),
+        )
+        shard_fqns, statements = network.get_network_rule_shards_statements(
+            name, db, schema, values, mode, rule_type, comment, force, existing, refs or []
+        )
+        if statements:
+            prologue = [
+                f"USE ROLE {admin_role};",
+                f"CREATE DATABASE IF NOT EXISTS {db};",
+                f"CREATE SCHEMA IF NOT EXISTS {db}.{schema};",
+            ]
+            await arun_snow_sql_stdin("\n".join([*prologue, *statements]))
+        return shard_fqns
+
+    sql = network.get_network_rule_sql(name, db, schema, values, mode, rule_type, comment, force)
+    refs = await get_policy_rule_refs(expected_policy, admin_role=admin_role) or []
+    statements = network.get_replace_network_rule_statements(
+        name, db, schema, sql, refs, admin_role
+    )
+    await arun_snow_sql_stdin("\n".join(statements))
+    return [f"{db}.{schema}.{name}"]
+
+
+async def create_network_policy(
+    policy_name: str,
+    rule_refs: list[str],
+    comment: str = "",
+    force: bool = False,
+    admin_role: str = "accountadmin",
+) -> None:
+    """Awaitable network.create_network_policy."""
+    sql = network.get_network_policy_sql(policy_name, rule_refs, comment, force)
+    await arun_snow_sql_stdin(f"USE ROLE {admin_role};\n{sql}")
+
+
+async def setup_network_for_user(
+    user: str,
+    db: str,
+    cidrs: list[str],
+    schema: str = "NETWORKS",
+    force: bool = False,
+    comment_prefix: str | None = None,
+    admin_role: str = "accountadmin",
+) -> tuple[list[str], str]:
+    """Awaitable network.setup_network_for_user."""
+    rule_name = f"{user}_NETWORK_RULE".upper()
+    policy_name = f"{user}_NETWORK_POLICY".upper()
+    ctx = comment_prefix or user.upper()
+
+    rule_refs = await create_network_rule(
+        name=rule_name,
+        db=db,
+        schema=schema,
+        values=cidrs,
+        mode=NetworkRuleMode.INGRESS,
+        rule_type=NetworkRuleType.IPV4,
+        comment=f"{ctx} network rule - managed by snow-utils-pat",
+        force=force,
+        admin_role=admin_role,
+    )
+    await create_network_policy(
+        policy_name=policy_name,
+        rule_refs=rule_refs,
+        comment=f"{ctx} network policy - managed by snow-utils-pat",
+        force=force,
+        admin_role=admin_role,
+    )
+    return rule_refs, policy_name
+
+
+async def assign_network_policy_to_user(
+    user: str, policy_name: str, admin_role: str = "accountadmin"
+) -> None:
+    """Awaitable network.assign_network_policy_to_user."""
+    await arun_snow_sql_stdin(
+        f"USE ROLE {admin_role};\nALTER USER {user} SET NETWORK_POLICY = '{policy_name}';"
+    )
+
+
+# =============================================================================
+# Service Users and PATs
+# =============================================================================
+
+
+async def setup_service_user(
+    user: str, pat_role: str, comment_prefix: str, admin_role: str = "accountadmin"
+) -> None:
+    """Awaitable pat.setup_service_user."""
+    click.echo(f"Setting up PAT role {pat_role} and service user {user}")
+    await arun_snow_sql_stdin(pat.get_service_user_sql(user, pat_role, comment_prefix, admin_role))
+    click.echo(f"✓ Role {pat_role} and service user {user} configured")
+
+
+async def setup_auth_policy(
+    user: str,
+    db: str,
+    default_expiry_days: int,
+    max_expiry_days: int,
+    comment_prefix: str,
+    admin_role: str = "accountadmin",
+) -> None:
+    """Awaitable pat.setup_auth_policy."""
+    click.echo("Setting up authentication policy...")
+    sql = pat.get_auth_policy_sql(
+        user, db, default_expiry_days, max_expiry_days, comment_prefix, admin_role
+    )
+    await arun_snow_sql_stdin(sql)
+    click.echo("✓ Authentication policy configured")
+
+
+async def get_existing_pat(
+    user: str, pat_name: str, admin_role: str = "accountadmin"
+) -> str | None:
+    """Awaitable pat.get_existing_pat."""
+    rows = await get_inventory().aquery(
+        "USER", f"SHOW USER PATS FOR USER {user}", role=admin_role, check=True
+    )
+    return pat.find_pat(rows, pat_name)
+
+
+async def create_or_rotate_pat(
+    user: str, pat_role: str, pat_name: str, rotate: bool = False, admin_role: str = "accountadmin"
+) -> str:
+    """Awaitable pat.create_or_rotate_pat."""
+    existing = await get_existing_pat(user, pat_name, admin_role=admin_role)
+
+    if existing and not rotate:
+        click.echo(f"PAT '{pat_name}' exists. Removing and recreating (--no-rotate)...")
+        await arun_snow_sql(pat.get_remove_pat_sql(user, pat_name), role=admin_role)
+        click.echo(f"✓ Removed existing PAT '{pat_name}'")
+        existing = None
+
+    if existing:
+        click.echo(f"Rotating PAT for service user {user}...")
+    else:
+        click.echo(f"Creating new PAT for service user {user} with role restriction {pat_role}...")
+    query = pat.get_create_or_rotate_pat_query(user, pat_role, pat_name, exists=bool(existing))
+    return pat.extract_pat_token(await arun_snow_sql(query, role=admin_role))
+
+
+async def remove_pat(user: str, pat_name: str, admin_role: str = "accountadmin") -> None:
+    """Awaitable pat.remove_pat."""
+    click.echo(f"Removing PAT '{pat_name}' from user {user}...")
+
+    if not await get_existing_pat(user, pat_name, admin_role=admin_role):
+        click.echo(f"⚠ PAT '{pat_name}' not found for user {user}")
+        return
+
+    await arun_snow_sql(pat.get_remove_pat_sql(user, pat_name), role=admin_role)
+    click.echo(f"✓ Removed PAT '{pat_name}'")
+
+
+async def remove_service_user(user: str, admin_role: str = "accountadmin") -> None:
+    """Awaitable pat.remove_service_user."""
+    click.echo(f"Dropping service user: {user}")
+    await arun_snow_sql_stdin(pat.get_remove_service_user_sql(user, admin_role))
+    click.echo(f"✓ Service user {user} dropped")
+
+
+# =============================================================================
+# External Volumes (AWS + Snowflake)
+# =============================================================================
+
+
+async def wait_with_backoff(
+    check_fn: Callable[[], Awaitable[bool]],
+    description: str,
+    max_wait: float = extvolume.PROPAGATION_MAX_WAIT,
+    kind: str | None = None,
+) -> bool:
+    """Awaitable extvolume.wait_with_backoff (same probe schedule and history)."""
+    start = time.monotonic()
+    delays = extvolume.propagation_delays(kind)
+    attempt = 0
+    with span(f"wait: {description}", "wait") as current:
+        while True:
+            attempt += 1
+            if current is not None:
+                current.attrs["attempts"] = attempt
+            if await check_fn():
+                if kind:
+                    extvolume.record_propagation(kind, time.monotonic() - start)
+                return True
+            remaining = max_wait - (time.monotonic() - start)
+            if remaining <= 0:
+                return False
+            if attempt == 1:
+                click.echo(f"  Waiting for {description}... (up to {max_wait:.0f}s)")
+            await asyncio.sleep(min(next(delays), remaining))
+
+
+async def retry_on_propagation(
+    fn: Callable[[], Awaitable[Any]],
+    is_propagation_error: Callable[[Exception], bool],
+    description: str,
+    max_wait: float = extvolume.PROPAGATION_MAX_WAIT,
+    kind: str | None = None,
+) -> Any:
+    """Awaitable extvolume.retry_on_propagation."""
+    start = time.monotonic()
+    delays = extvolume.propagation_delays(kind)
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            result = await fn()
+        except Exception as e:
+            remaining = max_wait - (time.monotonic() - start)
+            if not is_propagation_error(e) or remaining <= 0:
+                raise
+            if attempt == 1:
+                click.echo(f"  {description} not visible yet, retrying... (up to {max_wait:.0f}s)")
+            with span(f"wait: {description}", "wait", attempt=attempt):
+                await asyncio.sleep(min(next(delays), remaining))
+            continue
+        if kind:
+            extvolume.record_propagation(kind, time.monotonic() - start)
+        return result
+
+
+async def wait_for_iam_role(
+    iam_client: Any, role_name: str, max_wait: float = extvolume.PROPAGATION_MAX_WAIT
+) -> None:
+    """Awaitable extvolume.wait_for_iam_role (poll mode)."""
+    click.echo("Waiting for IAM role propagation...")
+
+    async def check_role() -> bool:
+        try:
+            await iam_client.get_role(RoleName=role_name)
+            return True
+        except ClientError:
+            return False
+
+    if await wait_with_backoff(check_role, "IAM role", max_wait=max_wait, kind="iam_role"):
+        click.echo("✓ IAM role is available")
+    else:
+        click.echo(f"⚠ IAM role not visible after {max_wait:.0f}s, proceeding anyway...")
+
+
+async def wait_for_trust_policy(
+    iam_client: Any,
+    role_name: str,
+    expected_principal: str,
+    max_wait: float = extvolume.PROPAGATION_MAX_WAIT,
+) -> None:
+    """Awaitable extvolume.wait_for_trust_policy (poll mode)."""
+    click.echo("Waiting for trust policy propagation...")
+
+    async def check_trust() -> bool:
+        try:
+            response = await iam_client.get_role(RoleName=role_name)
+        except ClientError:
+            return False
+        return extvolume.trust_policy_allows(response, expected_principal)
+
+    if await wait_with_backoff(check_trust, "trust policy", max_wait=max_wait, kind="trust_policy"):
+        click.echo("✓ Trust policy is updated")
+    else:
+        click.echo(f"⚠ Trust policy not updated after {max_wait:.0f}s, proceeding anyway...")
+
+
+async def create_s3_bucket(
+    s3_client: Any,
+    bucket_name: str,
+    region: str,
+    versioning: bool = True,
+    tags: list[dict[str, str]] | None = None,
+) -> bool:
+    """Awaitable extvolume.create_s3_bucket (``s3_client`` from aws_client)."""
+    click.echo(f"Creating S3 bucket: {bucket_name}")
+
+    try:
+        try:
+            await s3_client.head_bucket(Bucket=bucket_name)
+            click.echo(f"✓ Bucket {bucket_name} already exists")
+            return False
+        except ClientError as e:
+            extvolume.check_head_bucket_error(bucket_name, e)
+
+        await s3_client.create_bucket(**extvolume.get_create_bucket_params(bucket_name, region))
+        click.echo(f"✓ Created bucket: {bucket_name}")
+
+        if versioning:
+            await s3_client.put_bucket_versioning(
+                Bucket=bucket_name, VersioningConfiguration={"Status": "Enabled"}
+            )
+            click.echo("✓ Enabled bucket versioning")
+
+        if tags:
+            await s3_client.put_bucket_tagging(Bucket=bucket_name, Tagging={"TagSet": tags})
+            click.echo("✓ Applied resource tags")
+
+        return True
+
+    except ClientError as e:
+        raise click.ClickException(f"Failed to create bucket: {e}")
+
+
+async def get_aws_account_id(sts_client: Any | None = None) -> str:
+    """Awaitable extvolume.get_aws_account_id.
+
+    Without ``sts_client`` the cached lookup for the default session's
+    credentials is used (run in a worker thread).
+    """
+    if sts_client is None:
+        return await asyncio.to_thread(extvolume.get_aws_account_id)
+    return (await sts_client.get_caller_identity())["Account"]
+
+
+async def create_iam_policy(
+    iam_client: Any,
+    policy_name: str,
+    bucket_name: str,
+    sts_client: Any | None = None,
+    tags: list[dict[str, str]] | None = None,
+) -> str:
+    """Awaitable extvolume.create_iam_policy (clients from aws_client)."""
+    click.echo(f"Creating IAM policy: {policy_name}")
+
+    account_id = await get_aws_account_id(sts_client)
+    policy_arn = f"arn:aws:iam::{account_id}:policy/{policy_name}"
+
+    try:
+        try:
+            await iam_client.get_policy(PolicyArn=policy_arn)
+            click.echo(f"✓ Policy {policy_name} already exists")
+            return policy_arn
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "NoSuchEntity":
+                raise
+
+        response = await iam_client.create_policy(
+            **extvolume.get_create_policy_params(policy_name, bucket_name, tags)
+        )
+        policy_arn = response["Policy"]["Arn"]
+        click.echo(f"✓ Created policy: {policy_arn}")
+        return policy_arn
+
+    except ClientError as e:
+        raise click.ClickException(f"Failed to create IAM policy: {e}")
+
+
+async def create_iam_role(
+    iam_client: Any,
+    role_name: str,
+    policy_arn: str,
+    account_id: str,
+    external_id: str,
+    tags: list[dict[str, str]] | None = None,
+) -> str:
+    """Awaitable extvolume.create_iam_role (``iam_client`` from aws_client)."""
+    click.echo(f"Creating IAM role: {role_name}")
+
+    try:
+        try:
+            response = await iam_client.get_role(RoleName=role_name)
+            click.echo(f"✓ Role {role_name} already exists")
+            return response["Role"]["Arn"]
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "NoSuchEntity":
+                raise
+
+        response = await iam_client.create_role(
+            **extvolume.get_create_role_params(role_name, account_id, external_id, tags)
+        )
+        role_arn = response["Role"]["Arn"]
+        click.echo(f"✓ Created role: {role_arn}")
+
+        await iam_client.attach_role_policy(RoleName=role_name, PolicyArn=policy_arn)
+        click.echo("✓ Attached policy to role")
+
+        return role_arn
+
+    except ClientError as e:
+        raise click.ClickException(f"Failed to create IAM role: {e}")
+
+
+async def update_role_trust_policy(
+    iam_client: Any,
+    role_name: str,
+    snowflake_user_arn: str,
+    external_id: str,
+    max_wait: float = 0.0,
+) -> None:
+    """Awaitable extvolume.update_role_trust_policy (retries a not-yet-visible role)."""
+    click.echo(f"Updating trust policy for role: {role_name}")
+
+    try:
+        params = extvolume.get_update_trust_policy_params(
+            role_name, snowflake_user_arn, external_id
+        )
+        await retry_on_propagation(
+            lambda: iam_client.update_assume_role_policy(**params),
+            extvolume.is_no_such_entity,
+            "IAM role",
+            max_wait=max_wait,
+            kind="iam_role" if max_wait else None,
+        )
+        click.echo(f"✓ Updated trust policy with Snowflake IAM user: {snowflake_user_arn}")
+
+    except ClientError as e:
+        raise click.ClickException(f"Failed to update trust policy: {e}")
+
+
+async def create_external_volume(
+    config: extvolume.ExternalVolumeConfig, role_arn: str, force: bool = False
+) -> None:
+    """Awaitable extvolume.create_external_volume."""
+    click.echo(f"Creating Snowflake external volume: {config.volume_name}")
+    await arun_snow_sql_stdin(extvolume.get_external_volume_sql(config, role_arn, force))
+    click.echo(f"✓ Created external volume: {config.volume_name}")
+
+
+async def describe_external_volume(volume_name: str) -> dict[str, str]:
+    """Awaitable extvolume.describe_external_volume."""
+    click.echo(f"Describing external volume: {volume_name}")
+
+    try:
+        result = await get_inventory().aquery(
+            "EXTERNAL VOLUME", f"DESC EXTERNAL VOLUME {volume_name}", check=True
+        )
+    except click.ClickException as e:
+        raise click.ClickException(
+            f"Failed to describe external volume '{volume_name}'. "
+            f"Verify the volume exists and you have access.\nError: {e}"
+        )
+
+    return extvolume.parse_external_volume_description(volume_name, result)
+
+
+async def drop_external_volume(volume_name: str) -> None:
+    """Awaitable extvolume.drop_external_volume."""
+    click.echo(f"Dropping Snowflake external volume: {volume_name}")
+    await arun_snow_sql(f"DROP EXTERNAL VOLUME IF EXISTS {volume_name}")
+    click.echo(f"✓ Dropped external volume: {volume_name}")
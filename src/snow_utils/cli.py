@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+# Copyright 2026 Snowflake Inc.
+# Generated with Cortex Code
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Single ``snow-utils`` entry point.
+
+Runs the ``pat``, ``networks`` and ``extvolume`` CLI groups, the ``plan`` /
+``apply`` desired-state commands and the Taskfile aliases that wrap them
+(``pat:create``, ``extvolume:up``, ...) in one Python process, instead of
+going through the bash wrapper, ``task`` and ``uv run``. Only the module
+behind the requested command is imported.
+
+Aliases accept the same ``KEY=VALUE`` variables and ``-- <cli args>`` as the
+Taskfile. Anything that is not a CLI-backed alias (``setup``, ``snow:*``,
+``aws:*``, ``help``, ...) is handed to ``task``.
+
+Usage:
+    snow-utils pat:create SA_USER=my_sa SA_ROLE=demo_role -- --skip-verify
+    snow-utils extvolume:up BUCKET=my-data
+    snow-utils pat create --user my_sa --role demo_role --db my_db
+"""
+
+import importlib
+import os
+import shutil
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import click
+
+# CLI groups, imported on demand ("module:attribute").
+GROUPS = {
+    "pat": "snow_utils.pat:cli",
+    "networks": "snow_utils.network:cli",
+    "extvolume": "snow_utils.extvolume:cli",
+    "check": "snow_utils_common.check_setup:check",
+    "shell": "snow_utils.shell:shell",
+    "plan": "snow_utils.reconcile:plan_command",
+    "apply": "snow_utils.reconcile:apply_command",
+}
+GROUP_ALIASES = {"network": "networks", "volumes": "extvolume"}
+
+TASKFILE = Path(__file__).resolve().parents[2] / "Taskfile.yml"
+
+
+@dataclass(frozen=True)
+class TaskAlias:
+    """A Taskfile task that just runs one CLI command.
+
+    ``args`` may reference task variables as ``{NAME}``; ``defaults`` are
+    used for variables not given on the command line or in the environment,
+    and ``env`` renames task variables to the environment variables the CLI
+    reads (e.g. ``VOLUME`` -> ``EXTERNAL_VOLUME_NAME``). ``check`` runs
+    ``check --quiet`` first, like the tasks that depend on ``snow-utils:check``.
+    """
+
+    group: str
+    args: tuple[str, ...]
+    desc: str
+    defaults: dict[str, str] = field(default_factory=dict)
+    env: dict[str, str] = field(default_factory=dict)
+    prompt: str | None = None
+    check: bool = False
+
+
+_NETWORK_DEFAULTS = {"NW_RULE_SCHEMA": "NETWORKS"}
+_DELETE_PROMPT = "This will delete AWS and Snowflake resources. Continue?"
+
+TASK_ALIASES = {
+    "pat:create": TaskAlias("pat", ("create",), "Create/rotate PAT for service user", check=True),
+    "pat:no-rotate": TaskAlias(
+        "pat", ("create", "--no-rotate"), "Create PAT without rotating existing", check=True
+    ),
+    "pat:create-many": TaskAlias(
+        "pat",
+        ("create-many", "--manifest", "{MANIFEST}"),
+        "Create/rotate PATs for many service users from a manifest",
+        defaults={"MANIFEST": "users.yaml"},
+        check=True,
+    ),
+    "pat:remove": TaskAlias(
+        "pat", ("remove", "--yes"), "Remove PAT and associated objects", check=True
+    ),
+    "pat:rotate-many": TaskAlias(
+        "pat",
+        ("rotate-many",),
+        "Rotate many PATs concurrently with retries and a report",
+        check=True,
+    ),
+    "pat:audit": TaskAlias("pat", ("audit",), "List PATs and their expiry across the account"),
+    "networks:create": TaskAlias(
+        "networks",
+        ("rule", "create"),
+        "Create a network rule with optional policy",
+        defaults=_NETWORK_DEFAULTS,
+        check=True,
+    ),
+    "networks:github": TaskAlias(
+        "networks",
+        ("rule", "create", "--allow-gh"),
+        "Create network rule for GitHub Actions IPs",
+        defaults=_NETWORK_DEFAULTS,
+        check=True,
+    ),
+    "networks:google": TaskAlias(
+        "networks",
+        ("rule", "create", "--allow-google"),
+        "Create network rule for Google IPs",
+        defaults=_NETWORK_DEFAULTS,
+        check=True,
+    ),
+    "networks:local": TaskAlias(
+        "networks",
+        ("rule", "create", "--no-gh", "--no-google"),
+        "Create network rule for current IP only",
+        defaults=_NETWORK_DEFAULTS,
+        check=True,
+    ),
+    "networks:policy": TaskAlias(
+        "networks", ("policy", "create"), "Create or alter a network policy"
+    ),
+    "networks:list-rules": TaskAlias(
+        "networks", ("rule", "list"), "List network rules in a schema", defaults=_NETWORK_DEFAULTS
+    ),
+    "networks:list-policies": TaskAlias(
+        "networks", ("policy", "list"), "List all network policies"
+    ),
+    "networks:update-rule": TaskAlias(
+        "networks",
+        ("rule", "update"),
+        "Update (replace) values in an existing network rule",
+        defaults=_NETWORK_DEFAULTS,
+        check=True,
+    ),
+    "networks:delete-rule": TaskAlias(
+        "networks",
+        ("rule", "delete", "--yes"),
+        "Delete a network rule",
+        defaults=_NETWORK_DEFAULTS,
+    ),
+    "networks:delete-policy": TaskAlias(
+        "networks", ("policy", "delete", "--yes"), "Delete a network policy"
+    ),
+    "extvolume:create": TaskAlias(
+        "extvolume", ("create",), "Create S3 bucket, IAM role, and Snowflake external volume"
+    ),
+    "extvolume:create-many": TaskAlias(
+        "extvolume",
+        ("create-many", "--manifest", "{MANIFEST}"),
+        "Create many external volumes from a manifest",
+        defaults={"MANIFEST": "volumes.yaml"},
+    ),
+    "extvolume:delete": TaskAlias(
+        "extvolume",
+        ("delete",),
+        "Delete external volume and AWS resources",
+        prompt=_DELETE_PROMPT,
+    ),
+    "extvolume:verify": TaskAlias(
+        "extvolume",
+        ("verify",),
+        "Verify external volume connectivity",
+        env={"VOLUME": "EXTERNAL_VOLUME_NAME"},
+    ),
+    "extvolume:describe": TaskAlias(
+        "extvolume",
+        ("describe",),
+        "Describe external volume properties",
+        env={"VOLUME": "EXTERNAL_VOLUME_NAME"},
+    ),
+    "extvolume:update-trust": TaskAlias(
+        "extvolume",
+        ("update-trust",),
+        "Update IAM trust policy from external volume",
+        env={"VOLUME": "EXTERNAL_VOLUME_NAME"},
+    ),
+    "extvolume:up": TaskAlias(
+        "extvolume",
+        ("create",),
+        "Quick start - create bucket and external volume with defaults",
+        defaults={"BUCKET": "iceberg-demo"},
+    ),
+    "extvolume:down": TaskAlias(
+        "extvolume",
+        ("delete", "--delete-bucket", "--force"),
+        "Tear down - delete bucket and external volume",
+        defaults={"BUCKET": "iceberg-demo"},
+        prompt=_DELETE_PROMPT,
+    ),
+    "state:plan": TaskAlias(
+        "plan",
+        ("--state", "{STATE}"),
+        "Show changes needed to match the desired-state file",
+        defaults={"STATE": "snow-utils.state.yaml"},
+    ),
+    "state:apply": TaskAlias(
+        "apply",
+        ("--state", "{STATE}"),
+        "Apply the desired-state file (only the statements that changed)",
+        defaults={"STATE": "snow-utils.state.yaml"},
+    ),
+    "help:pat": TaskAlias("pat", ("--help",), "Show pat CLI options"),
+    "help:networks": TaskAlias("networks", ("--help",), "Show network CLI options"),
+    "help:extvolume": TaskAlias("extvolume", ("--help",), "Show extvolume CLI options"),
+    "snow-utils:check": TaskAlias("check", (), "Check if snow-utils infrastructure is ready"),
+}
+
+
+def load_group(name: str) -> click.Command:
+    """Import and return the click command for a CLI group."""
+    module_name, attr = GROUPS[name].split(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def split_task_args(args: list[str]) -> tuple[dict[str, str], list[str]]:
+    """Split Taskfile-style arguments into ``KEY=VALUE`` variables and CLI args.
+
+    Everything after ``--`` is passed to the CLI unchanged. Before it, only
+    ``KEY=VALUE`` pairs are accepted (like ``task``); ``--help`` shows the
+    CLI command's help.
+    """
+    variables: dict[str, str] = {}
+    for i, arg in enumerate(args):
+        if arg == "--":
+            return variables, args[i + 1 :]
+        if arg in ("--help", "-h"):
+            return variables, ["--help"]
+        key, sep, value = arg.partition("=")
+        if not sep or not key.isidentifier():
+            raise click.UsageError(
+                f"Unexpected argument '{arg}': use KEY=VALUE, or pass CLI options after '--'"
+            )
+        variables[key] = value
+    return variables, []
+
+
+def check_setup() -> None:
+    """Run ``check --quiet`` in-process; raise if the infrastructure is not ready."""
+    try:
+        load_group("check").main(args=["--quiet"], prog_name="snow-utils check")
+    except SystemExit as e:
+        if e.code:
+            raise click.ClickException(
+                "snow-utils infrastructure is not ready; run 'snow-utils check' for details"
+            )
+
+
+def run_alias(name: str, args: list[str], yes: bool = False) -> None:
+    """Run a Taskfile alias in-process."""
+    alias = TASK_ALIASES[name]
+    variables, cli_args = split_task_args(args)
+
+    values = {key: os.environ.get(key, "") for key in alias.defaults.keys() | alias.env.keys()}
+    values.update(variables)
+    for key, default in alias.defaults.items():
+        values[key] = values[key] or default
+
+    # Variables become environment variables, as in the Taskfile's env blocks;
+    # the CLIs read their options from them.
+    for key, value in values.items():
+        if value:
+            os.environ[alias.env.get(key, key)] = value
+
+    if alias.prompt and not yes and "--help" not in cli_args:
+        click.confirm(alias.prompt, abort=True)
+
+    try:
+        command_args = [arg.format_map(values) for arg in alias.args]
+    except KeyError as e:
+        raise click.UsageError(f"{name} needs {e.args[0]}=<value>")
+    if alias.check and "--help" not in cli_args:
+        check_setup()
+    load_group(alias.group).main(
+        args=[*command_args, *cli_args], prog_name=f"snow-utils {alias.group}"
+    )
+
+
+def run_task(args: list[str]) -> None:
+    """Hand the command line to ``task`` (replaces this process)."""
+    task = shutil.which("task")
+    if task is None or not TASKFILE.exists():
+        raise click.UsageError(
+            f"Unknown command '{args[0]}'. Run 'snow-utils --help' for available commands."
+        )
+    os.execv(task, [task, "--taskfile", str(TASKFILE), *args])
+
+
+def format_usage() -> str:
+    lines = [
+        "snow-utils - Snowflake External Volume & PAT Manager",
+        "",
+        "Usage:",
+        "  snow-utils [--yes] <alias> [KEY=VALUE ...] [-- CLI options]",
+        "  snow-utils <group> [CLI options] <command> ...",
+        "",
+        "Groups:",
+    ]
+    lines += [f"  {name}" for name in GROUPS]
+    lines += ["", "Aliases:"]
+    width = max(len(name) for name in TASK_ALIASES)
+    lines += [f"  {name:<{width}}  {alias.desc}" for name, alias in TASK_ALIASES.items()]
+    lines += ["", "Other Taskfile tasks (setup, snow:*, aws:*, ...) are run with 'task'."]
+    return "\n".join(lines)
+
+
+def dispatch(args: list[str], *, allow_task: bool = True) -> None:
+    """Run one ``snow-utils`` command line in this process.
+
+    Exits through ``SystemExit`` like a click command. With ``allow_task``
+    false, Taskfile-only tasks are rejected instead of exec'ing ``task``
+    (used by the warm shell, which must not be replaced).
+    """
+    args = list(args)
+    yes = False
+    while args and args[0] in ("--yes", "-y"):
+        yes = True
+        args.pop(0)
+
+    try:
+        if not args or args[0] in ("--help", "-h"):
+            click.echo(format_usage())
+            return
+        if args[0] == "--list-tasks":
+            click.echo("\n".join(TASK_ALIASES))
+            return
+
+        name, rest = args[0], args[1:]
+        name = GROUP_ALIASES.get(name, name)
+        if name in GROUPS:
+            load_group(name).main(args=rest, prog_name=f"snow-utils {name}")
+        elif name in TASK_ALIASES:
+            run_alias(name, rest, yes=yes)
+        elif allow_task:
+            run_task(args)
+        else:
+            raise click.UsageError(f"'{name}' is a Taskfile task; run it with 'task {name}'")
+    except click.ClickException as e:
+        e.show()
+        sys.exit(e.exit_code)
+    except click.Abort:
+        click.echo("Aborted!", err=True)
+        sys.exit(1)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Console entry point for ``snow-utils``.
+
+    When ``SNOW_UTILS_SOCKET`` points at a running ``snow-utils shell --serve``
+    daemon, the command runs there (warm); otherwise it runs in this process.
+    """
+    args = list(sys.argv[1:] if argv is None else argv)
+    socket_path = os.environ.get("SNOW_UTILS_SOCKET")
+    if socket_path and args[:1] != ["shell"]:
+        from .shell import send_command
+
+        exit_code = send_command(args, Path(socket_path))
+        if exit_code is not None:
+            sys.exit(exit_code)
+    dispatch(args)
+
+
+if __name__ == "__main__":
+    main()
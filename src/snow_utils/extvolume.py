@@ -23,68 +23,195 @@ Creates and configures:
 - Updates IAM trust policy with Snowflake's IAM user ARN and external ID
 """
 
+import contextlib
+import contextvars
 import getpass
+import hashlib
+import io
 import json
 import os
+import random
 import re
+import statistics
+import sys
+import threading
 import time
 import uuid
-from collections.abc import Callable
+from collections import Counter
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any
 
-import boto3
 import click
-from botocore.exceptions import ClientError
 from dotenv import load_dotenv
 from snow_utils_common import (
+    StepGraph,
+    get_inventory,
+    instrument_boto3_client,
+    load_manifest,
     mask_sensitive_string,
     run_snow_sql,
     run_snow_sql_stdin,
     set_masking,
     set_snow_cli_options,
+    setup_tracing,
+    span,
 )
+from snow_utils_common.disk_cache import read_cache, write_cache
 
 # =============================================================================
 # Wait Utilities
 # =============================================================================
 
 
+WAIT_MODES = ("poll", "waiter", "optimistic")
+PROPAGATION_MAX_WAIT = 60.0  # seconds before giving up on an IAM change
+
+# Observed propagation latencies (seconds), newest last, per kind of change.
+_PROPAGATION_CACHE = "propagation.json"
+_PROPAGATION_SAMPLES = 20
+# create-many records from worker threads; the read-modify-write must not interleave.
+_propagation_lock = threading.Lock()
+
+
+def _propagation_history() -> dict[str, list[float]]:
+    data = read_cache(_PROPAGATION_CACHE)
+    return data if isinstance(data, dict) else {}
+
+
+def record_propagation(kind: str, seconds: float) -> None:
+    """Remember how long a change of ``kind`` took to become visible."""
+    with _propagation_lock:
+        history = _propagation_history()
+        history[kind] = [*history.get(kind, []), round(seconds, 3)][-_PROPAGATION_SAMPLES:]
+        write_cache(_PROPAGATION_CACHE, history)
+
+
+def propagation_delays(
+    kind: str | None = None,
+    initial_delay: float = 0.25,
+    max_delay: float = 5.0,
+    backoff_factor: float = 1.5,
+) -> Iterator[float]:
+    """
+    Jittered sleep schedule between probes for a propagating change.
+
+    Starts below a second, or at the median latency recorded for ``kind``
+    (so the second probe usually lands right when the change shows up),
+    then backs off by ``backoff_factor`` up to ``max_delay``. Each delay is
+    jittered by +/-25% so concurrent waiters do not probe in lockstep.
+    """
+    samples = _propagation_history().get(kind, []) if kind else []
+    delay = statistics.median(samples) if samples else initial_delay
+    delay = min(max(delay, 0.1), max_delay)
+    while True:
+        yield delay * random.uniform(0.75, 1.25)
+        delay = min(delay * backoff_factor, max_delay)
+
+
 def wait_with_backoff(
     check_fn: Callable[[], bool],
     description: str,
-    max_attempts: int = 6,
-    initial_delay: float = 2.0,
-    max_delay: float = 30.0,
-    backoff_factor: float = 2.0,
+    max_wait: float = PROPAGATION_MAX_WAIT,
+    initial_delay: float = 0.25,
+    max_delay: float = 5.0,
+    backoff_factor: float = 1.5,
+    kind: str | None = None,
 ) -> bool:
     """
-    Wait with exponential backoff until check_fn returns True.
+    Poll check_fn until it returns True, with jittered exponential backoff.
+
+    The first probe runs immediately; see ``propagation_delays`` for the
+    schedule after that.
 
     Args:
         check_fn: Function that returns True when ready, False otherwise
         description: What we're waiting for (for logging)
-        max_attempts: Maximum number of attempts
-        initial_delay: Initial delay in seconds
+        max_wait: Give up after this many seconds (0 = probe once)
+        initial_delay: First delay in seconds when there is no history
         max_delay: Maximum delay between attempts
         backoff_factor: Multiplier for each subsequent delay
+        kind: Record the observed latency under this key and adapt the
+            schedule to earlier observations (e.g. "iam_role")
 
     Returns:
-        True if check succeeded, False if all attempts exhausted
+        True if check succeeded, False if max_wait elapsed first
     """
-    delay = initial_delay
-    for attempt in range(1, max_attempts + 1):
-        if check_fn():
-            return True
-        if attempt < max_attempts:
-            click.echo(f"  Waiting for {description}... (attempt {attempt}/{max_attempts})")
-            time.sleep(delay)
-            delay = min(delay * backoff_factor, max_delay)
-    return False
+    start = time.monotonic()
+    delays = propagation_delays(kind, initial_delay, max_delay, backoff_factor)
+    attempt = 0
+    with span(f"wait: {description}", "wait") as current:
+        while True:
+            attempt += 1
+            if current is not None:
+                current.attrs["attempts"] = attempt
+            if check_fn():
+                if kind:
+                    record_propagation(kind, time.monotonic() - start)
+                return True
+            remaining = max_wait - (time.monotonic() - start)
+            if remaining <= 0:
+                return False
+            if attempt == 1:
+                click.echo(f"  Waiting for {description}... (up to {max_wait:.0f}s)")
+            time.sleep(min(next(delays), remaining))
+
+
+def retry_on_propagation(
+    fn: Callable[[], Any],
+    is_propagation_error: Callable[[Exception], bool],
+    description: str,
+    max_wait: float = PROPAGATION_MAX_WAIT,
+    kind: str | None = None,
+) -> Any:
+    """
+    Optimistic proceed: run fn now, retrying only on eventual-consistency errors.
 
+    Any other error, or a propagation error after ``max_wait`` seconds, is
+    raised unchanged.
+
+    Args:
+        fn: The next step, which depends on a change that may not be visible yet
+        is_propagation_error: True for errors that mean "not visible yet"
+        description: What we're waiting for (for logging)
+        max_wait: Stop retrying after this many seconds (0 = no retries)
+        kind: Record the observed latency under this key (see wait_with_backoff)
+    """
+    start = time.monotonic()
+    delays = propagation_delays(kind)
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            result = fn()
+        except Exception as e:
+            remaining = max_wait - (time.monotonic() - start)
+            if not is_propagation_error(e) or remaining <= 0:
+                raise
+            if attempt == 1:
+                click.echo(f"  {description} not visible yet, retrying... (up to {max_wait:.0f}s)")
+            with span(f"wait: {description}", "wait", attempt=attempt):
+                time.sleep(min(next(delays), remaining))
+            continue
+        if kind:
+            record_propagation(kind, time.monotonic() - start)
+        return result
+
+
+def is_no_such_entity(error: Exception) -> bool:
+    """IAM's "not visible yet" error for a role created moments ago."""
+    response = getattr(error, "response", None) or {}
+    return response.get("Error", {}).get("Code") == "NoSuchEntity"
+
+
+def wait_for_iam_role(
+    iam_client: Any, role_name: str, max_wait: float = PROPAGATION_MAX_WAIT, mode: str = "poll"
+) -> None:
+    """Wait for IAM role to be available (mode "poll" or "waiter")."""
+    from botocore.exceptions import ClientError, WaiterError
 
-def wait_for_iam_role(iam_client: Any, role_name: str, max_wait: int = 30) -> None:
-    """Wait for IAM role to be available with exponential backoff."""
     click.echo("Waiting for IAM role propagation...")
 
     def check_role() -> bool:
@@ -94,36 +221,100 @@ def wait_for_iam_role(iam_client: Any, role_name: str, max_wait: int = 30) -> No
         except ClientError:
             return False
 
-    if wait_with_backoff(check_role, "IAM role", max_attempts=6, initial_delay=2.0):
+    if mode == "waiter":
+        start = time.monotonic()
+        try:
+            with span("wait: IAM role (boto3 waiter)", "wait"):
+                iam_client.get_waiter("role_exists").wait(
+                    RoleName=role_name,
+                    WaiterConfig={"Delay": 1, "MaxAttempts": max(1, int(max_wait))},
+                )
+            record_propagation("iam_role", time.monotonic() - start)
+            available = True
+        except WaiterError:
+            available = False
+    else:
+        available = wait_with_backoff(check_role, "IAM role", max_wait=max_wait, kind="iam_role")
+
+    if available:
         click.echo("✓ IAM role is available")
     else:
-        click.echo("⚠ IAM role propagation timeout, proceeding anyway...")
+        click.echo(f"⚠ IAM role not visible after {max_wait:.0f}s, proceeding anyway...")
+
+
+def _trust_policy_waiter_model(expected_principal: str, max_wait: float) -> dict:
+    """botocore waiter definition for GetRole returning the expected principal."""
+    return {
+        "version": 2,
+        "waiters": {
+            "TrustPolicyUpdated": {
+                "operation": "GetRole",
+                "delay": 1,
+                "maxAttempts": max(1, int(max_wait)),
+                "acceptors": [
+                    {
+                        "matcher": "pathAny",
+                        "argument": "Role.AssumeRolePolicyDocument.Statement[].Principal.AWS",
+                        "expected": expected_principal,
+                        "state": "success",
+                    },
+                    {"matcher": "error", "expected": "NoSuchEntity", "state": "retry"},
+                ],
+            }
+        },
+    }
+
+
+def trust_policy_allows(get_role_response: dict, expected_principal: str) -> bool:
+    """Whether a GetRole response's trust policy names ``expected_principal``."""
+    trust_policy = get_role_response["Role"]["AssumeRolePolicyDocument"]
+    for statement in trust_policy.get("Statement", []):
+        principal = statement.get("Principal", {})
+        if isinstance(principal, dict) and expected_principal in str(principal.get("AWS", "")):
+            return True
+    return False
 
 
 def wait_for_trust_policy(
-    iam_client: Any, role_name: str, expected_principal: str, max_wait: int = 30
+    iam_client: Any,
+    role_name: str,
+    expected_principal: str,
+    max_wait: float = PROPAGATION_MAX_WAIT,
+    mode: str = "poll",
 ) -> None:
-    """Wait for IAM trust policy to be updated with exponential backoff."""
+    """Wait for IAM trust policy to be updated (mode "poll" or "waiter")."""
+    from botocore.exceptions import ClientError, WaiterError
+
     click.echo("Waiting for trust policy propagation...")
 
     def check_trust() -> bool:
         try:
-            response = iam_client.get_role(RoleName=role_name)
-            trust_policy = response["Role"]["AssumeRolePolicyDocument"]
-            for statement in trust_policy.get("Statement", []):
-                principal = statement.get("Principal", {})
-                if isinstance(principal, dict):
-                    aws_principal = principal.get("AWS", "")
-                    if expected_principal in str(aws_principal):
-                        return True
-            return False
+            return trust_policy_allows(iam_client.get_role(RoleName=role_name), expected_principal)
         except ClientError:
             return False
 
-    if wait_with_backoff(check_trust, "trust policy", max_attempts=6, initial_delay=2.0):
+    if mode == "waiter":
+        from botocore.waiter import WaiterModel, create_waiter_with_client
+
+        model = WaiterModel(_trust_policy_waiter_model(expected_principal, max_wait))
+        waiter = create_waiter_with_client("TrustPolicyUpdated", model, iam_client)
+        start = time.monotonic()
+        try:
+            with span("wait: trust policy (boto3 waiter)", "wait"):
+                waiter.wait(RoleName=role_name)
+            record_propagation("trust_policy", time.monotonic() - start)
+            updated = True
+        except WaiterError:
+            updated = False
+    else:
+        updated = wait_with_backoff(
+            check_trust, "trust policy", max_wait=max_wait, kind="trust_policy"
+        )
+
+    if updated:
         click.echo("✓ Trust policy is updated")
     else:
-        click.echo("⚠ Trust policy propagation timeout, proceeding anyway...")
+        click.echo(f"⚠ Trust policy not updated after {max_wait:.0f}s, proceeding anyway...")
 
 
 def normalize_identifier(name: str, style: str = "snowflake") -> str:
@@ -257,11 +448,6 @@ def generate_external_id(bucket: str, prefix: str | None = None) -> str:
     return to_sql_identifier(base_name, prefix)
 
 
-def get_aws_account_id(sts_client: Any) -> str:
-    """Get the current AWS account ID."""
-    return sts_client.get_caller_identity()["Account"]
-
-
 def get_resource_tags(prefix: str | None, bucket: str, volume_name: str) -> list[dict[str, str]]:
     """Generate AWS resource tags for traceability and cost allocation.
 
@@ -277,11 +463,240 @@ def get_resource_tags(prefix: str | None, bucket: str, volume_name: str) -> list
     ]
 
 
+def build_external_volume_config(
+    bucket: str,
+    region: str,
+    prefix: str | None,
+    role_name: str | None = None,
+    policy_name: str | None = None,
+    volume_name: str | None = None,
+    storage_location_name: str | None = None,
+    external_id: str | None = None,
+    allow_writes: bool = True,
+    comment: str | None = None,
+) -> ExternalVolumeConfig:
+    """Derive all resource names for a bucket (explicit names win)."""
+    return ExternalVolumeConfig(
+        # AWS names (lowercase, hyphens)
+        bucket_name=to_aws_name(bucket, prefix),
+        role_name=role_name or to_aws_name(f"{bucket}-snowflake-role", prefix),
+        policy_name=policy_name or to_aws_name(f"{bucket}-snowflake-policy", prefix),
+        storage_location_name=(
+            storage_location_name or to_aws_name(f"{bucket}-s3-{region}", prefix)
+        ),
+        # Snowflake names (uppercase, underscores, SQL-safe)
+        volume_name=volume_name or to_sql_identifier(f"{bucket}_external_volume", prefix),
+        # Unique external ID for security (prevents confused deputy problem)
+        external_id=external_id or generate_external_id(bucket, prefix),
+        aws_region=region,
+        allow_writes=allow_writes,
+        comment=comment or format_comment(prefix, bucket),
+    )
+
+
+def get_create_result(
+    config: ExternalVolumeConfig,
+    prefix: str | None,
+    tags: list[dict[str, str]],
+    status: str,
+    account_id: str | None = None,
+    role_arn: str | None = None,
+) -> dict:
+    """Result dict for ``create``/``create-many`` JSON output."""
+    result = {
+        "status": status,
+        "prefix": prefix,
+        "aws": {
+            "bucket": config.bucket_name,
+            "role": config.role_name,
+            "policy": config.policy_name,
+            "storage_location": config.storage_location_name,
+            "region": config.aws_region,
+            "tags": {tag["Key"]: tag["Value"] for tag in tags},
+        },
+        "snowflake": {
+            "external_volume": config.volume_name,
+            "external_id": config.external_id,
+            "allow_writes": config.allow_writes,
+            "comment": config.comment,
+        },
+    }
+    if account_id:
+        result["aws"]["account_id"] = account_id
+    if role_arn:
+        result["aws"]["role_arn"] = role_arn
+    return result
+
+
+# =============================================================================
+# AWS Clients
+# =============================================================================
+
+# Enough connections for the concurrent create steps and --workers batch deletes.
+AWS_MAX_POOL_CONNECTIONS = 32
+AWS_CONNECT_TIMEOUT = 10
+AWS_READ_TIMEOUT = 60
+AWS_MAX_ATTEMPTS = 8
+
+_aws_lock = threading.Lock()
+_aws_clients: dict[tuple, Any] = {}
+_account_ids: dict[str, str] = {}
+# Environment boto3's default session was built from; a long-lived process
+# (snow-utils shell) rebuilds the session when a command's differs.
+_AWS_SESSION_ENV = (
+    "AWS_PROFILE",
+    "AWS_DEFAULT_PROFILE",
+    "AWS_REGION",
+    "AWS_DEFAULT_REGION",
+    "AWS_ACCESS_KEY_ID",
+    "AWS_SECRET_ACCESS_KEY",
+    "AWS_SESSION_TOKEN",
+    "AWS_CONFIG_FILE",
+    "AWS_SHARED_CREDENTIALS_FILE",
+    "AWS_ENDPOINT_URL",
+)
+_aws_session_env: tuple | None = None
+
+# Account ID per credential fingerprint, kept across invocations.
+_IDENTITY_CACHE = "aws-identity.json"
+_IDENTITY_ENTRIES = 20
+
+
+def get_aws_config() -> Any:
+    """botocore Config shared by all snow-utils AWS clients."""
+    from botocore.config import Config
+
+    return Config(
+        max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+        connect_timeout=AWS_CONNECT_TIMEOUT,
+        read_timeout=AWS_READ_TIMEOUT,
+        retries={"mode": "adaptive", "max_attempts": AWS_MAX_ATTEMPTS},
+    )
+
+
+def _aws_session() -> Any:
+    """boto3's default session, rebuilt (dropping cached clients) when the AWS env changed."""
+    global _aws_session_env
+    import boto3
+
+    env = tuple(os.environ.get(name) for name in _AWS_SESSION_ENV)
+    with _aws_lock:
+        changed = _aws_session_env is not None and env != _aws_session_env
+        if boto3.DEFAULT_SESSION is None or changed:
+            boto3.setup_default_session()
+            _aws_clients.clear()
+        _aws_session_env = env
+        return boto3.DEFAULT_SESSION
+
+
+def get_aws_client(service: str, region_name: str | None = None, **kwargs: Any) -> Any:
+    """
+    Return the shared boto3 client for a service and region.
+
+    Clients are created once per process from boto3's default session with
+    ``get_aws_config()``, so credential resolution, endpoint setup and
+    connection pools are reused across steps, commands (in the warm shell)
+    and threads (clients are thread-safe; creating them is not).
+
+    Args:
+        service: AWS service name ("s3", "iam", "sts")
+        region_name: Region (default: the session's)
+        **kwargs: Extra ``client()`` arguments, e.g. ``endpoint_url``; a
+            ``config`` is merged over the shared one and the resulting
+            client is not cached (botocore configs compare by identity)
+    """
+    session = _aws_session()
+    custom_config = kwargs.pop("config", None)
+    if custom_config is not None:
+        with _aws_lock:
+            client = session.client(
+                service,
+                region_name=region_name,
+                config=get_aws_config().merge(custom_config),
+                **kwargs,
+            )
+        instrument_boto3_client(client)
+        return client
+
+    key = (session, service, region_name, tuple(sorted(kwargs.items())))
+    with _aws_lock:
+        client = _aws_clients.get(key)
+        if client is None:
+            client = session.client(
+                service, region_name=region_name, config=get_aws_config(), **kwargs
+            )
+            # Cached clients outlive one command; let later --trace runs see their calls.
+            instrument_boto3_client(client)
+            _aws_clients[key] = client
+    return client
+
+
+def _credential_fingerprint() -> str | None:
+    credentials = _aws_session().get_credentials()
+    if credentials is None:
+        return None
+    frozen = credentials.get_frozen_credentials()
+    return hashlib.sha256(f"{frozen.access_key}:{frozen.secret_key}".encode()).hexdigest()[:32]
+
+
+def get_aws_account_id(sts_client: Any | None = None) -> str:
+    """
+    Get the current AWS account ID.
+
+    Without ``sts_client``, the answer for the default session's credentials
+    is cached per credential fingerprint (in memory and in the disk cache),
+    so only the first command with a given set of credentials calls STS.
+
+    Args:
+        sts_client: Ask this STS client instead (not cached), e.g. one built
+            for a different endpoint
+    """
+    if sts_client is not None:
+        return sts_client.get_caller_identity()["Account"]
+
+    fingerprint = _credential_fingerprint()
+    if fingerprint is None:
+        return get_aws_client("sts").get_caller_identity()["Account"]
+    if fingerprint in _account_ids:
+        return _account_ids[fingerprint]
+
+    cached = read_cache(_IDENTITY_CACHE)
+    cached = cached if isinstance(cached, dict) else {}
+    account_id = cached.get(fingerprint)
+    if not isinstance(account_id, str):
+        account_id = get_aws_client("sts").get_caller_identity()["Account"]
+        cached.pop(fingerprint, None)
+        cached[fingerprint] = account_id
+        write_cache(_IDENTITY_CACHE, dict(list(cached.items())[-_IDENTITY_ENTRIES:]))
+    _account_ids[fingerprint] = account_id
+    return account_id
+
+
 # =============================================================================
 # S3 Bucket Operations
 # =============================================================================
 
 
+def get_create_bucket_params(bucket_name: str, region: str) -> dict[str, Any]:
+    """create_bucket() arguments (a location constraint outside us-east-1)."""
+    params: dict[str, Any] = {"Bucket": bucket_name}
+    if region != "us-east-1":
+        params["CreateBucketConfiguration"] = {"LocationConstraint": region}
+    return params
+
+
+def check_head_bucket_error(bucket_name: str, error: Any) -> None:
+    """Re-raise a head_bucket ClientError unless it means the bucket does not exist."""
+    error_code = error.response["Error"]["Code"]
+    if error_code == "403":
+        raise click.ClickException(
+            f"Bucket {bucket_name} exists but you don't have access. "
+            "Choose a different bucket name."
+        )
+    if error_code != "404":
+        raise error
+
+
 def create_s3_bucket(
     s3_client: Any,
     bucket_name: str,
@@ -290,6 +705,8 @@ def create_s3_bucket(
     tags: list[dict[str, str]] | None = None,
 ) -> bool:
     """Create an S3 bucket with optional versioning and tags."""
+    from botocore.exceptions import ClientError
+
     click.echo(f"Creating S3 bucket: {bucket_name}")
 
     try:
@@ -299,21 +716,10 @@ def create_s3_bucket(
             click.echo(f"✓ Bucket {bucket_name} already exists")
             return False
         except ClientError as e:
-            error_code = e.response["Error"]["Code"]
-            if error_code == "403":
-                raise click.ClickException(
-                    f"Bucket {bucket_name} exists but you don't have access. "
-                    "Choose a different bucket name."
-                )
-            if error_code != "404":
-                raise
+            check_head_bucket_error(bucket_name, e)
 
         # Create bucket with location constraint for non-us-east-1 regions
-        create_params: dict[str, Any] = {"Bucket": bucket_name}
-        if region != "us-east-1":
-            create_params["CreateBucketConfiguration"] = {"LocationConstraint": region}
-
-        s3_client.create_bucket(**create_params)
+        s3_client.create_bucket(**get_create_bucket_params(bucket_name, region))
         click.echo(f"✓ Created bucket: {bucket_name}")
 
         # Enable versioning (recommended for data recovery)
@@ -334,28 +740,258 @@ def create_s3_bucket(
         raise click.ClickException(f"Failed to create bucket: {e}")
 
 
-def delete_s3_bucket(s3_client: Any, bucket_name: str, force: bool = False) -> None:
-    """Delete an S3 bucket (optionally emptying it first)."""
+# S3 error codes that mean "slow down", retried with adaptive backoff.
+S3_THROTTLE_CODES = {
+    "SlowDown",
+    "Throttling",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+    "503",
+}
+S3_DELETE_BATCH_SIZE = 1000  # delete_objects limit
+
+
+class _AdaptiveThrottle:
+    """Shared backoff for S3 workers: doubles on throttling, decays on success."""
+
+    def __init__(self, max_delay: float = 20.0) -> None:
+        self.delay = 0.0
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if self.delay:
+            with span("wait: S3 throttle backoff", "wait"):
+                time.sleep(self.delay * random.uniform(0.5, 1.0))
+
+    def throttled(self) -> None:
+        with self._lock:
+            self.delay = min(max(self.delay * 2, 0.2), self.max_delay)
+
+    def succeeded(self) -> None:
+        with self._lock:
+            self.delay = self.delay / 2 if self.delay > 0.05 else 0.0
+
+
+def _delete_object_batch(
+    s3_client: Any,
+    bucket_name: str,
+    objects: list[dict[str, str]],
+    throttle: _AdaptiveThrottle,
+    max_attempts: int = 8,
+) -> tuple[int, list[dict]]:
+    """Delete up to 1000 object versions, retrying throttled keys.
+
+    Returns:
+        Tuple of (deleted count, per-key errors that could not be retried)
+    """
+    from botocore.exceptions import ClientError
+
+    deleted = 0
+    pending = objects
+    for attempt in range(1, max_attempts + 1):
+        throttle.wait()
+        try:
+            response = s3_client.delete_objects(
+                Bucket=bucket_name, Delete={"Objects": pending, "Quiet": True}
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] in S3_THROTTLE_CODES and attempt < max_attempts:
+                throttle.throttled()
+                continue
+            raise
+        errors = response.get("Errors", [])
+        deleted += len(pending) - len(errors)
+        retry = [e for e in errors if e.get("Code") in S3_THROTTLE_CODES | {"InternalError"}]
+        if not retry:
+            throttle.succeeded()
+            return deleted, errors
+        throttle.throttled()
+        pending = [{"Key": e["Key"], "VersionId": e["VersionId"]} for e in retry]
+    return deleted, [{"Key": o["Key"], "Code": "RetriesExhausted"} for o in pending]
+
+
+def _write_checkpoint(path: Path, data: dict) -> None:
+    """Atomically write the bucket-emptying checkpoint."""
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(data))
+    os.replace(tmp, path)
+
+
+def empty_s3_bucket(
+    s3_client: Any,
+    bucket_name: str,
+    workers: int = 8,
+    checkpoint: Path | None = None,
+    progress: bool = True,
+) -> int:
+    """
+    Delete every object version and delete marker in a bucket.
+
+    Listing runs on the calling thread and overlaps with deletion: each
+    listed page is split into batches of up to 1000 keys that a worker pool
+    sends with ``delete_objects``. Throttling (SlowDown) backs off
+    adaptively across all workers.
+
+    With ``checkpoint``, the listing position of the last page whose
+    batches all completed is saved, so an interrupted run resumes there
+    instead of re-listing everything. A final listing from the start
+    confirms the bucket is empty. The file is removed once the bucket is
+    empty; an unreadable file is ignored with a warning.
+
+    Args:
+        s3_client: boto3 S3 client
+        bucket_name: Bucket to empty
+        workers: Concurrent delete_objects calls
+        checkpoint: Optional resumable checkpoint file
+        progress: Print objects/sec progress
+
+    Returns:
+        Number of object versions deleted
+
+    Raises:
+        click.ClickException: If some objects could not be deleted
+    """
+    state = {"key_marker": None, "version_id_marker": None, "deleted": 0}
+    if checkpoint and checkpoint.exists():
+        try:
+            saved = json.loads(checkpoint.read_text())
+        except ValueError:
+            saved = None
+        if not isinstance(saved, dict):
+            # E.g. truncated by a crash outside _write_checkpoint; start over.
+            click.echo(f"⚠ Ignoring unreadable checkpoint {checkpoint}, listing from the start")
+            saved = {}
+        if saved.get("bucket") == bucket_name:
+            state.update({k: saved.get(k) for k in state})
+            click.echo(f"  Resuming from checkpoint ({state['deleted']} objects already deleted)")
+    resumed = state["deleted"] or 0
+
+    throttle = _AdaptiveThrottle()
+    in_flight = threading.BoundedSemaphore(workers * 2)
+    lock = threading.Lock()
+    errors: list[dict] = []
+    # page number -> [outstanding batches, listing position after that page]
+    pages: dict[int, list] = {}
+    next_page_to_commit = 0
+    deleted = 0
+    started = last_report = time.monotonic()
+
+    def commit_pages() -> None:
+        """Advance the checkpoint past every leading page that is fully deleted."""
+        nonlocal next_page_to_commit
+        while next_page_to_commit in pages and pages[next_page_to_commit][0] == 0:
+            _, position = pages.pop(next_page_to_commit)
+            next_page_to_commit += 1
+            if checkpoint:
+                state.update(position, deleted=resumed + deleted)
+                _write_checkpoint(checkpoint, {"bucket": bucket_name, **state})
+
+    def delete_batch(page_no: int, batch: list[dict]) -> None:
+        """Delete one batch on a worker and record the outcome."""
+        nonlocal deleted, last_report
+        try:
+            count, failed = _delete_object_batch(s3_client, bucket_name, batch, throttle)
+        except Exception as e:
+            count, failed = 0, [{"Key": "*", "Code": str(e)}]
+        finally:
+            in_flight.release()
+        with lock:
+            deleted += count
+            errors.extend(failed)
+            pages[page_no][0] -= 1
+            commit_pages()
+            now = time.monotonic()
+            if progress and now - last_report >= 2:
+                rate = deleted / max(now - started, 1e-6)
+                click.echo(f"  Deleted {resumed + deleted} objects ({rate:,.0f} objects/sec)")
+                last_report = now
+
+    list_params: dict[str, Any] = {"Bucket": bucket_name, "MaxKeys": S3_DELETE_BATCH_SIZE}
+    if state["key_marker"]:
+        list_params["KeyMarker"] = state["key_marker"]
+        if state["version_id_marker"]:
+            list_params["VersionIdMarker"] = state["version_id_marker"]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        page_no = 0
+        while True:
+            # One listing pass. Markers of versions deleted meanwhile can end a
+            # pass early, so passes repeat from the start until one finds nothing.
+            from_start = "KeyMarker" not in list_params
+            listed = 0
+            futures = []
+            while True:
+                page = s3_client.list_object_versions(**list_params)
+                objects = [
+                    {"Key": v["Key"], "VersionId": v["VersionId"]}
+                    for v in page.get("Versions", []) + page.get("DeleteMarkers", [])
+                ]
+                listed += len(objects)
+                position = {
+                    "key_marker": page.get("NextKeyMarker"),
+                    "version_id_marker": page.get("NextVersionIdMarker"),
+                }
+                batches = [
+                    objects[i : i + S3_DELETE_BATCH_SIZE]
+                    for i in range(0, len(objects), S3_DELETE_BATCH_SIZE)
+                ]
+                with lock:
+                    pages[page_no] = [len(batches), position]
+                    commit_pages()
+                for batch in batches:
+                    in_flight.acquire()
+                    futures.append(pool.submit(delete_batch, page_no, batch))
+                page_no += 1
+                if not page.get("IsTruncated") or not position["key_marker"]:
+                    break
+                list_params["KeyMarker"] = position["key_marker"]
+                list_params.pop("VersionIdMarker", None)
+                if position["version_id_marker"]:
+                    list_params["VersionIdMarker"] = position["version_id_marker"]
+
+            wait(futures)
+            if (from_start and not listed) or errors:
+                break
+            list_params.pop("KeyMarker", None)
+            list_params.pop("VersionIdMarker", None)
+
+    elapsed = max(time.monotonic() - started, 1e-6)
+    if progress:
+        click.echo(
+            f"✓ Deleted {deleted} object versions in {elapsed:.1f}s "
+            f"({deleted / elapsed:,.0f} objects/sec)"
+        )
+
+    if errors:
+        sample = ", ".join(f"{e.get('Key')} ({e.get('Code')})" for e in errors[:5])
+        raise click.ClickException(
+            f"Failed to delete {len(errors)} object(s) from {bucket_name}: {sample}"
+            + (" - rerun with the same --checkpoint to resume" if checkpoint else "")
+        )
+    if checkpoint:
+        checkpoint.unlink(missing_ok=True)
+    return resumed + deleted
+
+
+def delete_s3_bucket(
+    s3_client: Any,
+    bucket_name: str,
+    force: bool = False,
+    workers: int = 8,
+    checkpoint: Path | None = None,
+    progress: bool = True,
+) -> None:
+    """Delete an S3 bucket (optionally emptying it first, see empty_s3_bucket)."""
+    from botocore.exceptions import ClientError
+
     click.echo(f"Deleting S3 bucket: {bucket_name}")
 
     try:
         if force:
-            # Delete all objects first
-            paginator = s3_client.get_paginator("list_object_versions")
-            for page in paginator.paginate(Bucket=bucket_name):
-                objects_to_delete = []
-                for version in page.get("Versions", []):
-                    objects_to_delete.append(
-                        {"Key": version["Key"], "VersionId": version["VersionId"]}
-                    )
-                for marker in page.get("DeleteMarkers", []):
-                    objects_to_delete.append(
-                        {"Key": marker["Key"], "VersionId": marker["VersionId"]}
-                    )
-                if objects_to_delete:
-                    s3_client.delete_objects(
-                        Bucket=bucket_name, Delete={"Objects": objects_to_delete}
-                    )
+            empty_s3_bucket(
+                s3_client, bucket_name, workers=workers, checkpoint=checkpoint, progress=progress
+            )
 
         s3_client.delete_bucket(Bucket=bucket_name)
         click.echo(f"✓ Deleted bucket: {bucket_name}")
@@ -395,6 +1031,20 @@ def get_s3_access_policy(bucket_name: str) -> dict:
     }
 
 
+def get_create_policy_params(
+    policy_name: str, bucket_name: str, tags: list[dict[str, str]] | None = None
+) -> dict[str, Any]:
+    """create_policy() arguments for the bucket access policy."""
+    params: dict[str, Any] = {
+        "PolicyName": policy_name,
+        "PolicyDocument": json.dumps(get_s3_access_policy(bucket_name)),
+        "Description": f"Policy for Snowflake external volume access to {bucket_name}",
+    }
+    if tags:
+        params["Tags"] = tags
+    return params
+
+
 def create_iam_policy(
     iam_client: Any,
     policy_name: str,
@@ -405,13 +1055,15 @@ def create_iam_policy(
     """Create IAM policy for S3 access and return the policy ARN.
 
     Args:
-        sts_client: Optional pre-configured STS client. When omitted a new
-            ``boto3.client("sts")`` is created, which inherits the current
-            env -- problematic when RustFS ``AWS_*`` vars are set.
+        sts_client: Optional pre-configured STS client. When omitted the
+            shared client and cached account ID are used, which follow the
+            default session -- problematic when RustFS ``AWS_*`` vars are set.
     """
+    from botocore.exceptions import ClientError
+
     click.echo(f"Creating IAM policy: {policy_name}")
 
-    account_id = get_aws_account_id(sts_client or boto3.client("sts"))
+    account_id = get_aws_account_id(sts_client)
     policy_arn = f"arn:aws:iam::{account_id}:policy/{policy_name}"
 
     try:
@@ -425,15 +1077,9 @@ def create_iam_policy(
                 raise
 
         # Create policy
-        policy_document = get_s3_access_policy(bucket_name)
-        create_params: dict[str, Any] = {
-            "PolicyName": policy_name,
-            "PolicyDocument": json.dumps(policy_document),
-            "Description": f"Policy for Snowflake external volume access to {bucket_name}",
-        }
-        if tags:
-            create_params["Tags"] = tags
-        response = iam_client.create_policy(**create_params)
+        response = iam_client.create_policy(
+            **get_create_policy_params(policy_name, bucket_name, tags)
+        )
         policy_arn = response["Policy"]["Arn"]
         click.echo(f"✓ Created policy: {policy_arn}")
         return policy_arn
@@ -444,6 +1090,8 @@ def create_iam_policy(
 
 def delete_iam_policy(iam_client: Any, policy_arn: str) -> None:
     """Delete an IAM policy."""
+    from botocore.exceptions import ClientError
+
     click.echo(f"Deleting IAM policy: {policy_arn}")
 
     try:
@@ -490,6 +1138,28 @@ def get_snowflake_trust_policy(snowflake_user_arn: str, external_id: str) -> dic
     }
 
 
+def get_create_role_params(
+    role_name: str, account_id: str, external_id: str, tags: list[dict[str, str]] | None = None
+) -> dict[str, Any]:
+    """create_role() arguments, with the initial trust policy."""
+    params: dict[str, Any] = {
+        "RoleName": role_name,
+        "AssumeRolePolicyDocument": json.dumps(get_initial_trust_policy(account_id, external_id)),
+        "Description": "IAM role for Snowflake external volume access",
+    }
+    if tags:
+        params["Tags"] = tags
+    return params
+
+
+def get_update_trust_policy_params(
+    role_name: str, snowflake_user_arn: str, external_id: str
+) -> dict[str, Any]:
+    """update_assume_role_policy() arguments trusting the Snowflake IAM user."""
+    trust_policy = get_snowflake_trust_policy(snowflake_user_arn, external_id)
+    return {"RoleName": role_name, "PolicyDocument": json.dumps(trust_policy)}
+
+
 def create_iam_role(
     iam_client: Any,
     role_name: str,
@@ -499,6 +1169,8 @@ def create_iam_role(
     tags: list[dict[str, str]] | None = None,
 ) -> str:
     """Create IAM role with initial trust policy and return the role ARN."""
+    from botocore.exceptions import ClientError
+
     click.echo(f"Creating IAM role: {role_name}")
 
     try:
@@ -513,15 +1185,9 @@ def create_iam_role(
                 raise
 
         # Create role with initial trust policy
-        trust_policy = get_initial_trust_policy(account_id, external_id)
-        create_params: dict[str, Any] = {
-            "RoleName": role_name,
-            "AssumeRolePolicyDocument": json.dumps(trust_policy),
-            "Description": "IAM role for Snowflake external volume access",
-        }
-        if tags:
-            create_params["Tags"] = tags
-        response = iam_client.create_role(**create_params)
+        response = iam_client.create_role(
+            **get_create_role_params(role_name, account_id, external_id, tags)
+        )
         role_arn = response["Role"]["Arn"]
         click.echo(f"✓ Created role: {role_arn}")
 
@@ -536,15 +1202,29 @@ def create_iam_role(
 
 
 def update_role_trust_policy(
-    iam_client: Any, role_name: str, snowflake_user_arn: str, external_id: str
+    iam_client: Any,
+    role_name: str,
+    snowflake_user_arn: str,
+    external_id: str,
+    max_wait: float = 0.0,
 ) -> None:
-    """Update IAM role trust policy with Snowflake IAM user ARN."""
+    """Update IAM role trust policy with Snowflake IAM user ARN.
+
+    With ``max_wait``, a role that is not visible yet (just created) is
+    retried for up to that many seconds instead of failing.
+    """
+    from botocore.exceptions import ClientError
+
     click.echo(f"Updating trust policy for role: {role_name}")
 
     try:
-        trust_policy = get_snowflake_trust_policy(snowflake_user_arn, external_id)
-        iam_client.update_assume_role_policy(
-            RoleName=role_name, PolicyDocument=json.dumps(trust_policy)
+        params = get_update_trust_policy_params(role_name, snowflake_user_arn, external_id)
+        retry_on_propagation(
+            lambda: iam_client.update_assume_role_policy(**params),
+            is_no_such_entity,
+            "IAM role",
+            max_wait=max_wait,
+            kind="iam_role" if max_wait else None,
         )
         click.echo(f"✓ Updated trust policy with Snowflake IAM user: {snowflake_user_arn}")
 
@@ -554,6 +1234,8 @@ def update_role_trust_policy(
 
 def delete_iam_role(iam_client: Any, role_name: str, policy_arn: str) -> None:
     """Delete an IAM role (detaching policies first)."""
+    from botocore.exceptions import ClientError
+
     click.echo(f"Deleting IAM role: {role_name}")
 
     try:
@@ -614,13 +1296,20 @@ def describe_external_volume(volume_name: str) -> dict[str, str]:
     click.echo(f"Describing external volume: {volume_name}")
 
     try:
-        result = run_snow_sql(f"DESC EXTERNAL VOLUME {volume_name}")
+        result = get_inventory().query(
+            "EXTERNAL VOLUME", f"DESC EXTERNAL VOLUME {volume_name}", check=True
+        )
     except click.ClickException as e:
         raise click.ClickException(
             f"Failed to describe external volume '{volume_name}'. "
             f"Verify the volume exists and you have access.\nError: {e}"
         )
 
+    return parse_external_volume_description(volume_name, result)
+
+
+def parse_external_volume_description(volume_name: str, result: list | None) -> dict[str, str]:
+    """Extract the AWS IAM user ARN and external ID from DESC EXTERNAL VOLUME rows."""
     if not result:
         raise click.ClickException(
             f"No data returned when describing external volume '{volume_name}'"
@@ -665,26 +1354,52 @@ def drop_external_volume(volume_name: str) -> None:
     click.echo(f"✓ Dropped external volume: {volume_name}")
 
 
-def verify_external_volume(volume_name: str) -> None:
-    """Verify external volume connectivity."""
-    click.echo(f"Verifying external volume: {volume_name}")
-
+def get_external_volume_verification(volume_name: str) -> str | None:
+    """Run SYSTEM$VERIFY_EXTERNAL_VOLUME and return its JSON result, if any."""
     result = run_snow_sql(f"SELECT SYSTEM$VERIFY_EXTERNAL_VOLUME('{volume_name}')")
 
-    if not result:
-        click.echo("⚠ Could not verify external volume")
-        return
-
     # The result column name may vary based on volume name case
-    status_json = None
-    for key, value in result[0].items():
+    for key, value in (result[0] if result else {}).items():
         if "SYSTEM$VERIFY_EXTERNAL_VOLUME" in key.upper():
-            status_json = value
-            break
+            return value
+    return None
+
+
+def _is_assume_role_failure(status_json: str | None) -> bool:
+    """Whether verification failed because Snowflake cannot assume the role (yet)."""
+    try:
+        verification = json.loads(status_json or "")
+    except json.JSONDecodeError:
+        return False
+    return not verification.get("success", False) and "assum" in status_json.lower()
+
+
+def verify_external_volume(volume_name: str, max_wait: float = 0.0) -> bool:
+    """Verify external volume connectivity.
+
+    With ``max_wait``, an "error assuming AWS_ROLE" result (trust policy
+    still propagating) is retried for up to that many seconds.
+
+    Returns:
+        True if Snowflake reported success
+    """
+    click.echo(f"Verifying external volume: {volume_name}")
+
+    status_json: str | None = None
+
+    def check() -> bool:
+        nonlocal status_json
+        status_json = get_external_volume_verification(volume_name)
+        return not _is_assume_role_failure(status_json)
+
+    if max_wait:
+        wait_with_backoff(check, "trust policy", max_wait=max_wait, kind="trust_policy")
+    else:
+        check()
 
     if not status_json:
-        click.echo("⚠ Could not find verification result")
-        return
+        click.echo("⚠ Could not verify external volume")
+        return False
 
     # Parse the JSON response
     try:
@@ -699,13 +1414,188 @@ def verify_external_volume(volume_name: str) -> None:
 
         click.echo(f"  success: {success}")
         click.echo(f"  storageLocationSelectionResult: {storage_result}")
+        return bool(success)
 
     except json.JSONDecodeError:
         # Fallback to raw output if not valid JSON
         if "success" in status_json.lower():
             click.echo("✓ External volume verified successfully")
-        else:
-            click.echo(f"⚠ Verification result: {status_json}")
+            return True
+        click.echo(f"⚠ Verification result: {status_json}")
+        return False
+
+
+def provision_external_volume(
+    config: ExternalVolumeConfig,
+    tags: list[dict[str, str]] | None = None,
+    force: bool = False,
+    skip_verify: bool = False,
+    wait_mode: str = "poll",
+    max_wait: float = PROPAGATION_MAX_WAIT,
+) -> str:
+    """
+    Create the AWS resources and the external volume for one config (steps 1-7).
+
+    AWS resources created by this call are rolled back if a later step
+    fails; resources that already existed are left alone.
+
+    Args:
+        config: Resource names and settings (see build_external_volume_config)
+        tags: AWS resource tags
+        force: Replace an existing external volume
+        skip_verify: Skip SYSTEM$VERIFY_EXTERNAL_VOLUME
+        wait_mode: IAM propagation handling (see WAIT_MODES)
+        max_wait: Seconds to wait for IAM changes to propagate
+
+    Returns:
+        The IAM role ARN
+
+    Raises:
+        click.ClickException: If any step fails (after rolling back)
+    """
+    s3_client = get_aws_client("s3", region_name=config.aws_region)
+    iam_client = get_aws_client("iam")
+    account_id = get_aws_account_id()
+    policy_arn = f"arn:aws:iam::{account_id}:policy/{config.policy_name}"
+
+    # Track what we've created for potential rollback
+    created_bucket = False
+    created_policy = False
+    created_role = False
+
+    def rollback_aws_resources() -> None:
+        """Clean up AWS resources on failure."""
+        click.echo()
+        click.echo("─" * 40)
+        click.echo("Rolling back AWS resources...")
+        click.echo("─" * 40)
+        if created_role:
+            try:
+                delete_iam_role(iam_client, config.role_name, policy_arn)
+            except Exception as e:
+                click.echo(f"⚠ Failed to delete role: {e}")
+        if created_policy:
+            try:
+                delete_iam_policy(iam_client, policy_arn)
+            except Exception as e:
+                click.echo(f"⚠ Failed to delete policy: {e}")
+        if created_bucket:
+            try:
+                delete_s3_bucket(s3_client, config.bucket_name, force=False)
+            except Exception as e:
+                click.echo(f"⚠ Failed to delete bucket: {e}")
+
+    try:
+        # Steps 1-3: the S3 bucket and the IAM policy are independent and are
+        # created concurrently; the role needs the policy attached.
+        click.echo("─" * 40)
+        click.echo("Steps 1-3: Create S3 Bucket, IAM Policy and IAM Role")
+        click.echo("─" * 40)
+
+        def create_bucket_step() -> None:
+            nonlocal created_bucket
+            created_bucket = create_s3_bucket(
+                s3_client, config.bucket_name, config.aws_region, tags=tags
+            )
+
+        def create_policy_step() -> None:
+            nonlocal created_policy, policy_arn
+            policy_arn = create_iam_policy(
+                iam_client,
+                config.policy_name,
+                config.bucket_name,
+                tags=tags,
+            )
+            created_policy = True
+
+        def create_role_step() -> str:
+            nonlocal created_role
+            arn = create_iam_role(
+                iam_client,
+                config.role_name,
+                policy_arn,
+                account_id,
+                config.external_id,
+                tags=tags,
+            )
+            created_role = True
+            return arn
+
+        graph = StepGraph()
+        graph.add("bucket", create_bucket_step)
+        graph.add("policy", create_policy_step)
+        graph.add("role", create_role_step, deps=["policy"])
+        role_arn = graph.run()["role"]
+        click.echo()
+
+        # Wait for IAM role propagation (optimistic mode skips the wait and
+        # retries the trust policy update in Step 6 instead)
+        if wait_mode != "optimistic":
+            wait_for_iam_role(iam_client, config.role_name, max_wait=max_wait, mode=wait_mode)
+
+        # Step 4: Create Snowflake external volume
+        click.echo("─" * 40)
+        click.echo("Step 4: Create Snowflake External Volume")
+        click.echo("─" * 40)
+        with span("Step 4: Create Snowflake External Volume"):
+            create_external_volume(config, role_arn, force)
+        click.echo()
+
+        # Step 5: Get Snowflake IAM user ARN
+        click.echo("─" * 40)
+        click.echo("Step 5: Retrieve Snowflake IAM User")
+        click.echo("─" * 40)
+        with span("Step 5: Retrieve Snowflake IAM User"):
+            sf_props = describe_external_volume(config.volume_name)
+        click.echo()
+
+        # Step 6: Update trust policy
+        click.echo("─" * 40)
+        click.echo("Step 6: Update IAM Trust Policy")
+        click.echo("─" * 40)
+        # Use the external ID from Snowflake if different from what we specified
+        actual_external_id = sf_props.get("external_id", config.external_id)
+        with span("Step 6: Update IAM Trust Policy"):
+            update_role_trust_policy(
+                iam_client,
+                config.role_name,
+                sf_props["iam_user_arn"],
+                actual_external_id,
+                max_wait=max_wait if wait_mode == "optimistic" else 0.0,
+            )
+        click.echo()
+
+        # Wait for trust policy propagation (optimistic mode retries the
+        # verification in Step 7 instead)
+        if wait_mode != "optimistic":
+            wait_for_trust_policy(
+                iam_client,
+                config.role_name,
+                sf_props["iam_user_arn"],
+                max_wait=max_wait,
+                mode=wait_mode,
+            )
+
+        # Step 7: Verify
+        if not skip_verify:
+            click.echo("─" * 40)
+            click.echo("Step 7: Verify External Volume")
+            click.echo("─" * 40)
+            with span("Step 7: Verify External Volume"):
+                verify_external_volume(
+                    config.volume_name,
+                    max_wait=max_wait if wait_mode == "optimistic" else 0.0,
+                )
+            click.echo()
+
+    except click.ClickException:
+        rollback_aws_resources()
+        raise
+    except Exception as e:
+        rollback_aws_resources()
+        raise click.ClickException(f"Unexpected error: {e}")
+
+    return role_arn
 
 
 # =============================================================================
@@ -754,6 +1644,42 @@ load_dotenv()
     default=None,
     help="Comment for external volume (inferred from prefix/bucket if not provided)",
 )
+@click.option(
+    "--backend",
+    type=click.Choice(["cli", "session"]),
+    envvar="SNOW_UTILS_BACKEND",
+    default="cli",
+    help="SQL backend: 'cli' (snow sql per statement) or 'session' (one reused connection)",
+)
+@click.option(
+    "--wait-mode",
+    type=click.Choice(WAIT_MODES),
+    envvar="SNOW_UTILS_WAIT_MODE",
+    default="poll",
+    show_default=True,
+    help="How to wait for IAM changes to propagate: poll (jittered, fast start), "
+    "waiter (boto3 waiters) or optimistic (continue, retry on propagation errors)",
+)
+@click.option(
+    "--propagation-timeout",
+    type=click.FloatRange(min=0),
+    envvar="SNOW_UTILS_PROPAGATION_TIMEOUT",
+    default=PROPAGATION_MAX_WAIT,
+    show_default=True,
+    help="Seconds to wait for an IAM change to propagate",
+)
+@click.option(
+    "--trace",
+    is_flag=True,
+    help="Print a per-step timing summary when the command finishes",
+)
+@click.option(
+    "--trace-file",
+    envvar="SNOW_UTILS_TRACE_FILE",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write spans as Chrome trace JSON (OTLP/JSON for *.otlp.json); implies --trace",
+)
 @click.pass_context
 def cli(
     ctx: click.Context,
@@ -763,6 +1689,11 @@ def cli(
     verbose: bool,
     debug: bool,
     comment: str | None,
+    backend: str,
+    wait_mode: str,
+    propagation_timeout: float,
+    trace: bool,
+    trace_file: Path | None,
 ) -> None:
     """
     Snowflake External Volume Manager
@@ -778,6 +1709,7 @@ def cli(
     Debug options:
         --verbose  Show info level output from snow CLI
         --debug    Show debug output including SQL statements
+        --backend  'session' reuses one Snowflake connection for all statements
 
     \b
     Prerequisites:
@@ -786,7 +1718,8 @@ def cli(
     - Appropriate permissions in both AWS and Snowflake
     """
     # Set global snow CLI options
-    set_snow_cli_options(verbose=verbose, debug=debug)
+    set_snow_cli_options(verbose=verbose, debug=debug, backend=backend)
+    setup_tracing(ctx, trace, trace_file)
 
     ctx.ensure_object(dict)
     ctx.obj["region"] = region
@@ -800,6 +1733,8 @@ def cli(
         ctx.obj["prefix"] = get_current_username()
 
     ctx.obj["comment"] = comment
+    ctx.obj["wait_mode"] = wait_mode
+    ctx.obj["propagation_timeout"] = propagation_timeout
 
     if ctx.obj["prefix"]:
         click.echo(f"Using prefix: {ctx.obj['prefix']}")
@@ -920,28 +1855,17 @@ def create(
     region = ctx.obj["region"]
     prefix = ctx.obj.get("prefix")
 
-    # Generate AWS names (lowercase, hyphens)
-    aws_bucket_name = to_aws_name(bucket, prefix)
-    aws_role_name = role_name or to_aws_name(f"{bucket}-snowflake-role", prefix)
-    aws_policy_name = policy_name or to_aws_name(f"{bucket}-snowflake-policy", prefix)
-    aws_storage_location = storage_location_name or to_aws_name(f"{bucket}-s3-{region}", prefix)
-
-    # Generate Snowflake names (uppercase, underscores, SQL-safe)
-    sf_volume_name = volume_name or to_sql_identifier(f"{bucket}_external_volume", prefix)
-    # Generate a unique external ID for security (prevents confused deputy problem)
-    sf_external_id = external_id or generate_external_id(bucket, prefix)
-    sf_comment = ctx.obj.get("comment") or format_comment(prefix, bucket)
-
-    config = ExternalVolumeConfig(
-        bucket_name=aws_bucket_name,
-        role_name=aws_role_name,
-        policy_name=aws_policy_name,
-        volume_name=sf_volume_name,
-        storage_location_name=aws_storage_location,
-        external_id=sf_external_id,
-        aws_region=region,
+    config = build_external_volume_config(
+        bucket,
+        region,
+        prefix,
+        role_name=role_name,
+        policy_name=policy_name,
+        volume_name=volume_name,
+        storage_location_name=storage_location_name,
+        external_id=external_id,
         allow_writes=not no_writes,
-        comment=sf_comment,
+        comment=ctx.obj.get("comment"),
     )
 
     # Generate resource tags for AWS resources (used in create and JSON output)
@@ -951,29 +1875,7 @@ def create(
     def build_result(
         status: str, account_id: str | None = None, role_arn: str | None = None
     ) -> dict:
-        result = {
-            "status": status,
-            "prefix": prefix,
-            "aws": {
-                "bucket": config.bucket_name,
-                "role": config.role_name,
-                "policy": config.policy_name,
-                "storage_location": config.storage_location_name,
-                "region": config.aws_region,
-                "tags": {tag["Key"]: tag["Value"] for tag in aws_tags},
-            },
-            "snowflake": {
-                "external_volume": config.volume_name,
-                "external_id": config.external_id,
-                "allow_writes": config.allow_writes,
-                "comment": config.comment,
-            },
-        }
-        if account_id:
-            result["aws"]["account_id"] = account_id
-        if role_arn:
-            result["aws"]["role_arn"] = role_arn
-        return result
+        return get_create_result(config, prefix, aws_tags, status, account_id, role_arn)
 
     # JSON output for dry-run
     if output == "json" and dry_run:
@@ -1013,8 +1915,7 @@ def create(
         set_masking(False)
         # For dry-run, try to get account_id but use placeholder if AWS creds unavailable
         try:
-            sts_client = boto3.client("sts")
-            account_id = get_aws_account_id(sts_client)
+            account_id = get_aws_account_id()
         except Exception:
             account_id = "<AWS_ACCOUNT_ID>"
             click.echo("⚠ AWS credentials not available - using placeholders")
@@ -1077,116 +1978,20 @@ def create(
         click.echo("To create these resources, run without --dry-run")
         return
 
-    # Initialize AWS clients
-    s3_client = boto3.client("s3", region_name=region)
-    iam_client = boto3.client("iam")
-    sts_client = boto3.client("sts")
-
-    account_id = get_aws_account_id(sts_client)
-    policy_arn = f"arn:aws:iam::{account_id}:policy/{config.policy_name}"
+    account_id = get_aws_account_id()
 
     if output == "text":
         click.echo(f"AWS Account ID: {mask_sensitive_string(account_id, 'aws_account_id')}")
         click.echo()
 
-    # Track what we've created for potential rollback
-    created_bucket = False
-    created_policy = False
-    created_role = False
-
-    def rollback_aws_resources() -> None:
-        """Clean up AWS resources on failure."""
-        click.echo()
-        click.echo("─" * 40)
-        click.echo("Rolling back AWS resources...")
-        click.echo("─" * 40)
-        if created_role:
-            try:
-                delete_iam_role(iam_client, config.role_name, policy_arn)
-            except Exception as e:
-                click.echo(f"⚠ Failed to delete role: {e}")
-        if created_policy:
-            try:
-                delete_iam_policy(iam_client, policy_arn)
-            except Exception as e:
-                click.echo(f"⚠ Failed to delete policy: {e}")
-        if created_bucket:
-            try:
-                delete_s3_bucket(s3_client, config.bucket_name, force=False)
-            except Exception as e:
-                click.echo(f"⚠ Failed to delete bucket: {e}")
-
-    try:
-        # Step 1: Create S3 bucket
-        click.echo("─" * 40)
-        click.echo("Step 1: Create S3 Bucket")
-        click.echo("─" * 40)
-        created_bucket = create_s3_bucket(s3_client, config.bucket_name, region, tags=aws_tags)
-        click.echo()
-
-        # Step 2: Create IAM policy
-        click.echo("─" * 40)
-        click.echo("Step 2: Create IAM Policy")
-        click.echo("─" * 40)
-        policy_arn = create_iam_policy(iam_client, config.policy_name, config.bucket_name, tags=aws_tags)
-        created_policy = True
-        click.echo()
-
-        # Step 3: Create IAM role with initial trust policy
-        click.echo("─" * 40)
-        click.echo("Step 3: Create IAM Role")
-        click.echo("─" * 40)
-        role_arn = create_iam_role(
-            iam_client, config.role_name, policy_arn, account_id, config.external_id, tags=aws_tags
-        )
-        created_role = True
-        click.echo()
-
-        # Wait for IAM role propagation with backoff
-        wait_for_iam_role(iam_client, config.role_name)
-
-        # Step 4: Create Snowflake external volume
-        click.echo("─" * 40)
-        click.echo("Step 4: Create Snowflake External Volume")
-        click.echo("─" * 40)
-        create_external_volume(config, role_arn, force)
-        click.echo()
-
-        # Step 5: Get Snowflake IAM user ARN
-        click.echo("─" * 40)
-        click.echo("Step 5: Retrieve Snowflake IAM User")
-        click.echo("─" * 40)
-        sf_props = describe_external_volume(config.volume_name)
-        click.echo()
-
-        # Step 6: Update trust policy
-        click.echo("─" * 40)
-        click.echo("Step 6: Update IAM Trust Policy")
-        click.echo("─" * 40)
-        # Use the external ID from Snowflake if different from what we specified
-        actual_external_id = sf_props.get("external_id", config.external_id)
-        update_role_trust_policy(
-            iam_client, config.role_name, sf_props["iam_user_arn"], actual_external_id
-        )
-        click.echo()
-
-        # Wait for trust policy propagation with backoff
-        wait_for_trust_policy(iam_client, config.role_name, sf_props["iam_user_arn"])
-
-        # Step 7: Verify
-        if not skip_verify:
-            click.echo("─" * 40)
-            click.echo("Step 7: Verify External Volume")
-            click.echo("─" * 40)
-            verify_external_volume(config.volume_name)
-            click.echo()
-
-    except click.ClickException:
-        rollback_aws_resources()
-        raise
-    except Exception as e:
-        rollback_aws_resources()
-        raise click.ClickException(f"Unexpected error: {e}")
+    role_arn = provision_external_volume(
+        config,
+        tags=aws_tags,
+        force=force,
+        skip_verify=skip_verify,
+        wait_mode=ctx.obj["wait_mode"],
+        max_wait=ctx.obj["propagation_timeout"],
+    )
 
     # JSON output for successful creation
     if output == "json":
@@ -1225,6 +2030,268 @@ def create(
     click.echo("See: https://docs.snowflake.com/user-guide/tables-iceberg-create")
 
 
+# Per-volume output buffer for create-many workers (None: write through).
+_volume_log: contextvars.ContextVar[io.StringIO | None] = contextvars.ContextVar(
+    "extvolume_volume_log", default=None
+)
+
+
+class _VolumeLogStdout(io.TextIOBase):
+    """sys.stdout stand-in that sends writes to the current volume's buffer.
+
+    A context variable rather than a thread-local, so StepGraph worker
+    threads started for a volume write to that volume's buffer too.
+    """
+
+    encoding = "utf-8"
+
+    def __init__(self, target: Any) -> None:
+        self._target = target
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if not isinstance(text, str):
+            # click probes streams with b"" to tell binary from text ones.
+            raise TypeError(f"write() argument must be str, not {type(text).__name__}")
+        buffer = _volume_log.get()
+        return (buffer if buffer is not None else self._target).write(text)
+
+    def flush(self) -> None:
+        self._target.flush()
+
+
+def _manifest_flag(value: Any, default: bool) -> bool:
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() not in ("false", "no", "0", "off")
+
+
+@cli.command(name="create-many")
+@click.option(
+    "--manifest",
+    "-m",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="YAML/JSON/CSV manifest of volumes (columns: bucket, region, volume_name, "
+    "role_name, policy_name, storage_location_name, external_id, allow_writes, comment)",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Volumes provisioned concurrently",
+)
+@click.option("--no-writes", is_flag=True, help="Default entries to read-only volumes")
+@click.option("--skip-verify", is_flag=True, help="Skip external volume verification")
+@click.option("--dry-run", is_flag=True, help="Preview the volumes without making changes")
+@click.option(
+    "--force",
+    "-f",
+    is_flag=True,
+    help="Overwrite existing external volumes (CREATE OR REPLACE)",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Choice(["text", "json"]),
+    default="text",
+    help="Output format (default: text)",
+)
+@click.option(
+    "--yes",
+    "-y",
+    is_flag=True,
+    help="Skip interactive confirmation (use after reviewing dry-run output)",
+)
+@click.pass_context
+def create_many(
+    ctx: click.Context,
+    manifest: Path,
+    workers: int,
+    no_writes: bool,
+    skip_verify: bool,
+    dry_run: bool,
+    force: bool,
+    output: str,
+    yes: bool,
+) -> None:
+    """
+    Create many external volumes (and their AWS resources) from a manifest.
+
+    Volumes are provisioned --workers at a time, each with the same steps
+    as 'create'. A failing volume rolls back only its own AWS resources;
+    the others carry on. Entries without a region use --region.
+
+    \b
+    Manifest (YAML):
+        volumes:
+          - bucket: sales-data
+            region: us-west-2
+          - bucket: events
+            region: eu-west-1
+            allow_writes: false
+
+    \b
+    Manifest (CSV):
+        bucket,region,volume_name
+        sales-data,us-west-2,
+        events,eu-west-1,EVENTS_VOLUME
+
+    \b
+    Examples:
+        extvolume create-many --manifest volumes.yaml --dry-run
+        extvolume create-many --manifest volumes.csv --workers 8 --yes -o json
+    """
+    rows = load_manifest(manifest, key="volumes")
+    if not rows:
+        raise click.ClickException(f"Manifest {manifest} has no entries")
+
+    prefix = ctx.obj.get("prefix")
+    volumes: list[tuple[ExternalVolumeConfig, list[dict[str, str]]]] = []
+    for number, row in enumerate(rows, 1):
+        bucket = row.get("bucket")
+        if not bucket:
+            raise click.ClickException(f"Manifest entry {number} needs a bucket")
+        if "." in bucket:
+            raise click.ClickException(
+                f"Manifest entry {number}: bucket names cannot contain dots "
+                "(S3 SSL limitation)"
+            )
+        config = build_external_volume_config(
+            bucket,
+            row.get("region") or ctx.obj["region"],
+            prefix,
+            role_name=row.get("role_name"),
+            policy_name=row.get("policy_name"),
+            volume_name=row.get("volume_name"),
+            storage_location_name=row.get("storage_location_name"),
+            external_id=row.get("external_id"),
+            allow_writes=_manifest_flag(row.get("allow_writes"), not no_writes),
+            comment=row.get("comment") or ctx.obj.get("comment"),
+        )
+        volumes.append((config, get_resource_tags(prefix, bucket, config.volume_name)))
+
+    for label, attr in (("buckets", "bucket_name"), ("IAM roles", "role_name")):
+        counts = Counter(getattr(config, attr) for config, _ in volumes)
+        duplicates = sorted(name for name, count in counts.items() if count > 1)
+        if duplicates:
+            raise click.ClickException(f"Duplicate {label} in manifest: {', '.join(duplicates)}")
+    counts = Counter(config.volume_name.upper() for config, _ in volumes)
+    duplicates = sorted(name for name, count in counts.items() if count > 1)
+    if duplicates:
+        raise click.ClickException(f"Duplicate volumes in manifest: {', '.join(duplicates)}")
+
+    if output == "json" and not dry_run and not yes:
+        raise click.UsageError("--output json creates without confirmation; pass --yes")
+
+    if dry_run:
+        set_masking(False)
+        if output == "json":
+            click.echo(
+                json.dumps(
+                    [get_create_result(c, prefix, tags, "dry_run") for c, tags in volumes],
+                    indent=2,
+                )
+            )
+            return
+        click.echo(f"Volumes that would be created from {manifest}:")
+        width = max(len(config.volume_name) for config, _ in volumes)
+        for config, _ in volumes:
+            access = "read-write" if config.allow_writes else "read-only"
+            click.echo(
+                f"  {config.volume_name:<{width}}  {config.aws_region:<14} "
+                f"s3://{config.bucket_name}  role {config.role_name}  ({access})"
+            )
+        return
+
+    account_id = get_aws_account_id()
+
+    if output == "text":
+        click.echo("=" * 60)
+        click.echo("Snowflake External Volume Manager - Create Many")
+        click.echo("=" * 60)
+        click.echo(f"Manifest:       {manifest}")
+        click.echo(f"Volumes:        {len(volumes)}")
+        click.echo(f"Regions:        {', '.join(sorted({c.aws_region for c, _ in volumes}))}")
+        click.echo(f"Workers:        {min(workers, len(volumes))}")
+        click.echo(f"AWS Account ID: {mask_sensitive_string(account_id, 'aws_account_id')}")
+        click.echo()
+        if not yes and not click.confirm("Proceed with resource creation?", default=True):
+            click.echo("Aborted.")
+            return
+
+    def provision(config: ExternalVolumeConfig, tags: list[dict[str, str]]) -> tuple[dict, str]:
+        log = io.StringIO()
+        _volume_log.set(log)
+        started = time.monotonic()
+        try:
+            with span(f"volume: {config.volume_name}"):
+                role_arn = provision_external_volume(
+                    config,
+                    tags=tags,
+                    force=force,
+                    skip_verify=skip_verify,
+                    wait_mode=ctx.obj["wait_mode"],
+                    max_wait=ctx.obj["propagation_timeout"],
+                )
+            entry = get_create_result(config, prefix, tags, "success", account_id, role_arn)
+        except Exception as e:
+            entry = get_create_result(config, prefix, tags, "failed", account_id)
+            entry["error"] = e.message if isinstance(e, click.ClickException) else str(e)
+        entry["elapsed_s"] = round(time.monotonic() - started, 2)
+        return entry, log.getvalue()
+
+    results: dict[str, dict] = {}
+    with (
+        contextlib.redirect_stdout(_VolumeLogStdout(sys.stdout)),
+        ThreadPoolExecutor(max_workers=min(workers, len(volumes))) as pool,
+    ):
+        futures = [
+            pool.submit(contextvars.copy_context().run, provision, config, tags)
+            for config, tags in volumes
+        ]
+        # Each volume's log is printed as one block when it finishes.
+        for future in as_completed(futures):
+            entry, log = future.result()
+            volume = entry["snowflake"]["external_volume"]
+            results[volume] = entry
+            failed = entry["status"] != "success"
+            if output == "text":
+                click.echo("━" * 60)
+                click.echo(f"{volume} ({entry['aws']['region']})")
+                click.echo("━" * 60)
+                click.echo(log, nl=False)
+                click.echo()
+            elif failed:
+                click.echo(log, nl=False, err=True)
+
+    report = [results[config.volume_name] for config, _ in volumes]
+    failed = [e for e in report if e["status"] != "success"]
+
+    if output == "json":
+        click.echo(json.dumps(report, indent=2))
+    else:
+        click.echo("=" * 60)
+        width = max(len(e["snowflake"]["external_volume"]) for e in report)
+        for e in report:
+            mark = "✓" if e["status"] == "success" else "✗"
+            click.echo(
+                f"{mark} {e['snowflake']['external_volume']:<{width}}  "
+                f"{e['aws']['region']:<14} {e['status']:<8} {e['elapsed_s']:>6.1f}s  "
+                f"{e.get('error', '')}"
+            )
+        click.echo("=" * 60)
+        click.echo(f"{len(report) - len(failed)} succeeded, {len(failed)} failed")
+
+    if failed:
+        ctx.exit(1)
+
+
 @cli.command()
 @click.option(
     "--bucket",
@@ -1259,6 +2326,19 @@ def create(
     is_flag=True,
     help="Force delete bucket even if not empty",
 )
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help="Concurrent batch deletes when emptying the bucket (--force)",
+)
+@click.option(
+    "--checkpoint",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Checkpoint file to resume an interrupted bucket emptying (--force)",
+)
 @click.option(
     "--yes",
     "-y",
@@ -1281,6 +2361,8 @@ def delete(
     volume_name: str | None,
     delete_bucket: bool,
     force: bool,
+    workers: int,
+    checkpoint: Path | None,
     yes: bool,
     output: str,
 ) -> None:
@@ -1301,6 +2383,8 @@ def delete(
     Example:
         extvolume delete --bucket iceberg-data
         extvolume delete --bucket iceberg-data --delete-bucket --force
+        extvolume delete --bucket iceberg-data --delete-bucket --force \\
+            --workers 16 --checkpoint .empty-bucket.json
     """
     if not yes:
         click.confirm("Are you sure you want to delete these resources?", abort=True)
@@ -1326,12 +2410,11 @@ def delete(
         click.echo(f"External Volume: {sf_volume_name}")
         click.echo()
 
-    # Initialize AWS clients
-    s3_client = boto3.client("s3", region_name=region)
-    iam_client = boto3.client("iam")
-    sts_client = boto3.client("sts")
+    # Shared AWS clients
+    s3_client = get_aws_client("s3", region_name=region)
+    iam_client = get_aws_client("iam")
 
-    account_id = get_aws_account_id(sts_client)
+    account_id = get_aws_account_id()
     policy_arn = f"arn:aws:iam::{account_id}:policy/{aws_policy_name}"
 
     deleted_resources = []
@@ -1341,7 +2424,8 @@ def delete(
         click.echo("─" * 40)
         click.echo("Step 1: Drop External Volume")
         click.echo("─" * 40)
-    drop_external_volume(sf_volume_name)
+    with span("Step 1: Drop External Volume"):
+        drop_external_volume(sf_volume_name)
     deleted_resources.append({"type": "external_volume", "name": sf_volume_name})
     if output == "text":
         click.echo()
@@ -1351,7 +2435,8 @@ def delete(
         click.echo("─" * 40)
         click.echo("Step 2: Delete IAM Role")
         click.echo("─" * 40)
-    delete_iam_role(iam_client, aws_role_name, policy_arn)
+    with span("Step 2: Delete IAM Role"):
+        delete_iam_role(iam_client, aws_role_name, policy_arn)
     deleted_resources.append({"type": "iam_role", "name": aws_role_name})
     if output == "text":
         click.echo()
@@ -1361,7 +2446,8 @@ def delete(
         click.echo("─" * 40)
         click.echo("Step 3: Delete IAM Policy")
         click.echo("─" * 40)
-    delete_iam_policy(iam_client, policy_arn)
+    with span("Step 3: Delete IAM Policy"):
+        delete_iam_policy(iam_client, policy_arn)
     deleted_resources.append({"type": "iam_policy", "arn": policy_arn})
     if output == "text":
         click.echo()
@@ -1372,7 +2458,15 @@ def delete(
             click.echo("─" * 40)
             click.echo("Step 4: Delete S3 Bucket")
             click.echo("─" * 40)
-        delete_s3_bucket(s3_client, aws_bucket_name, force=force)
+        with span("Step 4: Delete S3 Bucket"):
+            delete_s3_bucket(
+                s3_client,
+                aws_bucket_name,
+                force=force,
+                workers=workers,
+                checkpoint=checkpoint,
+                progress=output == "text",
+            )
         deleted_resources.append({"type": "s3_bucket", "name": aws_bucket_name})
         if output == "text":
             click.echo()
@@ -1505,7 +2599,7 @@ def update_trust(
     click.echo(f"External Volume: {sf_volume_name}")
     click.echo()
 
-    iam_client = boto3.client("iam")
+    iam_client = get_aws_client("iam")
 
     # Get Snowflake IAM user from external volume
     props = describe_external_volume(sf_volume_name)
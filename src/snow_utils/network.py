@@ -22,21 +22,35 @@ Provides:
 - IPv4 preset support (GitHub Actions, Google, local IP)
 """
 
+import ipaddress
+import json
+import os
 import re
+from collections.abc import Iterator
+from pathlib import Path
 
 import click
 from dotenv import load_dotenv
 from snow_utils_common import (
     NetworkRuleMode,
     NetworkRuleType,
+    StepGraph,
+    aggregate_ipv4_cidrs,
     collect_ipv4_cidrs,
+    format_aggregation_summary,
+    get_inventory,
     get_valid_types_for_mode,
-    run_snow_sql,
     run_snow_sql_stdin,
+    set_preset_options,
     set_snow_cli_options,
+    setup_tracing,
     validate_mode_type,
 )
 
+# Values written to a single network rule before the list is sharded across
+# several rules (override with SNOW_UTILS_MAX_RULE_VALUES).
+MAX_VALUES_PER_RULE = 1000
+
 
 def normalize_identifier(name: str, style: str = "snowflake") -> str:
     """Normalize name for SQL or DNS compliance.
@@ -59,6 +73,30 @@ def normalize_identifier(name: str, style: str = "snowflake") -> str:
         return clean.lower()
 
 
+def aggregate_cidr_values(
+    values: list[str], max_cidrs: int | None = None, echo: bool = True
+) -> list[str]:
+    """Aggregate IPv4 CIDRs for a rule VALUE_LIST and report the savings.
+
+    Args:
+        values: IPv4 CIDRs to aggregate
+        max_cidrs: Optional lossy upper bound (see aggregate_ipv4_cidrs)
+        echo: Print the before/after summary
+
+    Returns:
+        Aggregated CIDR list
+    """
+    aggregated = aggregate_ipv4_cidrs(values)
+    lossy = bool(max_cidrs) and len(aggregated) > max_cidrs
+    if lossy:
+        aggregated = aggregate_ipv4_cidrs(aggregated, max_cidrs)
+    if echo:
+        click.echo(format_aggregation_summary(len(values), len(aggregated)))
+        if lossy:
+            click.echo("⚠ Lossy aggregation: the rule allows addresses outside the source ranges")
+    return aggregated
+
+
 def get_network_rule_sql(
     name: str,
     db: str,
@@ -147,10 +185,13 @@ def create_network_rule(
     dry_run: bool = False,
     force: bool = False,
     admin_role: str = "accountadmin",
-) -> str:
+) -> list[str]:
     """
     Create a network rule in Snowflake.
 
+    Value lists larger than get_max_values_per_rule() are sharded across
+    several rules (see create_network_rule_shards).
+
     Args:
         name: Network rule name
         db: Database name
@@ -163,40 +204,240 @@ def create_network_rule(
         admin_role: Role for creating resources (default: accountadmin)
 
     Returns:
-        Fully qualified network rule name (db.schema.name)
+        Fully qualified names (db.schema.name) of the rule, or of its shards
 
     Raises:
         click.ClickException: If mode/type combination is invalid
     """
+    check_mode_type(mode, rule_type)
+
+    if len(values) > get_max_values_per_rule():
+        return create_network_rule_shards(
+            name, db, schema, values, mode, rule_type, comment, dry_run, force, admin_role
+        )
+
+    rule_fqn = f"{db}.{schema}.{name}"
+    sql = get_network_rule_sql(name, db, schema, values, mode, rule_type, comment, force)
+
+    if dry_run:
+        click.echo(sql)
+    else:
+        refs = get_policy_rule_refs(get_expected_policy_name(name), admin_role=admin_role) or []
+        run_snow_sql_stdin(
+            "\n".join(get_replace_network_rule_statements(name, db, schema, sql, refs, admin_role))
+        )
+
+    return [rule_fqn]
+
+
+def check_mode_type(mode: NetworkRuleMode, rule_type: NetworkRuleType) -> None:
+    """Raise click.ClickException if ``rule_type`` is not valid for ``mode``."""
     if not validate_mode_type(mode, rule_type):
         valid = get_valid_types_for_mode(mode)
         raise click.ClickException(
             f"Invalid type '{rule_type.value}' for mode '{mode.value}'. Valid types: {valid}"
         )
 
+
+def get_expected_policy_name(rule_name: str) -> str:
+    """Name of the policy a rule is expected to be attached to (``*_NETWORK_POLICY``)."""
+    return rule_name.replace("_NETWORK_RULE", "_NETWORK_POLICY")
+
+
+def get_replace_network_rule_statements(
+    name: str,
+    db: str,
+    schema: str,
+    sql: str,
+    refs: list[str],
+    admin_role: str = "accountadmin",
+    shards: list[str] | None = None,
+) -> list[str]:
+    """
+    Build the script that creates or replaces an unsharded network rule.
+
+    CREATE OR REPLACE fails while a policy references the rule, so the rule
+    is detached from the expected policy and the policy's full rule list is
+    restored afterwards -- all in one script, so it is a single round trip
+    and the detached window is as short as possible.
+
+    Args:
+        name: Network rule name
+        db: Database name
+        schema: Schema name
+        sql: CREATE OR REPLACE NETWORK RULE statement (get_network_rule_sql)
+        refs: Current rule list of the expected policy (empty if it does not exist)
+        admin_role: Role for creating resources
+        shards: Existing shards of the rule (list_rule_shards); dropped even
+            when the policy does not reference them
+
+    Returns:
+        SQL statements, in order
+    """
     rule_fqn = f"{db}.{schema}.{name}"
-    sql = get_network_rule_sql(name, db, schema, values, mode, rule_type, comment, force)
+    expected_policy = get_expected_policy_name(name)
+    shard_re = re.compile(rf"^{re.escape(rule_fqn.upper())}(_\d{{3}})?$")
+    family = [ref for ref in refs if shard_re.match(ref.upper())]
+    unreferenced = [
+        f"{db}.{schema}.{shard}"
+        for shard in shards or []
+        if f"{db}.{schema}.{shard}".upper() not in (ref.upper() for ref in family)
+    ]
+    drops = [f"DROP NETWORK RULE IF EXISTS {fqn};" for fqn in unreferenced]
+
+    statements = [
+        f"USE ROLE {admin_role};",
+        f"CREATE DATABASE IF NOT EXISTS {db};",
+        f"CREATE SCHEMA IF NOT EXISTS {db}.{schema};",
+    ]
+    if not family:
+        return [*statements, sql, *drops]
+
+    click.echo(f"  Detaching and re-attaching rule on policy {expected_policy}...")
+    others = [ref for ref in refs if ref not in family]
+    restored = [*others]
+    restored.insert(refs.index(family[0]), rule_fqn)
+    # Unrelated rules stay attached while the rule is replaced.
+    statements.append(get_set_network_policy_rules_sql(expected_policy, others))
+    statements.append(sql)
+    statements.append(get_set_network_policy_rules_sql(expected_policy, restored))
+    # Shards left over from a larger value list are superseded.
+    statements.extend(
+        f"DROP NETWORK RULE IF EXISTS {ref};" for ref in family if ref.upper() != rule_fqn.upper()
+    )
+    return [*statements, *drops]
+
+
+def create_network_rule_shards(
+    name: str,
+    db: str,
+    schema: str,
+    values: list[str],
+    mode: NetworkRuleMode = NetworkRuleMode.INGRESS,
+    rule_type: NetworkRuleType = NetworkRuleType.IPV4,
+    comment: str = "",
+    dry_run: bool = False,
+    force: bool = False,
+    admin_role: str = "accountadmin",
+) -> list[str]:
+    """
+    Create or update a value list sharded across ``<NAME>_001``, ``<NAME>_002``, ...
+
+    Existing shards keep the values they already hold, so only shards whose
+    contents changed are rewritten (ALTER ... SET VALUE_LIST, which works
+    while the rule is attached to a policy). The expected policy
+    (``*_NETWORK_RULE`` -> ``*_NETWORK_POLICY``) is re-pointed at the full
+    shard list, then surplus shards and the unsharded rule are dropped.
+
+    Args:
+        name: Base network rule name
+        db: Database name
+        schema: Schema name
+        values: All values for the rule
+        mode: Rule mode
+        rule_type: Value type
+        comment: Optional comment
+        dry_run: If True, only print SQL without executing (assumes no shards exist)
+        force: Passed through to get_network_rule_sql for new shards
+        admin_role: Role for creating resources (default: accountadmin)
 
+    Returns:
+        Fully qualified shard names in order
+    """
+    existing: dict[str, list[str]] = {}
+    refs: list[str] = []
+    if not dry_run:
+        existing = get_rule_shard_values(name, db, schema, admin_role, include_base=True)
+        refs = get_policy_rule_refs(get_expected_policy_name(name), admin_role=admin_role) or []
+    shard_fqns, statements = get_network_rule_shards_statements(
+        name, db, schema, values, mode, rule_type, comment, force, existing, refs
+    )
+    if not statements:
+        return shard_fqns
+
+    sql = "\n".join(statements)
     if dry_run:
         click.echo(sql)
     else:
-        expected_policy = name.replace("_NETWORK_RULE", "_NETWORK_POLICY")
-        attached_policies = get_policies_for_rule(rule_fqn, expected_policy, admin_role=admin_role)
+        run_snow_sql_stdin(
+            f"USE ROLE {admin_role};\n"
+            f"CREATE DATABASE IF NOT EXISTS {db};\n"
+            f"CREATE SCHEMA IF NOT EXISTS {db}.{schema};\n"
+            f"{sql}"
+        )
 
-        if attached_policies:
-            click.echo(f"  Detaching rule from {len(attached_policies)} policy(ies)...")
-            for policy in attached_policies:
-                detach_rule_from_policy(policy, admin_role=admin_role)
+    return shard_fqns
 
-        setup_sql = f"USE ROLE {admin_role};\nCREATE DATABASE IF NOT EXISTS {db};\nCREATE SCHEMA IF NOT EXISTS {db}.{schema};\n"
-        run_snow_sql_stdin(setup_sql + sql)
 
-        if attached_policies:
-            click.echo(f"  Re-attaching rule to {len(attached_policies)} policy(ies)...")
-            for policy in attached_policies:
-                reattach_rule_to_policy(policy, rule_fqn, admin_role=admin_role)
+def get_network_rule_shards_statements(
+    name: str,
+    db: str,
+    schema: str,
+    values: list[str],
+    mode: NetworkRuleMode,
+    rule_type: NetworkRuleType,
+    comment: str,
+    force: bool,
+    existing: dict[str, list[str]],
+    refs: list[str],
+) -> tuple[list[str], list[str]]:
+    """
+    Plan the statements that bring a sharded rule to ``values``.
 
-    return rule_fqn
+    Args:
+        name: Base network rule name
+        db: Database name
+        schema: Schema name
+        values: All values for the rule
+        mode: Rule mode
+        rule_type: Value type
+        comment: Optional comment
+        force: Passed through to get_network_rule_sql for new shards
+        existing: Existing shards (and base rule) mapped to their values
+            (get_rule_shard_values with include_base=True)
+        refs: Current rule list of the expected policy (empty if it does not exist)
+
+    Returns:
+        Tuple of (fully qualified shard names in order, SQL statements)
+    """
+    existing = dict(existing)
+    base_exists = existing.pop(name.upper(), None) is not None
+    plan = plan_rule_shards(name, values, existing)
+    shard_fqns = [f"{db}.{schema}.{shard}" for shard in plan]
+
+    statements = []
+    created = updated = 0
+    for shard, shard_values in plan.items():
+        if shard not in existing:
+            statements.append(
+                get_network_rule_sql(
+                    shard, db, schema, shard_values, mode, rule_type, comment, force
+                )
+            )
+            created += 1
+        elif set(existing[shard]) != set(shard_values):
+            statements.append(get_update_network_rule_sql(shard, db, schema, shard_values))
+            updated += 1
+
+    stale = [shard for shard in existing if shard not in plan]
+    family = {f"{db}.{schema}.{n}".upper() for n in [name, *existing]}
+    if any(ref.upper() in family for ref in refs):
+        new_refs = [ref for ref in refs if ref.upper() not in family] + shard_fqns
+        if new_refs != refs:
+            statements.append(
+                get_set_network_policy_rules_sql(get_expected_policy_name(name), new_refs)
+            )
+    if base_exists:
+        # The unsharded rule is superseded by the shards.
+        statements.append(f"DROP NETWORK RULE IF EXISTS {db}.{schema}.{name};")
+    statements.extend(f"DROP NETWORK RULE IF EXISTS {db}.{schema}.{shard};" for shard in stale)
+
+    click.echo(
+        f"  Sharding {len(values)} values across {len(plan)} rule(s): "
+        f"{created} created, {updated} updated, {len(plan) - created - updated} unchanged, "
+        f"{len(stale)} dropped"
+    )
+    return shard_fqns, statements
 
 
 def create_network_policy(
@@ -248,6 +489,91 @@ def alter_network_policy(
         run_snow_sql_stdin(f"USE ROLE {admin_role};\n{sql}")
 
 
+def get_set_network_policy_rules_sql(policy_name: str, rule_refs: list[str]) -> str:
+    """
+    Generate SQL that replaces the full rule list of an existing network policy.
+
+    Args:
+        policy_name: Network policy name
+        rule_refs: Fully qualified rule names (empty list detaches all rules)
+
+    Returns:
+        ALTER NETWORK POLICY ... SET ALLOWED_NETWORK_RULE_LIST SQL statement
+    """
+    rule_list = ", ".join(rule_refs)
+    return (
+        f"ALTER NETWORK POLICY IF EXISTS {policy_name} "
+        f"SET ALLOWED_NETWORK_RULE_LIST = ({rule_list});"
+    )
+
+
+def get_max_values_per_rule() -> int:
+    """Maximum values written to one network rule (SNOW_UTILS_MAX_RULE_VALUES)."""
+    try:
+        return max(1, int(os.environ.get("SNOW_UTILS_MAX_RULE_VALUES", MAX_VALUES_PER_RULE)))
+    except ValueError:
+        return MAX_VALUES_PER_RULE
+
+
+def get_shard_names(name: str, count: int) -> list[str]:
+    """Deterministic shard names: ``<NAME>_001`` ... ``<NAME>_<count>``."""
+    return [f"{name}_{i:03d}" for i in range(1, count + 1)]
+
+
+def _value_sort_key(value: str) -> tuple:
+    """Sort CIDRs by address (so neighbours share a shard), other values as text."""
+    try:
+        network = ipaddress.ip_network(value, strict=False)
+    except ValueError:
+        return (1, 0, 0, value)
+    return (0, network.version, int(network.network_address), value)
+
+
+def plan_rule_shards(
+    name: str,
+    values: list[str],
+    existing: dict[str, list[str]] | None = None,
+    max_per_rule: int | None = None,
+) -> dict[str, list[str]]:
+    """
+    Assign values to shard rules, keeping existing assignments stable.
+
+    Values already held by a shard that is still needed stay there; new
+    values fill the remaining capacity in address order. A single added or
+    removed value therefore changes one shard instead of shifting every
+    shard after it.
+
+    Args:
+        name: Base network rule name
+        values: All values for the rule
+        existing: Current shard name -> values (from get_rule_shard_values)
+        max_per_rule: Capacity per shard (default: get_max_values_per_rule())
+
+    Returns:
+        Ordered mapping of shard name -> values
+    """
+    max_per_rule = max_per_rule or get_max_values_per_rule()
+    wanted = list(dict.fromkeys(values))
+    count = max(1, -(-len(wanted) // max_per_rule))
+    wanted_set = set(wanted)
+    existing = existing or {}
+
+    plan: dict[str, list[str]] = {}
+    assigned: set[str] = set()
+    for shard in get_shard_names(name, count):
+        kept = [v for v in existing.get(shard, []) if v in wanted_set and v not in assigned]
+        plan[shard] = kept[:max_per_rule]
+        assigned.update(plan[shard])
+
+    unassigned = sorted(wanted_set - assigned, key=_value_sort_key)
+    for shard_values in plan.values():
+        room = max_per_rule - len(shard_values)
+        shard_values.extend(unassigned[:room])
+        del unassigned[:room]
+        shard_values.sort(key=_value_sort_key)
+    return plan
+
+
 def get_update_network_rule_sql(
     name: str,
     db: str,
@@ -272,6 +598,52 @@ def get_update_network_rule_sql(
     return f"ALTER NETWORK RULE {db}.{schema}.{name} SET VALUE_LIST = ({value_list});"
 
 
+def get_incremental_update_network_rule_sql(
+    name: str,
+    db: str,
+    schema: str,
+    added: list[str],
+    removed: list[str],
+) -> str:
+    """
+    Generate SQL that adds/removes individual values of an existing network rule.
+
+    Values are added before any are removed so the rule is never empty.
+
+    Args:
+        name: Network rule name
+        db: Database name
+        schema: Schema name
+        added: Values to add
+        removed: Values to remove
+
+    Returns:
+        ALTER NETWORK RULE ... ADD/REMOVE VALUE_LIST statements (empty if no changes)
+    """
+    statements = []
+    if added:
+        value_list = ", ".join(f"'{v}'" for v in added)
+        statements.append(
+            f"ALTER NETWORK RULE {db}.{schema}.{name} ADD VALUE_LIST = ({value_list});"
+        )
+    if removed:
+        value_list = ", ".join(f"'{v}'" for v in removed)
+        statements.append(
+            f"ALTER NETWORK RULE {db}.{schema}.{name} REMOVE VALUE_LIST = ({value_list});"
+        )
+    return "\n".join(statements)
+
+
+def diff_rule_values(current: list[str], values: list[str]) -> tuple[list[str], list[str]]:
+    """Return (added, removed) values between a rule's current and desired lists."""
+    current_set = {v.strip() for v in current}
+    wanted = list(dict.fromkeys(v.strip() for v in values))
+    added = [v for v in wanted if v not in current_set]
+    wanted_set = set(wanted)
+    removed = sorted(v for v in current_set if v not in wanted_set)
+    return added, removed
+
+
 def update_network_rule(
     name: str,
     db: str,
@@ -279,10 +651,21 @@ def update_network_rule(
     values: list[str],
     dry_run: bool = False,
     admin_role: str = "accountadmin",
-) -> str:
+    incremental: bool = False,
+) -> list[str]:
     """
     Update an existing network rule with new values.
 
+    Value lists larger than get_max_values_per_rule() are written as shards
+    (see create_network_rule_shards), keeping the rule's mode and type; the
+    unsharded rule is then dropped. When a sharded rule shrinks to fit one
+    rule, the unsharded rule is created in its place, the expected policy is
+    re-pointed at it and the shards are dropped.
+
+    With ``incremental``, the current values are read with DESC NETWORK RULE
+    and only the difference is sent (ADD/REMOVE VALUE_LIST); nothing is
+    written when the value set is unchanged.
+
     Args:
         name: Network rule name
         db: Database name
@@ -290,18 +673,70 @@ def update_network_rule(
         values: New list of values
         dry_run: If True, only print SQL without executing
         admin_role: Role for modifying resources (default: accountadmin)
+        incremental: Send only added/removed values, skip unchanged rules
 
     Returns:
-        Fully qualified network rule name (db.schema.name)
+        Fully qualified names (db.schema.name) of the rule, or of its shards
     """
-    sql = get_update_network_rule_sql(name, db, schema, values)
+    # Dry runs assume the rule is unsharded, like create_network_rule_shards.
+    existing = []
+    if not dry_run:
+        existing = list_rule_shards(name, db, schema, admin_role=admin_role, include_base=True)
+    shards = [n for n in existing if n != name.upper()]
+    info = {}
+    if existing:
+        info = get_network_rule_info(existing[0], db, schema, admin_role=admin_role) or {}
+
+    if len(values) > get_max_values_per_rule():
+        return create_network_rule_shards(
+            name,
+            db,
+            schema,
+            values,
+            mode=NetworkRuleMode(info.get("mode", "INGRESS").upper()),
+            rule_type=NetworkRuleType(info.get("type", "IPV4").upper()),
+            comment=info.get("comment", ""),
+            dry_run=dry_run,
+            admin_role=admin_role,
+        )
+
+    if shards:
+        click.echo(f"  {len(values)} values fit one rule, replacing {len(shards)} shard(s)")
+        sql = get_network_rule_sql(
+            name,
+            db,
+            schema,
+            values,
+            mode=NetworkRuleMode(info.get("mode", "INGRESS").upper()),
+            rule_type=NetworkRuleType(info.get("type", "IPV4").upper()),
+            comment=info.get("comment", ""),
+        )
+        refs = get_policy_rule_refs(get_expected_policy_name(name), admin_role=admin_role) or []
+        statements = get_replace_network_rule_statements(
+            name, db, schema, sql, refs, admin_role, shards=shards
+        )
+        run_snow_sql_stdin("\n".join(statements))
+        return [f"{db}.{schema}.{name}"]
+
+    if incremental:
+        current = get_network_rule_values(name, db, schema, admin_role=admin_role)
+        if current is None:
+            raise click.ClickException(f"Network rule {db}.{schema}.{name} does not exist")
+        added, removed = diff_rule_values(current, values)
+        if not added and not removed:
+            click.echo(f"  No changes: {db}.{schema}.{name} already has these values")
+            return [f"{db}.{schema}.{name}"]
+        click.echo(f"  Changes: +{len(added)} added, -{len(removed)} removed")
+        sql = get_incremental_update_network_rule_sql(name, db, schema, added, removed)
+    else:
+        sql = get_update_network_rule_sql(name, db, schema, values)
 
     if dry_run:
         click.echo(sql)
     else:
         run_snow_sql_stdin(f"USE ROLE {admin_role};\n{sql}")
 
-    return f"{db}.{schema}.{name}"
+    return [f"{db}.{schema}.{name}"]
 
 
 def update_network_for_user(
@@ -311,7 +746,8 @@ def update_network_for_user(
     schema: str = "NETWORKS",
     dry_run: bool = False,
     admin_role: str = "accountadmin",
-) -> str:
+    incremental: bool = False,
+) -> list[str]:
     """
     Update the network rule CIDRs for an existing user.
 
@@ -325,9 +761,10 @@ def update_network_for_user(
         schema: Schema containing the rule (default: NETWORKS)
         dry_run: If True, only print SQL
         admin_role: Role for modifying resources (default: accountadmin)
+        incremental: Send only added/removed CIDRs, skip if unchanged
 
     Returns:
-        Fully qualified network rule name
+        Fully qualified network rule names (several when sharded)
     """
     rule_name = f"{user}_NETWORK_RULE".upper()
     return update_network_rule(
@@ -337,12 +774,15 @@ def update_network_for_user(
         values=cidrs,
         dry_run=dry_run,
         admin_role=admin_role,
+        incremental=incremental,
     )
 
 
 def delete_network_rule(name: str, db: str, schema: str, admin_role: str = "accountadmin") -> None:
-    """Delete a network rule (idempotent)."""
-    run_snow_sql_stdin(f"USE ROLE {admin_role};\nDROP NETWORK RULE IF EXISTS {db}.{schema}.{name}")
+    """Delete a network rule and any shards of it (idempotent)."""
+    names = [name, *list_rule_shards(name, db, schema, admin_role=admin_role)]
+    drops = "\n".join(f"DROP NETWORK RULE IF EXISTS {db}.{schema}.{n};" for n in names)
+    run_snow_sql_stdin(f"USE ROLE {admin_role};\n{drops}")
 
 
 def delete_network_policy(policy_name: str, admin_role: str = "accountadmin") -> None:
@@ -350,68 +790,130 @@ def delete_network_policy(policy_name: str, admin_role: str = "accountadmin") ->
     run_snow_sql_stdin(f"USE ROLE {admin_role};\nDROP NETWORK POLICY IF EXISTS {policy_name}")
 
 
-def list_network_rules(db: str, schema: str, admin_role: str = "accountadmin") -> list[dict]:
-    """List network rules in a schema."""
-    return run_snow_sql(f"SHOW NETWORK RULES IN SCHEMA {db}.{schema}", role=admin_role) or []
+def list_network_rules(db: str, schema: str, admin_role: str = "accountadmin") -> Iterator[dict]:
+    """List network rules in a schema (none if it does not exist), yielding rows as they arrive."""
+    return get_inventory().iter_show(
+        "NETWORK RULE", scope=f"{db}.{schema}", role=admin_role, missing_ok=True
+    )
 
 
-def list_network_policies(admin_role: str = "accountadmin") -> list[dict]:
-    """List all network policies."""
-    return run_snow_sql("SHOW NETWORK POLICIES", role=admin_role) or []
+def list_network_policies(admin_role: str = "accountadmin") -> Iterator[dict]:
+    """List all network policies, yielding rows as they arrive."""
+    return get_inventory().iter_show("NETWORK POLICY", role=admin_role)
 
 
 def network_policy_exists(policy_name: str, admin_role: str = "accountadmin") -> bool:
     """Check if a network policy exists by trying to describe it directly.
 
     Uses exact name lookup instead of listing all policies to avoid
-    privilege errors on policies we don't own.
+    privilege errors on policies we don't own. The DESC result is shared
+    with get_policy_rule_refs through the inventory.
     """
-    try:
-        result = run_snow_sql(f"DESC NETWORK POLICY {policy_name}", role=admin_role)
-        return result is not None and len(result) > 0
-    except Exception:
-        return False
+    return bool(get_inventory().describe("NETWORK POLICY", policy_name, role=admin_role))
 
 
-def get_policies_for_rule(
-    rule_fqn: str, expected_policy_name: str, admin_role: str = "accountadmin"
+def _parse_name_list(value: str) -> list[str]:
+    """Parse a list value from DESC output (JSON array or comma-separated text)."""
+    if not value:
+        return []
+    try:
+        items = json.loads(value)
+    except ValueError:
+        items = value.strip("[]()").split(",")
+    if not isinstance(items, list):
+        items = [items]
+    names = []
+    for item in items:
+        if isinstance(item, dict):
+            item = item.get("fullyQualifiedRuleName") or item.get("name") or ""
+        item = str(item).replace('"', "").strip().strip("'")
+        if item:
+            names.append(item)
+    return names
+
+
+def get_network_rule_info(
+    name: str, db: str, schema: str, admin_role: str = "accountadmin"
+) -> dict | None:
+    """Return the DESC NETWORK RULE row of a rule, or None if it does not exist."""
+    desc = get_inventory().describe("NETWORK RULE", f"{db}.{schema}.{name}", role=admin_role)
+    return desc[0] if desc else None
+
+
+def get_network_rule_values(
+    name: str, db: str, schema: str, admin_role: str = "accountadmin"
+) -> list[str] | None:
+    """Return the VALUE_LIST of a network rule, or None if it does not exist."""
+    return parse_network_rule_values(get_network_rule_info(name, db, schema, admin_role))
+
+
+def parse_network_rule_values(info: dict | None) -> list[str] | None:
+    """Return the VALUE_LIST of a DESC NETWORK RULE row (None passes through)."""
+    if info is None:
+        return None
+    return _parse_name_list(info.get("value_list", ""))
+
+
+def list_rule_shards(
+    name: str, db: str, schema: str, admin_role: str = "accountadmin", include_base: bool = False
 ) -> list[str]:
-    """Check if the expected policy contains this network rule.
+    """Return the names of existing shards of a rule (``<NAME>_NNN``), sorted.
 
-    Args:
-        rule_fqn: Fully qualified rule name (db.schema.rule)
-        expected_policy_name: The specific policy name to check
-        admin_role: Role for queries
-
-    Returns:
-        List containing expected_policy_name if it references the rule, empty otherwise.
+    With ``include_base`` the unsharded rule ``<NAME>`` is listed first if it exists.
     """
-    result = []
-    try:
-        desc = run_snow_sql(f"DESC NETWORK POLICY {expected_policy_name}", role=admin_role) or []
-        for row in desc:
-            if row.get("name") == "ALLOWED_NETWORK_RULE_LIST":
-                rules_str = row.get("value", "")
-                if rule_fqn.upper() in rules_str.upper():
-                    result.append(expected_policy_name)
-                    break
-    except Exception:
-        pass
-    return result
-
-
-def detach_rule_from_policy(policy_name: str, admin_role: str = "accountadmin") -> None:
-    """Temporarily detach all rules from a policy (SET to empty list)."""
-    sql = f"USE ROLE {admin_role};\nALTER NETWORK POLICY IF EXISTS {policy_name} SET ALLOWED_NETWORK_RULE_LIST = ();"
-    run_snow_sql_stdin(sql)
-
-
-def reattach_rule_to_policy(
-    policy_name: str, rule_fqn: str, admin_role: str = "accountadmin"
-) -> None:
-    """Re-attach a rule to a policy."""
-    sql = f"USE ROLE {admin_role};\nALTER NETWORK POLICY IF EXISTS {policy_name} SET ALLOWED_NETWORK_RULE_LIST = ('{rule_fqn}');"
-    run_snow_sql_stdin(sql)
+    rows = get_inventory().show("NETWORK RULE", scope=f"{db}.{schema}", role=admin_role)
+    return filter_rule_shards(rows, name, include_base)
+
+
+def filter_rule_shards(rows: list[dict], name: str, include_base: bool = False) -> list[str]:
+    """Pick the shards of rule ``name`` out of SHOW NETWORK RULES rows (see list_rule_shards)."""
+    names = {r.get("name", "").upper() for r in rows}
+    shard_re = re.compile(rf"^{re.escape(name.upper())}_\d{{3}}$")
+    shards = sorted(n for n in names if shard_re.match(n))
+    if include_base and name.upper() in names:
+        return [name.upper(), *shards]
+    return shards
+
+
+def get_rule_shard_values(
+    name: str, db: str, schema: str, admin_role: str = "accountadmin", include_base: bool = False
+) -> dict[str, list[str]]:
+    """Return existing shards of a rule (optionally the base rule too) mapped to their values."""
+    return {
+        shard: get_network_rule_values(shard, db, schema, admin_role=admin_role) or []
+        for shard in list_rule_shards(name, db, schema, admin_role, include_base)
+    }
+
+
+def get_policy_rule_refs(policy_name: str, admin_role: str = "accountadmin") -> list[str] | None:
+    """Return the rules a network policy allows, or None if the policy does not exist."""
+    desc = get_inventory().describe("NETWORK POLICY", policy_name, role=admin_role)
+    return parse_policy_rule_refs(desc)
+
+
+def parse_policy_rule_refs(desc: list[dict] | None) -> list[str] | None:
+    """Return the rule list from DESC NETWORK POLICY rows (None if there are none)."""
+    if not desc:
+        return None
+    for row in desc:
+        if row.get("name") == "ALLOWED_NETWORK_RULE_LIST":
+            return _parse_name_list(row.get("value", ""))
+    return []
+
+
+def _user_rule_values(user: str, cidrs: list[str]) -> dict[str, list[str]]:
+    """Map a user's network rule name (or its shard names) to the CIDRs it holds."""
+    rule_name = f"{user}_NETWORK_RULE".upper()
+    if len(cidrs) > get_max_values_per_rule():
+        return plan_rule_shards(rule_name, cidrs)
+    return {rule_name: cidrs}
+
+
+def get_user_network_comment(user: str, db: str, comment_prefix: str | None = None) -> str:
+    """Comment of the network rule(s) and policy provisioned for a user."""
+    user_part = normalize_identifier(comment_prefix or user, "snowflake")
+    project_part = normalize_identifier(db, "snowflake")
+    return f"Used by {user_part} - {project_part} app - managed by snow-utils-networks"
 
 
 def get_setup_network_for_user_sql(
@@ -440,33 +942,171 @@ def get_setup_network_for_user_sql(
     Returns:
         Complete SQL string for rule and policy creation
     """
-    rule_name = f"{user}_NETWORK_RULE".upper()
     policy_name = f"{user}_NETWORK_POLICY".upper()
-    rule_fqn = f"{db.upper()}.{schema.upper()}.{rule_name}"
-    user_part = normalize_identifier(comment_prefix or user, "snowflake")
-    project_part = normalize_identifier(db, "snowflake")
-
-    rule_sql = get_network_rule_sql(
-        name=rule_name,
-        db=db.upper(),
-        schema=schema.upper(),
-        values=cidrs,
-        mode=NetworkRuleMode.INGRESS,
-        rule_type=NetworkRuleType.IPV4,
-        comment=f"Used by {user_part} - {project_part} app - managed by snow-utils-networks",
-        force=force,
+    comment = get_user_network_comment(user, db, comment_prefix)
+    rules = _user_rule_values(user, cidrs)
+
+    rule_sql = "\n".join(
+        get_network_rule_sql(
+            name=rule_name,
+            db=db.upper(),
+            schema=schema.upper(),
+            values=values,
+            mode=NetworkRuleMode.INGRESS,
+            rule_type=NetworkRuleType.IPV4,
+            comment=comment,
+            force=force,
+        )
+        for rule_name, values in rules.items()
     )
 
     policy_sql = get_network_policy_sql(
         policy_name=policy_name,
-        rule_refs=[rule_fqn],
-        comment=f"Used by {user_part} - {project_part} app - managed by snow-utils-networks",
+        rule_refs=[f"{db.upper()}.{schema.upper()}.{rule_name}" for rule_name in rules],
+        comment=comment,
         force=force,
     )
 
     return f"USE ROLE {admin_role};\n{rule_sql}\n\n{policy_sql}"
 
 
+def get_provision_network_for_user_sql(
+    user: str,
+    db: str,
+    cidrs: list[str],
+    schema: str = "NETWORKS",
+    force: bool = False,
+    comment_prefix: str | None = None,
+    admin_role: str = "accountadmin",
+    policy_refs: list[str] | None = None,
+    existing_rules: list[str] | None = None,
+) -> str:
+    """
+    Generate a self-contained script that (re)provisions a user's network access.
+
+    Unlike get_setup_network_for_user_sql, the script also works when the
+    user's policy already references the rule: the user's rule (or shards)
+    are detached from the policy before they are replaced and the policy is
+    re-pointed at them afterwards, keeping any other rules it allows. Rules
+    and shards superseded by the new value list are dropped. Used to batch
+    many users into one execution.
+
+    Args:
+        user: Username (used for naming rule/policy)
+        db: Database for network rule
+        cidrs: List of IPv4 CIDRs
+        schema: Schema for network rule (default: NETWORKS)
+        force: If True, use CREATE OR REPLACE
+        comment_prefix: Comment prefix for SQL resources (inferred from user if not provided)
+        admin_role: Role for creating resources (default: accountadmin)
+        policy_refs: Current rule list of the user's policy (None/empty if it does not exist)
+        existing_rules: Existing rule and shard names of the user
+            (filter_rule_shards with include_base=True)
+
+    Returns:
+        Multi-statement SQL string
+    """
+    db, schema = db.upper(), schema.upper()
+    policy_name = f"{user}_NETWORK_POLICY".upper()
+    rule_name = f"{user}_NETWORK_RULE".upper()
+    rules = _user_rule_values(user, cidrs)
+    rule_refs = [f"{db}.{schema}.{n}" for n in rules]
+
+    refs = policy_refs or []
+    family_re = re.compile(rf"^{re.escape(f'{db}.{schema}.{rule_name}')}(_\d{{3}})?$")
+    family = [ref for ref in refs if family_re.match(ref.upper())]
+    others = [ref for ref in refs if ref not in family]
+    restored = [*others]
+    position = refs.index(family[0]) if family else len(others)
+    restored[position:position] = rule_refs
+    stale = [n for n in existing_rules or [] if n.upper() not in rules]
+
+    setup_sql = get_setup_network_for_user_sql(
+        user=user,
+        db=db,
+        cidrs=cidrs,
+        schema=schema,
+        force=force,
+        comment_prefix=comment_prefix,
+        admin_role=admin_role,
+    )
+    statements = [
+        f"USE ROLE {admin_role};",
+        f"CREATE DATABASE IF NOT EXISTS {db};",
+        f"CREATE SCHEMA IF NOT EXISTS {db}.{schema};",
+    ]
+    if family:
+        # Rules the user does not manage stay attached while theirs are replaced.
+        statements.append(get_set_network_policy_rules_sql(policy_name, others))
+    statements.append(setup_sql)
+    statements.append(get_set_network_policy_rules_sql(policy_name, restored))
+    # Shards (or the unsharded rule) left over from a differently sized value list.
+    statements.extend(f"DROP NETWORK RULE IF EXISTS {db}.{schema}.{n};" for n in stale)
+    statements.append(f"ALTER USER {user} SET NETWORK_POLICY = '{policy_name}';")
+    return "\n".join(statements)
+
+
+def fetch_users_network_state(
+    users: list[tuple[str, str]],
+    schema: str = "NETWORKS",
+    admin_role: str = "accountadmin",
+    max_workers: int | None = None,
+) -> dict[str, tuple[list[str], list[str]]]:
+    """
+    Read what get_provision_network_for_user_sql needs to know for many users.
+
+    One SHOW NETWORK POLICIES and one SHOW NETWORK RULES per database find
+    the existing objects; DESC NETWORK POLICY then runs concurrently, and
+    only for the users whose policy exists.
+
+    Args:
+        users: (user, database) pairs
+        schema: Schema holding the network rules (default: NETWORKS)
+        admin_role: Role for queries
+        max_workers: Concurrent queries (default: SNOW_UTILS_MAX_WORKERS)
+
+    Returns:
+        Mapping of user to (policy rule refs, existing rule and shard names)
+    """
+    inventory = get_inventory()
+    schema = schema.upper()
+    graph = StepGraph(max_workers)
+    graph.add(
+        "SHOW NETWORK POLICIES",
+        lambda: {
+            r.get("name", "").upper() for r in inventory.show("NETWORK POLICY", role=admin_role)
+        },
+    )
+    for db in dict.fromkeys(db.upper() for _, db in users):
+        scope = f"{db}.{schema}"
+        graph.add(
+            f"SHOW NETWORK RULES IN {scope}",
+            lambda scope=scope: inventory.show("NETWORK RULE", scope=scope, role=admin_role),
+        )
+    for user in dict.fromkeys(user for user, _ in users):
+        policy_name = f"{user}_NETWORK_POLICY".upper()
+
+        def desc_policy(policy_name: str = policy_name) -> list[str]:
+            if policy_name not in graph.results["SHOW NETWORK POLICIES"]:
+                return []
+            return get_policy_rule_refs(policy_name, admin_role=admin_role) or []
+
+        graph.add(f"DESC NETWORK POLICY {policy_name}", desc_policy, deps=["SHOW NETWORK POLICIES"])
+    results = graph.run()
+
+    return {
+        user: (
+            results[f"DESC NETWORK POLICY {user.upper()}_NETWORK_POLICY"],
+            filter_rule_shards(
+                results[f"SHOW NETWORK RULES IN {db.upper()}.{schema}"],
+                f"{user}_NETWORK_RULE",
+                include_base=True,
+            ),
+        )
+        for user, db in users
+    }
+
+
 def setup_network_for_user(
     user: str,
     db: str,
@@ -476,7 +1116,7 @@ def setup_network_for_user(
     force: bool = False,
     comment_prefix: str | None = None,
     admin_role: str = "accountadmin",
-) -> tuple[str, str]:
+) -> tuple[list[str], str]:
     """
     Create network rule and policy for a user (idempotent).
 
@@ -493,13 +1133,13 @@ def setup_network_for_user(
         admin_role: Role for creating resources (default: accountadmin)
 
     Returns:
-        Tuple of (rule_fqn, policy_name)
+        Tuple of (rule FQNs -- several when the CIDRs are sharded, policy_name)
     """
     rule_name = f"{user}_NETWORK_RULE".upper()
     policy_name = f"{user}_NETWORK_POLICY".upper()
     ctx = comment_prefix or user.upper()
 
-    rule_fqn = create_network_rule(
+    rule_refs = create_network_rule(
         name=rule_name,
         db=db,
         schema=schema,
@@ -514,14 +1154,14 @@ def setup_network_for_user(
 
     create_network_policy(
         policy_name=policy_name,
-        rule_refs=[rule_fqn],
+        rule_refs=rule_refs,
         comment=f"{ctx} network policy - managed by snow-utils-pat",
         dry_run=dry_run,
         force=force,
         admin_role=admin_role,
     )
 
-    return rule_fqn, policy_name
+    return rule_refs, policy_name
 
 
 def cleanup_network_for_user(
@@ -582,8 +1222,34 @@ load_dotenv()
 @click.group()
 @click.option("--verbose", "-v", is_flag=True, help="Enable verbose output")
 @click.option("--debug", "-d", is_flag=True, help="Enable debug output")
+@click.option(
+    "--backend",
+    type=click.Choice(["cli", "session"]),
+    envvar="SNOW_UTILS_BACKEND",
+    default="cli",
+    help="SQL backend: 'cli' (snow sql per statement) or 'session' (one reused connection)",
+)
+@click.option(
+    "--trace",
+    is_flag=True,
+    help="Print a per-step timing summary when the command finishes",
+)
+@click.option(
+    "--trace-file",
+    envvar="SNOW_UTILS_TRACE_FILE",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write spans as Chrome trace JSON (OTLP/JSON for *.otlp.json); implies --trace",
+)
 @click.pass_context
-def cli(ctx: click.Context, verbose: bool, debug: bool) -> None:
+def cli(
+    ctx: click.Context,
+    verbose: bool,
+    debug: bool,
+    backend: str,
+    trace: bool,
+    trace_file: Path | None,
+) -> None:
     """
     Snowflake Network Rule Manager.
 
@@ -595,8 +1261,9 @@ def cli(ctx: click.Context, verbose: bool, debug: bool) -> None:
       rule    - Manage network rules (create, list, delete)
       policy  - Manage network policies (create, list, delete)
     """
-    set_snow_cli_options(verbose=verbose, debug=debug)
+    set_snow_cli_options(verbose=verbose, debug=debug, backend=backend)
     ctx.ensure_object(dict)
+    setup_tracing(ctx, trace, trace_file)
 
 
 @cli.group()
@@ -644,6 +1311,21 @@ def policy() -> None:
 )
 @click.option("--allow-gh", "-G", is_flag=True, help="Include GitHub Actions IPs (IPV4 only)")
 @click.option("--allow-google", "-g", is_flag=True, help="Include Google IPs (IPV4 only)")
+@click.option(
+    "--refresh-presets",
+    is_flag=True,
+    help="Re-download GitHub/Google IP ranges instead of using the cache",
+)
+@click.option(
+    "--aggregate",
+    is_flag=True,
+    help="Collapse overlapping/adjacent IPv4 CIDRs into the minimal covering set",
+)
+@click.option(
+    "--max-cidrs",
+    type=click.IntRange(min=1),
+    help="Merge CIDRs into supernets until at most N remain (lossy, widens access)",
+)
 @click.option("--dry-run", is_flag=True, help="Preview SQL without executing")
 @click.option(
     "--force",
@@ -680,6 +1362,9 @@ def rule_create(
     allow_local: bool,
     allow_gh: bool,
     allow_google: bool,
+    refresh_presets: bool,
+    aggregate: bool,
+    max_cidrs: int | None,
     dry_run: bool,
     force: bool,
     policy_name: str | None,
@@ -727,7 +1412,10 @@ def rule_create(
 
     if type_enum == NetworkRuleType.IPV4:
         extra = [v.strip() for v in values.split(",")] if values else None
+        set_preset_options(refresh=refresh_presets)
         all_values = collect_ipv4_cidrs(allow_local, allow_gh, allow_google, extra)
+        if aggregate or max_cidrs:
+            all_values = aggregate_cidr_values(all_values, max_cidrs)
     else:
         if not values:
             raise click.ClickException(f"--values required for type {rule_type}")
@@ -749,7 +1437,7 @@ def rule_create(
             click.echo("Aborted.")
             return
 
-    fqn = create_network_rule(
+    rule_refs = create_network_rule(
         name.upper(),
         db.upper(),
         schema.upper(),
@@ -761,18 +1449,19 @@ def rule_create(
     )
 
     if not dry_run:
-        click.echo(f"✓ Created rule: {fqn}")
+        for fqn in rule_refs:
+            click.echo(f"✓ Created rule: {fqn}")
 
     if policy_name:
         policy_upper = policy_name.upper()
         if policy_mode.lower() == "alter":
             click.echo(f"Adding rule to policy: {policy_upper}")
-            alter_network_policy(policy_upper, [fqn], dry_run=dry_run)
+            alter_network_policy(policy_upper, rule_refs, dry_run=dry_run)
             if not dry_run:
                 click.echo(f"✓ Updated policy: {policy_upper}")
         else:
             click.echo(f"Creating policy: {policy_upper}")
-            create_network_policy(policy_upper, [fqn], dry_run=dry_run, force=force)
+            create_network_policy(policy_upper, rule_refs, dry_run=dry_run, force=force)
             if not dry_run:
                 click.echo(f"✓ Created policy: {policy_upper}")
 
@@ -789,6 +1478,26 @@ def rule_create(
 )
 @click.option("--allow-gh", "-G", is_flag=True, help="Include GitHub Actions IPs (IPV4 only)")
 @click.option("--allow-google", "-g", is_flag=True, help="Include Google IPs (IPV4 only)")
+@click.option(
+    "--refresh-presets",
+    is_flag=True,
+    help="Re-download GitHub/Google IP ranges instead of using the cache",
+)
+@click.option(
+    "--aggregate",
+    is_flag=True,
+    help="Collapse overlapping/adjacent IPv4 CIDRs into the minimal covering set",
+)
+@click.option(
+    "--max-cidrs",
+    type=click.IntRange(min=1),
+    help="Merge CIDRs into supernets until at most N remain (lossy, widens access)",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Only add/remove changed values (reads current values first; no-op if unchanged)",
+)
 @click.option("--dry-run", is_flag=True, help="Preview SQL without executing")
 def rule_update_cmd(
     name: str,
@@ -798,13 +1507,18 @@ def rule_update_cmd(
     allow_local: bool,
     allow_gh: bool,
     allow_google: bool,
+    refresh_presets: bool,
+    aggregate: bool,
+    max_cidrs: int | None,
+    incremental: bool,
     dry_run: bool,
 ) -> None:
     """
     Update (replace) values in an existing network rule.
 
-    This replaces ALL values in the rule. To add values, first list
-    existing values with DESCRIBE NETWORK RULE, then include them.
+    This replaces ALL values in the rule. With --incremental the current
+    values are read first and only the difference is applied; nothing is
+    written when the values are unchanged (cheap for scheduled refreshes).
 
     \b
     Examples:
@@ -816,9 +1530,15 @@ def rule_update_cmd(
 
         # Replace with specific CIDRs
         network.py rule update --name my_rule --db my_db --values "10.0.0.0/8,192.168.1.0/24" --no-local
+
+        # Nightly refresh: only apply what changed
+        network.py rule update --name ci_rule --db my_db --allow-gh --no-local --incremental
     """
     extra = [v.strip() for v in values.split(",")] if values else None
+    set_preset_options(refresh=refresh_presets)
     all_values = collect_ipv4_cidrs(allow_local, allow_gh, allow_google, extra)
+    if aggregate or max_cidrs:
+        all_values = aggregate_cidr_values(all_values, max_cidrs)
 
     if not all_values:
         raise click.ClickException(
@@ -834,6 +1554,7 @@ def rule_update_cmd(
         schema.upper(),
         all_values,
         dry_run=dry_run,
+        incremental=incremental,
     )
 
     if not dry_run:
@@ -865,17 +1586,16 @@ def rule_delete_cmd(name: str, db: str, schema: str) -> None:
 def rule_list_cmd(db: str, schema: str, admin_role: str) -> None:
     """List network rules in schema."""
     click.echo(f"Network rules in {db}.{schema}:".upper())
-    rules = list_network_rules(db.upper(), schema.upper(), admin_role=admin_role)
-
-    if not rules:
-        click.echo("  (none)")
-        return
-
-    for r in rules:
+    count = 0
+    for r in list_network_rules(db.upper(), schema.upper(), admin_role=admin_role):
         rule_name = r.get("name", "N/A")
         rule_type = r.get("type", "N/A")
         mode = r.get("mode", "N/A")
         click.echo(f"  {rule_name} ({mode}, {rule_type})")
+        count += 1
+
+    if not count:
+        click.echo("  (none)")
 
 
 @policy.command(name="create")
@@ -996,15 +1716,14 @@ def policy_delete_cmd(name: str, user: str | None, admin_role: str) -> None:
 def policy_list_cmd(admin_role: str) -> None:
     """List all network policies."""
     click.echo("Network policies:")
-    policies = list_network_policies(admin_role=admin_role)
-
-    if not policies:
-        click.echo("  (none)")
-        return
-
-    for p in policies:
+    count = 0
+    for p in list_network_policies(admin_role=admin_role):
         name = p.get("name", "N/A")
         click.echo(f"  {name}")
+        count += 1
+
+    if not count:
+        click.echo("  (none)")
 
 
 @policy.command(name="assign")
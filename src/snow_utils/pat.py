@@ -20,38 +20,61 @@ Sets up a service user with authentication policies and creates/rotates PATs.
 Network setup is handled separately via network.py.
 """
 
+import contextvars
+import hashlib
 import json
 import os
+import random
 import re
-import shutil
 import subprocess
+import tempfile
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, fields
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
+from typing import Any
 
 import click
 from dotenv import load_dotenv
-from snow_utils.network import (
-    assign_network_policy_to_user,
-    cleanup_network_for_user,
-    get_setup_network_for_user_sql,
-    setup_network_for_user,
-)
 from snow_utils_common import (
+    StepGraph,
     collect_ipv4_cidrs,
+    get_inventory,
     get_snow_cli_options,
+    get_snow_session,
+    load_manifest,
     run_snow_sql,
     run_snow_sql_stdin,
     set_masking,
+    set_preset_options,
     set_snow_cli_options,
+    setup_tracing,
+    span,
+    split_list_value,
 )
+from snow_utils_common.disk_cache import read_cache, write_cache
+from snow_utils_common.steps import default_max_workers
 
 
 def get_snowflake_account() -> str:
     """Get the current Snowflake account from connection test."""
-    result = subprocess.run(
-        ["snow", "connection", "test", "--format", "json"],
-        capture_output=True,
-        text=True,
-    )
+    if get_snow_cli_options().use_session:
+        account = get_snow_session().account
+        if not account:
+            raise click.ClickException("Could not determine account from Snowflake session")
+        return account
+
+    with span("snow connection test", "snow"):
+        result = subprocess.run(
+            ["snow", "connection", "test", "--format", "json"],
+            capture_output=True,
+            text=True,
+        )
     if result.returncode != 0:
         raise click.ClickException(f"Failed to test connection: {result.stderr}")
 
@@ -158,21 +181,33 @@ def get_auth_policy_sql(
     admin_role: str = "accountadmin",
 ) -> str:
     """Generate SQL for creating authentication policy (idempotent)."""
-    auth_policy_name = f"{user}_auth_policy".upper()
-    comment = format_comment(comment_prefix)
-
+    auth_policy_ddl = get_auth_policy_ddl(
+        user, db, default_expiry_days, max_expiry_days, comment_prefix
+    )
     return f"""USE ROLE {admin_role};
 CREATE SCHEMA IF NOT EXISTS {db}.POLICIES;
-CREATE OR ALTER AUTHENTICATION POLICY {db}.POLICIES.{auth_policy_name}
+{auth_policy_ddl}
+
+ALTER USER {user} SET AUTHENTICATION POLICY {get_auth_policy_name(user, db)};"""
+
+
+def get_auth_policy_name(user: str, db: str) -> str:
+    """Fully qualified name of a user's authentication policy."""
+    return f"{db}.POLICIES.{f'{user}_auth_policy'.upper()}"
+
+
+def get_auth_policy_ddl(
+    user: str, db: str, default_expiry_days: int, max_expiry_days: int, comment_prefix: str
+) -> str:
+    """CREATE OR ALTER statement for a user's PAT authentication policy."""
+    return f"""CREATE OR ALTER AUTHENTICATION POLICY {get_auth_policy_name(user, db)}
     AUTHENTICATION_METHODS = ('PROGRAMMATIC_ACCESS_TOKEN')
     PAT_POLICY = (
         DEFAULT_EXPIRY_IN_DAYS = {default_expiry_days}
         MAX_EXPIRY_IN_DAYS = {max_expiry_days}
         NETWORK_POLICY_EVALUATION = ENFORCED_REQUIRED
     )
-    COMMENT = '{comment}';
-
-ALTER USER {user} SET AUTHENTICATION POLICY {db}.POLICIES.{auth_policy_name};"""
+    COMMENT = '{format_comment(comment_prefix)}';"""
 
 
 def setup_auth_policy(
@@ -209,12 +244,19 @@ def remove_auth_policy(user: str, db: str, admin_role: str = "accountadmin") ->
 
 def get_existing_pat(user: str, pat_name: str, admin_role: str = "accountadmin") -> str | None:
     """Check if a PAT with the given name exists for the user."""
-    result = run_snow_sql(f"SHOW USER PATS FOR USER {user}", role=admin_role)
+    rows = get_inventory().iter_query(
+        "USER", f"SHOW USER PATS FOR USER {user}", role=admin_role, check=True
+    )
+    found = find_pat(rows, pat_name)
+    # Drain the stream so the (small) result is memoized: rotate looks twice.
+    for _ in rows:
+        pass
+    return found
 
-    if not result:
-        return None
 
-    for pat in result:
+def find_pat(rows: Iterable[dict] | None, pat_name: str) -> str | None:
+    """Return the name of PAT ``pat_name`` in SHOW USER PATS rows, or None."""
+    for pat in rows or []:
         if pat.get("name", "").lower() == pat_name.lower():
             return pat.get("name")
 
@@ -226,6 +268,28 @@ def get_pat_sql(user: str, pat_role: str, pat_name: str) -> str:
     return f"ALTER USER IF EXISTS {user} ADD PAT {pat_name} ROLE_RESTRICTION = {pat_role};"
 
 
+def get_remove_pat_sql(user: str, pat_name: str) -> str:
+    """Generate SQL for removing a PAT."""
+    return f"ALTER USER IF EXISTS {user} REMOVE PAT {pat_name}"
+
+
+def get_create_or_rotate_pat_query(user: str, pat_role: str, pat_name: str, exists: bool) -> str:
+    """Generate the statement that rotates an existing PAT or adds a new one."""
+    if exists:
+        return f"ALTER USER IF EXISTS {user} ROTATE PAT {pat_name}"
+    return f"ALTER USER IF EXISTS {user} ADD PAT {pat_name} ROLE_RESTRICTION = {pat_role}"
+
+
+def extract_pat_token(result: dict | list | None, quiet: bool = False) -> str:
+    """Return the token secret from an ADD/ROTATE PAT result."""
+    if not result or not result[0].get("token_secret"):
+        raise click.ClickException("Failed to get PAT token from response")
+
+    if not quiet:
+        click.echo("✓ PAT created/rotated successfully")
+    return result[0]["token_secret"]
+
+
 def create_or_rotate_pat(
     user: str, pat_role: str, pat_name: str, rotate: bool = False, admin_role: str = "accountadmin"
 ) -> str:
@@ -234,25 +298,16 @@ def create_or_rotate_pat(
 
     if existing and not rotate:
         click.echo(f"PAT '{pat_name}' exists. Removing and recreating (--no-rotate)...")
-        run_snow_sql(f"ALTER USER IF EXISTS {user} REMOVE PAT {pat_name}", role=admin_role)
+        run_snow_sql(get_remove_pat_sql(user, pat_name), role=admin_role)
         click.echo(f"✓ Removed existing PAT '{pat_name}'")
         existing = None
 
     if existing:
         click.echo(f"Rotating PAT for service user {user}...")
-        query = f"ALTER USER IF EXISTS {user} ROTATE PAT {pat_name}"
     else:
         click.echo(f"Creating new PAT for service user {user} with role restriction {pat_role}...")
-        query = f"ALTER USER IF EXISTS {user} ADD PAT {pat_name} ROLE_RESTRICTION = {pat_role}"
-
-    result = run_snow_sql(query, role=admin_role)
-
-    if not result or not result[0].get("token_secret"):
-        raise click.ClickException("Failed to get PAT token from response")
-
-    token = result[0]["token_secret"]
-    click.echo("✓ PAT created/rotated successfully")
-    return token
+    query = get_create_or_rotate_pat_query(user, pat_role, pat_name, exists=bool(existing))
+    return extract_pat_token(run_snow_sql(query, role=admin_role))
 
 
 def remove_pat(user: str, pat_name: str, admin_role: str = "accountadmin") -> None:
@@ -264,91 +319,590 @@ def remove_pat(user: str, pat_name: str, admin_role: str = "accountadmin") -> No
         click.echo(f"⚠ PAT '{pat_name}' not found for user {user}")
         return
 
-    run_snow_sql(f"ALTER USER IF EXISTS {user} REMOVE PAT {pat_name}", role=admin_role)
+    run_snow_sql(get_remove_pat_sql(user, pat_name), role=admin_role)
     click.echo(f"✓ Removed PAT '{pat_name}'")
 
 
+def get_remove_service_user_sql(user: str, admin_role: str = "accountadmin") -> str:
+    """Generate SQL for dropping the service user."""
+    return f"""
+        USE ROLE {admin_role};
+        DROP USER IF EXISTS {user};
+    """
+
+
 def remove_service_user(user: str, admin_role: str = "accountadmin") -> None:
     """Drop the service user (idempotent)."""
     click.echo(f"Dropping service user: {user}")
 
-    sql = f"""
-        USE ROLE {admin_role};
-        DROP USER IF EXISTS {user};
-    """
-    run_snow_sql_stdin(sql)
+    run_snow_sql_stdin(get_remove_service_user_sql(user, admin_role))
     click.echo(f"✓ Service user {user} dropped")
 
 
+@dataclass
+class ServiceUserSpec:
+    """One service user entry of a bulk (manifest-driven) PAT provisioning run."""
+
+    user: str
+    role: str
+    db: str
+    pat_name: str
+    comment_prefix: str
+    cidrs: list[str] = field(default_factory=list)
+    env_file: Path | None = None
+
+
+def get_bulk_user_sql(
+    spec: ServiceUserSpec,
+    default_expiry_days: int,
+    max_expiry_days: int,
+    force: bool = False,
+    skip_network: bool = False,
+    admin_role: str = "accountadmin",
+    network_state: tuple[list[str], list[str]] | None = None,
+) -> str:
+    """Generate the provisioning SQL for one bulk entry (everything except the PAT).
+
+    Merges the service user, network and authentication policy scripts. All
+    statements are idempotent, so a script can be re-run after a partially
+    applied batch. ``network_state`` is the user's entry from
+    fetch_users_network_state; without it no network objects are assumed to
+    exist (dry-run).
+    """
+    from snow_utils.network import get_provision_network_for_user_sql
+
+    parts = [get_service_user_sql(spec.user, spec.role, spec.comment_prefix, admin_role)]
+    if not skip_network:
+        policy_refs, existing_rules = network_state or ([], [])
+        parts.append(
+            get_provision_network_for_user_sql(
+                user=spec.user,
+                db=spec.db,
+                cidrs=spec.cidrs,
+                force=force,
+                comment_prefix=spec.comment_prefix,
+                admin_role=admin_role,
+                policy_refs=policy_refs,
+                existing_rules=existing_rules,
+            )
+        )
+    parts.append(
+        get_auth_policy_sql(
+            spec.user,
+            spec.db,
+            default_expiry_days,
+            max_expiry_days,
+            spec.comment_prefix,
+            admin_role,
+        )
+    )
+    return "\n\n".join(parts)
+
+
+def provision_service_users(
+    specs: list[ServiceUserSpec],
+    default_expiry_days: int,
+    max_expiry_days: int,
+    force: bool = False,
+    skip_network: bool = False,
+    admin_role: str = "accountadmin",
+    batch_size: int = 25,
+) -> dict[str, dict]:
+    """Provision users, network and auth policies for many entries in batched scripts.
+
+    The users' existing network policies and rules are read up front (see
+    fetch_users_network_state), so re-provisioning keeps unrelated policy
+    rules and drops superseded shards. Each batch of ``batch_size`` users
+    runs as one multi-statement script. When a batch fails, its users are
+    re-run one script at a time so the failure is attributed to the right user.
+
+    Returns:
+        Mapping of user name to result dict with "status" and optional "error"
+    """
+    from snow_utils.network import fetch_users_network_state
+
+    results: dict[str, dict] = {spec.user: {"status": "pending"} for spec in specs}
+    network_state = {}
+    if not skip_network:
+        network_state = fetch_users_network_state(
+            [(spec.user, spec.db) for spec in specs], admin_role=admin_role
+        )
+    batches = [specs[i : i + batch_size] for i in range(0, len(specs), batch_size)]
+
+    for index, batch in enumerate(batches, 1):
+        scripts = {
+            spec.user: get_bulk_user_sql(
+                spec,
+                default_expiry_days,
+                max_expiry_days,
+                force,
+                skip_network,
+                admin_role,
+                network_state.get(spec.user),
+            )
+            for spec in batch
+        }
+        click.echo(f"Provisioning batch {index}/{len(batches)} ({len(batch)} users)...")
+        batch_result = run_snow_sql_stdin("\n\n".join(scripts.values()), check=False)
+        if batch_result.returncode == 0:
+            for spec in batch:
+                results[spec.user]["status"] = "provisioned"
+            continue
+
+        click.echo("⚠ Batch failed, re-running users individually to isolate failures...")
+        for spec in batch:
+            user_result = run_snow_sql_stdin(scripts[spec.user], check=False)
+            if user_result.returncode == 0:
+                results[spec.user]["status"] = "provisioned"
+            else:
+                results[spec.user]["status"] = "failed"
+                results[spec.user]["error"] = user_result.stderr.strip()
+
+    return results
+
+
+# Account-wide PAT listing in one query. ACCOUNT_USAGE lags the live state by
+# up to ~2 hours; --source show reads SHOW USER PATS per user instead.
+PAT_AUDIT_SQL = (
+    "SELECT * FROM SNOWFLAKE.ACCOUNT_USAGE.CREDENTIALS WHERE type = 'PAT' AND deleted_on IS NULL"
+)
+DEFAULT_AUDIT_TTL = 900
+# Kept in the inventory's USER namespace, so PAT changes made through
+# snow-utils (ALTER USER ... ADD/ROTATE/REMOVE PAT) drop the cached audit.
+_AUDIT_CACHE = "inventory/user-pat-audit-{digest}.json"
+_DURATION_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([wdhm]?)\s*$", re.IGNORECASE)
+_DURATION_UNITS = {"w": "weeks", "d": "days", "h": "hours", "m": "minutes", "": "days"}
+
+
+@dataclass
+class PatRecord:
+    """One PAT, from SHOW USER PATS or ACCOUNT_USAGE.CREDENTIALS."""
+
+    user: str
+    name: str
+    role_restriction: str | None = None
+    status: str | None = None
+    expires_at: str | None = None  # ISO 8601
+    created_on: str | None = None
+    comment: str | None = None
+
+    def days_left(self, now: datetime | None = None) -> float | None:
+        """Days until expiry (negative once expired), None if unknown."""
+        expires = parse_timestamp(self.expires_at)
+        if expires is None:
+            return None
+        return (expires - (now or datetime.now(UTC))).total_seconds() / 86400
+
+
+def parse_duration(value: str) -> timedelta:
+    """Parse ``7d``, ``12h``, ``30m``, ``2w`` or a plain number of days."""
+    match = _DURATION_RE.match(value)
+    if not match:
+        raise ValueError(f"invalid duration '{value}' (use e.g. 7d, 12h, 30m, 2w)")
+    amount, unit = match.groups()
+    return timedelta(**{_DURATION_UNITS[unit.lower()]: float(amount)})
+
+
+def parse_timestamp(value: object) -> datetime | None:
+    """Parse a Snowflake timestamp (ISO text, ``... -0700`` offsets, epoch) as aware UTC."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, int | float):
+        parsed = datetime.fromtimestamp(value, UTC)
+    else:
+        text = re.sub(r"\s*([+-]\d{2}):?(\d{2})$", r"\1:\2", str(value).strip())
+        try:
+            parsed = datetime.fromisoformat(text)
+        except ValueError:
+            try:
+                parsed = datetime.fromtimestamp(float(text), UTC)
+            except ValueError:
+                return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed.astimezone(UTC)
+
+
+def pat_record(row: dict, user: str | None = None) -> PatRecord:
+    """Normalize a SHOW USER PATS or CREDENTIALS row (column case and names vary)."""
+    fields = {str(k).lower(): v for k, v in row.items()}
+    details = fields.get("additional_details")
+    if isinstance(details, str):
+        try:
+            details = json.loads(details)
+        except ValueError:
+            details = None
+    if isinstance(details, dict):
+        fields = {**{str(k).lower(): v for k, v in details.items()}, **fields}
+
+    def text(*keys: str) -> str | None:
+        for key in keys:
+            if fields.get(key) not in (None, ""):
+                return str(fields[key])
+        return None
+
+    expires = parse_timestamp(fields.get("expires_at") or fields.get("expiration_time"))
+    created = parse_timestamp(fields.get("created_on"))
+    return PatRecord(
+        user=(text("user_name", "user") or user or "").upper(),
+        name=text("name") or "",
+        role_restriction=text("role_restriction"),
+        status=text("status"),
+        expires_at=expires.isoformat() if expires else text("expires_at", "expiration_time"),
+        created_on=created.isoformat() if created else text("created_on"),
+        comment=text("comment"),
+    )
+
+
+def fetch_pat_records(
+    users: list[str],
+    source: str = "auto",
+    admin_role: str = "accountadmin",
+    max_workers: int | None = None,
+) -> tuple[list[PatRecord], str, list[str]]:
+    """
+    List PATs across the account.
+
+    ``account-usage`` reads every PAT with one query; ``show`` runs SHOW USER
+    PATS for each user (``users``, or everyone SHOW USERS lists) on a
+    bounded worker pool. ``auto`` uses the bulk query when no users are
+    given and falls back to ``show`` if ACCOUNT_USAGE is not readable.
+
+    Returns:
+        The records, the source actually used and the users whose SHOW USER
+        PATS failed (their PATs are missing from the records)
+    """
+    users = list(dict.fromkeys(u.upper() for u in users))
+    if source == "account-usage" or (source == "auto" and not users):
+        rows = run_snow_sql(PAT_AUDIT_SQL, role=admin_role, check=source == "account-usage")
+        if rows is not None:
+            wanted = set(users)
+            records = [pat_record(row) for row in rows]
+            return [r for r in records if not wanted or r.user in wanted], "account-usage", []
+        click.echo(
+            "⚠ SNOWFLAKE.ACCOUNT_USAGE.CREDENTIALS is not readable; listing PATs per user",
+            err=True,
+        )
+
+    inventory = get_inventory()
+    if not users:
+        rows = inventory.iter_show("USER", role=admin_role)
+        users = [str(r["name"]).upper() for r in rows if r.get("name")]
+
+    graph = StepGraph(max_workers)
+    for user in users:
+        graph.add(
+            user,
+            lambda user=user: inventory.query(
+                "USER", f"SHOW USER PATS FOR USER {user}", role=admin_role
+            ),
+        )
+    results = graph.run()
+    records = [pat_record(row, user) for user in users for row in results[user] or []]
+    return records, "show", [user for user in users if results[user] is None]
+
+
+def _audit_ttl() -> int:
+    """PAT audit cache TTL in seconds (SNOW_UTILS_PAT_AUDIT_TTL, 0 = off)."""
+    try:
+        return max(0, int(os.environ.get("SNOW_UTILS_PAT_AUDIT_TTL", DEFAULT_AUDIT_TTL)))
+    except ValueError:
+        return DEFAULT_AUDIT_TTL
+
+
+def load_pat_audit(
+    users: list[str],
+    source: str = "auto",
+    admin_role: str = "accountadmin",
+    max_workers: int | None = None,
+    refresh: bool = False,
+) -> tuple[list[PatRecord], str, float, list[str]]:
+    """
+    fetch_pat_records() through the on-disk cache.
+
+    Incomplete results (some users could not be listed) are not cached.
+
+    Returns:
+        The records, the source they came from, when they were fetched and
+        the users that could not be listed
+    """
+    connection = os.environ.get("SNOWFLAKE_DEFAULT_CONNECTION_NAME", "")
+    key = f"{connection}|{admin_role}|{source}|{','.join(users)}".upper()
+    name = _AUDIT_CACHE.format(digest=hashlib.sha1(key.encode()).hexdigest()[:16])
+    ttl = _audit_ttl()
+
+    entry = read_cache(name) if ttl and not refresh else None
+    if isinstance(entry, dict) and time.time() - entry.get("fetched_at", 0) < ttl:
+        try:
+            records = [PatRecord(**r) for r in entry["records"]]
+            return records, entry["source"], entry["fetched_at"], []
+        except (KeyError, TypeError):
+            pass  # older cache layout: refetch
+
+    records, used, failed = fetch_pat_records(users, source, admin_role, max_workers)
+    fetched_at = time.time()
+    if ttl and not failed:
+        entry = {"fetched_at": fetched_at, "source": used, "records": [asdict(r) for r in records]}
+        write_cache(name, entry)
+    return records, used, fetched_at, failed
+
+
+def filter_pat_records(
+    records: list[PatRecord],
+    roles: Iterable[str] = (),
+    expiring_within: timedelta | None = None,
+    include_expired: bool = False,
+    now: datetime | None = None,
+) -> list[PatRecord]:
+    """
+    Filter audit records and sort them by expiry (soonest first, unknown last).
+
+    Args:
+        records: Records to filter
+        roles: Keep only PATs restricted to one of these roles
+        expiring_within: Keep only PATs expiring within this window
+        include_expired: With ``expiring_within``, also keep already expired PATs
+        now: Reference time (default: now)
+    """
+    now = now or datetime.now(UTC)
+    wanted_roles = {r.upper() for r in roles}
+    kept = []
+    for record in records:
+        if wanted_roles and (record.role_restriction or "").upper() not in wanted_roles:
+            continue
+        if expiring_within is not None:
+            days_left = record.days_left(now)
+            if days_left is None or days_left * 86400 > expiring_within.total_seconds():
+                continue
+            if days_left < 0 and not include_expired:
+                continue
+        kept.append(record)
+
+    def sort_key(record: PatRecord) -> tuple:
+        expires = parse_timestamp(record.expires_at)
+        return (expires is None, expires or now, record.user, record.name)
+
+    return sorted(kept, key=sort_key)
+
+
+# ``KEY=value`` / ``export KEY=value`` lines of a .env file.
+_ENV_LINE_RE = re.compile(
+    r"^(?P<prefix>\s*(?:export\s+)?)(?P<key>[A-Za-z_][A-Za-z0-9_]*)\s*=(?P<value>.*)$"
+)
+_ENV_QUOTED_RE = re.compile(r"""^"((?:[^"\\]|\\.)*)"|^'([^']*)'""")
+_env_locks: dict[str, threading.Lock] = {}
+_env_locks_guard = threading.Lock()
+
+
 def _escape_env_value(value: str) -> str:
     """Escape a value for safe storage in .env file."""
     escaped = value.replace("\\", "\\\\").replace('"', '\\"')
     return f'"{escaped}"'
 
 
-def update_env(env_path: Path, user: str, password: str, pat_role: str) -> None:
-    """Update .env file with the new SA_PAT, SA_USER, and SA_ROLE."""
-    if not env_path.exists():
-        click.echo(f"⚠ {env_path} not found, skipping update")
-        return
+def _unescape_env_value(raw: str) -> str:
+    """Inverse of _escape_env_value; also accepts single-quoted and bare values."""
+    value = raw.strip()
+    match = _ENV_QUOTED_RE.match(value)
+    if match is None:
+        return re.split(r"\s+#", value, maxsplit=1)[0]
+    if match.group(1) is not None:
+        return re.sub(r"\\(.)", r"\1", match.group(1))
+    return match.group(2)
 
-    content = env_path.read_text()
 
-    backup_path = env_path.with_suffix(".env.bak")
-    shutil.copy(env_path, backup_path)
+def _env_backup_path(env_path: Path) -> Path:
+    return env_path.with_suffix(".env.bak")
 
-    pat_pattern = r"^SA_PAT=.*$"
-    pat_replacement = f"SA_PAT={_escape_env_value(password)}"
 
-    if re.search(pat_pattern, content, re.MULTILINE):
-        new_content = re.sub(pat_pattern, pat_replacement, content, flags=re.MULTILINE)
-    else:
-        new_content = content.rstrip() + f"\n{pat_replacement}\n"
+@contextmanager
+def env_file_lock(env_path: Path) -> Iterator[None]:
+    """
+    Hold the exclusive write lock of a .env file.
 
-    user_pattern = r"^SA_USER=.*$"
-    user_replacement = f"SA_USER={_escape_env_value(user)}"
+    Threads of this process serialize on an in-process lock; other
+    processes on an advisory ``flock`` of a hidden ``<name>.lock`` file next
+    to it (POSIX only). The lock is not taken on the .env file itself
+    because every write replaces it. The sidecar is left in place: removing
+    it would let a waiting process lock an unlinked file.
+    """
+    path = Path(os.path.realpath(env_path))
+    with _env_locks_guard:
+        thread_lock = _env_locks.setdefault(str(path), threading.Lock())
+    with thread_lock:
+        try:
+            import fcntl
+        except ImportError:  # Windows: in-process locking only
+            yield
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lock_name = f"{path.name}.lock" if path.name.startswith(".") else f".{path.name}.lock"
+        with open(path.with_name(lock_name), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _write_env_atomic(path: Path, text: str, mode: int) -> None:
+    """Write ``text`` to ``path`` via a synced temp file and rename."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def read_env_file(env_path: Path) -> dict[str, str]:
+    """Read the ``KEY=value`` pairs of a .env file (last assignment wins)."""
+    values = {}
+    for line in env_path.read_text().splitlines():
+        match = _ENV_LINE_RE.match(line)
+        if match:
+            values[match["key"]] = _unescape_env_value(match["value"])
+    return values
+
+
+def update_env_file(
+    env_path: Path,
+    values: Mapping[str, str],
+    add_missing: bool = True,
+    backup: bool = True,
+    create: bool = False,
+) -> bool:
+    """
+    Set many keys of a .env file in one pass, atomically and under its lock.
 
-    if re.search(user_pattern, new_content, re.MULTILINE):
-        new_content = re.sub(user_pattern, user_replacement, new_content, flags=re.MULTILINE)
-    else:
-        new_content = new_content.rstrip() + f"\n{user_replacement}\n"
+    Every ``KEY=`` (or ``export KEY=``) line of a key in ``values`` is
+    rewritten in place and all other lines are kept verbatim. The new
+    content replaces the file through a temp file and rename, so readers
+    never see a partial file. Symlinks are written through.
 
-    role_pattern = r"^SA_ROLE=.*$"
-    role_replacement = f"SA_ROLE={_escape_env_value(pat_role)}"
+    Args:
+        env_path: The .env file
+        values: Keys and their new (unquoted) values
+        add_missing: Append keys that have no line yet
+        backup: Save the previous content as ``*.env.bak`` first
+        create: Create the file (mode 0600) and its directory when missing
 
-    if re.search(role_pattern, new_content, re.MULTILINE):
-        new_content = re.sub(role_pattern, role_replacement, new_content, flags=re.MULTILINE)
-    else:
-        new_content = new_content.rstrip() + f"\n{role_replacement}\n"
+    Returns:
+        False if the file does not exist (and ``create`` is off), else True
+    """
+    path = Path(os.path.realpath(env_path))
+    if not create and not path.exists():
+        return False
+    with env_file_lock(path):
+        try:
+            content = path.read_text()
+            mode = path.stat().st_mode & 0o7777
+        except FileNotFoundError:
+            if not create:
+                return False
+            content, mode = "", 0o600
+            backup = False
+
+        lines = []
+        seen = set()
+        for line in content.splitlines():
+            match = _ENV_LINE_RE.match(line)
+            if match and match["key"] in values:
+                key = match["key"]
+                seen.add(key)
+                line = f"{match['prefix']}{key}={_escape_env_value(values[key])}"
+            lines.append(line)
+        missing = [key for key in values if key not in seen] if add_missing else []
+        if missing:
+            while lines and not lines[-1].strip():
+                lines.pop()
+            lines += [f"{key}={_escape_env_value(values[key])}" for key in missing]
+        new_content = "\n".join(lines) + "\n" if lines else ""
+
+        if new_content != content or not path.exists():
+            if backup:
+                _write_env_atomic(_env_backup_path(path), content, mode)
+            _write_env_atomic(path, new_content, mode)
+    return True
+
+
+def update_env_files(
+    updates: Mapping[Path, Mapping[str, str]],
+    add_missing: bool = True,
+    backup: bool = True,
+    create: bool = False,
+    max_workers: int | None = None,
+) -> dict[Path, str | None]:
+    """
+    update_env_file() for many files concurrently.
+
+    Entries naming the same file are merged into one write.
 
-    env_path.write_text(new_content)
+    Returns:
+        Mapping of each path to None when written, or an error message
+    """
+    merged: dict[str, dict[str, str]] = {}
+    paths: dict[str, list[Path]] = {}
+    for env_path, values in updates.items():
+        key = os.path.realpath(env_path)
+        merged.setdefault(key, {}).update(values)
+        paths.setdefault(key, []).append(env_path)
+
+    def write(key: str) -> str | None:
+        try:
+            written = update_env_file(Path(key), merged[key], add_missing, backup, create)
+        except OSError as e:
+            return str(e)
+        return None if written else "file not found"
+
+    with ThreadPoolExecutor(max_workers=max_workers or default_max_workers()) as pool:
+        errors = dict(zip(merged, pool.map(write, merged)))
+    return {env_path: errors[key] for key, group in paths.items() for env_path in group}
+
+
+def update_env(
+    env_path: Path, user: str, password: str, pat_role: str, create: bool = False
+) -> None:
+    """Update .env file with the new SA_PAT, SA_USER, and SA_ROLE."""
+    values = {"SA_PAT": password, "SA_USER": user, "SA_ROLE": pat_role}
+    if not update_env_file(env_path, values, create=create):
+        click.echo(f"⚠ {env_path} not found, skipping update")
+        return
     click.echo(f"✓ Updated {env_path} with new SA_PAT, SA_USER, and SA_ROLE")
 
 
 def clear_env(env_path: Path) -> None:
     """Clear PAT credentials from .env file."""
-    if not env_path.exists():
+    if not update_env_file(env_path, {"SA_PAT": ""}, add_missing=False):
         click.echo(f"⚠ {env_path} not found, skipping")
         return
 
-    content = env_path.read_text()
-
-    backup_path = env_path.with_suffix(".env.bak")
-    shutil.copy(env_path, backup_path)
-    click.echo(f"✓ Created backup: {backup_path}")
-
-    pat_pattern = r"^SA_PAT=.*$"
-    new_content = re.sub(pat_pattern, 'SA_PAT=""', content, flags=re.MULTILINE)
-
-    env_path.write_text(new_content)
     click.echo(f"✓ Cleared SA_PAT in {env_path}")
 
 
-def verify_connection(user: str, password: str, pat_role: str) -> None:
-    """Verify the PAT connection works."""
-    click.echo("Verifying connection with PAT...")
+def verify_connection(
+    user: str, password: str, pat_role: str, account: str | None = None, quiet: bool = False
+) -> None:
+    """Verify the PAT connection works.
+
+    Args:
+        user: Service user the PAT belongs to
+        password: The PAT token
+        pat_role: Role to connect with
+        account: Snowflake account (default: looked up with ``snow connection test``)
+        quiet: Only report failures (raised as ClickException)
+    """
+    if not quiet:
+        click.echo("Verifying connection with PAT...")
 
-    account = get_snowflake_account()
+    account = account or get_snowflake_account()
 
     cmd = [
         "snow",
@@ -368,12 +922,13 @@ def verify_connection(user: str, password: str, pat_role: str) -> None:
     if get_snow_cli_options().debug:
         click.echo(f"[DEBUG] Running: {' '.join(cmd)}")
 
-    result = subprocess.run(
-        cmd,
-        env={**os.environ, "SNOWFLAKE_PASSWORD": password},
-        capture_output=True,
-        text=True,
-    )
+    with span("snow sql (PAT)", "snow", user=user):
+        result = subprocess.run(
+            cmd,
+            env={**os.environ, "SNOWFLAKE_PASSWORD": password},
+            capture_output=True,
+            text=True,
+        )
 
     if get_snow_cli_options().debug and result.stderr:
         click.echo(f"[DEBUG] stderr: {result.stderr}")
@@ -381,7 +936,170 @@ def verify_connection(user: str, password: str, pat_role: str) -> None:
     if result.returncode != 0:
         raise click.ClickException(f"Connection verification failed: {result.stderr}")
 
-    click.echo("✓ Connection verified successfully")
+    if not quiet:
+        click.echo("✓ Connection verified successfully")
+
+
+# Errors that retrying a rotation or verification cannot fix.
+_PERMANENT_ERRORS = ("does not exist", "not authorized", "insufficient privileges")
+
+
+@dataclass
+class RotationTarget:
+    """One PAT of a bulk rotation run."""
+
+    user: str
+    pat_name: str
+    role: str
+    env_file: Path | None = None
+
+
+class _RateLimiter:
+    """Spaces calls at least ``1 / rate`` seconds apart across threads (0 = no limit)."""
+
+    def __init__(self, rate: float = 0.0) -> None:
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            with span("wait: rotation rate limit", "wait"):
+                time.sleep(slot - now)
+
+
+def _with_retries(fn: Callable[[], Any], retries: int, entry: dict, stage: str) -> Any:
+    """Run fn, retrying ClickExceptions with jittered backoff (1s, 2s, 4s ... max 10s)."""
+    for attempt in range(retries + 1):
+        entry["attempts"][stage] = attempt + 1
+        try:
+            return fn()
+        except click.ClickException as e:
+            permanent = any(text in e.message.lower() for text in _PERMANENT_ERRORS)
+            if permanent or attempt == retries:
+                raise
+            with span(f"wait: retry {stage}", "wait"):
+                time.sleep(min(2**attempt, 10) * random.uniform(0.75, 1.25))
+
+
+def rotate_pats(
+    targets: list[RotationTarget],
+    admin_role: str = "accountadmin",
+    workers: int = 4,
+    rate: float = 0.0,
+    retries: int = 2,
+    verify: bool = True,
+    verify_workers: int | None = None,
+    include_tokens: bool = False,
+    on_done: Callable[[dict], None] | None = None,
+) -> list[dict]:
+    """
+    Rotate many PATs on a bounded worker pool.
+
+    At most ``workers`` ROTATE statements run at once (``rate`` additionally
+    caps them per second). Each new token is written to the target's .env
+    file and handed to a separate pool of ``verify_workers`` connections, so
+    verification overlaps with the remaining rotations. Failed rotations and
+    verifications are retried ``retries`` times; a failed verification never
+    rotates the PAT again.
+
+    Returns:
+        One result dict per target, in input order, with "status"
+        (verified, rotated or failed), the failed "stage", "attempts" and
+        per-stage "latency_s". When the PAT was rotated but its .env file
+        could not be written (stage "env"), the new "token" is included.
+    """
+    account = get_snowflake_account() if verify and targets else None
+    limiter = _RateLimiter(rate)
+    results: dict[int, dict] = {}
+
+    def rotate_one(target: RotationTarget) -> tuple[dict, str | None]:
+        entry: dict[str, Any] = {
+            "user": target.user,
+            "pat_name": target.pat_name,
+            "pat_role": target.role,
+            "status": "failed",
+            "attempts": {},
+            "latency_s": {},
+            "started": time.monotonic(),
+        }
+        query = get_create_or_rotate_pat_query(target.user, target.role, target.pat_name, True)
+
+        def rotate() -> str:
+            limiter.wait()
+            return extract_pat_token(run_snow_sql(query, role=admin_role), quiet=True)
+
+        with span(f"rotate: {target.user}"):
+            try:
+                token = _with_retries(rotate, retries, entry, "rotate")
+            except click.ClickException as e:
+                entry.update(stage="rotate", error=e.message.strip())
+                return entry, None
+            finally:
+                entry["latency_s"]["rotate"] = round(time.monotonic() - entry["started"], 3)
+
+            try:
+                if target.env_file:
+                    values = {"SA_PAT": token, "SA_USER": target.user, "SA_ROLE": target.role}
+                    update_env_file(target.env_file, values, create=True)
+                    entry["pat_written_to"] = str(target.env_file)
+                if include_tokens and not target.env_file:
+                    entry["token"] = token
+            except OSError as e:
+                # The old token is already revoked; the new one must not be lost.
+                error = f"Rotated, but writing {target.env_file} failed: {e}"
+                entry.update(stage="env", error=error, token=token)
+                return entry, None
+        entry["status"] = "rotated"
+        return entry, token
+
+    def verify_one(target: RotationTarget, entry: dict, token: str) -> tuple[dict, None]:
+        started = time.monotonic()
+        with span(f"verify: {target.user}"):
+            try:
+                _with_retries(
+                    lambda: verify_connection(target.user, token, target.role, account, quiet=True),
+                    retries,
+                    entry,
+                    "verify",
+                )
+                entry["status"] = "verified"
+            except click.ClickException as e:
+                entry.update(status="failed", stage="verify", error=e.message.strip())
+        entry["latency_s"]["verify"] = round(time.monotonic() - started, 3)
+        return entry, None
+
+    with (
+        ThreadPoolExecutor(max_workers=workers) as rotate_pool,
+        ThreadPoolExecutor(max_workers=verify_workers or workers) as verify_pool,
+    ):
+        running: dict[Future, int] = {
+            rotate_pool.submit(contextvars.copy_context().run, rotate_one, target): index
+            for index, target in enumerate(targets)
+        }
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = running.pop(future)
+                entry, token = future.result()
+                if token is not None and verify:
+                    job = contextvars.copy_context().run
+                    running[verify_pool.submit(job, verify_one, targets[index], entry, token)] = (
+                        index
+                    )
+                    continue
+                entry["latency_s"]["total"] = round(time.monotonic() - entry.pop("started"), 3)
+                results[index] = entry
+                if on_done is not None:
+                    on_done(entry)
+
+    return [results[index] for index in range(len(targets))]
 
 
 # Auto-load .env from current working directory so callers
@@ -399,21 +1117,52 @@ load_dotenv()
     default=None,
     help="Comment prefix for SQL resources (inferred from SA_USER if not provided)",
 )
+@click.option(
+    "--backend",
+    type=click.Choice(["cli", "session"]),
+    envvar="SNOW_UTILS_BACKEND",
+    default="cli",
+    help="SQL backend: 'cli' (snow sql per statement) or 'session' (one reused connection)",
+)
+@click.option(
+    "--trace",
+    is_flag=True,
+    help="Print a per-step timing summary when the command finishes",
+)
+@click.option(
+    "--trace-file",
+    envvar="SNOW_UTILS_TRACE_FILE",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write spans as Chrome trace JSON (OTLP/JSON for *.otlp.json); implies --trace",
+)
 @click.pass_context
-def cli(ctx: click.Context, verbose: bool, debug: bool, comment: str | None) -> None:
+def cli(
+    ctx: click.Context,
+    verbose: bool,
+    debug: bool,
+    comment: str | None,
+    backend: str,
+    trace: bool,
+    trace_file: Path | None,
+) -> None:
     """
     Snowflake PAT Manager - Manage service users with programmatic access tokens.
 
     \b
     Commands:
-        create  - Create/rotate PAT for service user
-        rotate  - Rotate existing PAT (keep policies)
-        verify  - Test PAT connection
-        remove  - Remove PAT and associated objects
+        create       - Create/rotate PAT for service user
+        create-many  - Create/rotate PATs for many users from a manifest
+        rotate       - Rotate existing PAT (keep policies)
+        rotate-many  - Rotate many PATs concurrently (manifest, pattern or expiry)
+        verify       - Test PAT connection
+        audit        - List PATs and their expiry across the account
+        remove       - Remove PAT and associated objects
     """
-    set_snow_cli_options(verbose=verbose, debug=debug)
+    set_snow_cli_options(verbose=verbose, debug=debug, backend=backend)
     ctx.ensure_object(dict)
     ctx.obj["comment"] = comment
+    setup_tracing(ctx, trace, trace_file)
 
     if ctx.invoked_subcommand is None:
         click.echo(ctx.get_help())
@@ -440,6 +1189,21 @@ def cli(ctx: click.Context, verbose: bool, debug: bool, comment: str | None) ->
 )
 @click.option("--allow-gh", is_flag=True, default=False, help="Include GitHub Actions IPs")
 @click.option("--allow-google", is_flag=True, default=False, help="Include Google IPs")
+@click.option(
+    "--refresh-presets",
+    is_flag=True,
+    help="Re-download GitHub/Google IP ranges instead of using the cache",
+)
+@click.option(
+    "--aggregate",
+    is_flag=True,
+    help="Collapse overlapping/adjacent IPv4 CIDRs into the minimal covering set",
+)
+@click.option(
+    "--max-cidrs",
+    type=click.IntRange(min=1),
+    help="Merge CIDRs into supernets until at most N remain (lossy, widens access)",
+)
 @click.option("--extra-cidrs", multiple=True, help="Additional CIDRs (can be repeated)")
 @click.option(
     "--default-expiry-days",
@@ -504,6 +1268,9 @@ def create_command(
     allow_local: bool,
     allow_gh: bool,
     allow_google: bool,
+    refresh_presets: bool,
+    aggregate: bool,
+    max_cidrs: int | None,
     extra_cidrs: tuple[str, ...],
     default_expiry_days: int,
     max_expiry_days: int,
@@ -541,17 +1308,27 @@ def create_command(
         # Include GitHub Actions IPs for CI/CD
         pat.py create --user ci_sa --role ci_role --db my_db --allow-gh
     """
+    from snow_utils.network import (
+        aggregate_cidr_values,
+        assign_network_policy_to_user,
+        get_setup_network_for_user_sql,
+        setup_network_for_user,
+    )
+
     if not pat_name:
         pat_name = f"{user}_pat".upper()
 
     cidrs: list[str] = []
     if not skip_network:
+        set_preset_options(refresh=refresh_presets)
         cidrs = collect_ipv4_cidrs(
             with_local=allow_local,
             with_gh=allow_gh,
             with_google=allow_google,
             extra_cidrs=list(extra_cidrs) if extra_cidrs else None,
         )
+        if cidrs and (aggregate or max_cidrs):
+            cidrs = aggregate_cidr_values(cidrs, max_cidrs, echo=output == "text")
         if not cidrs:
             raise click.ClickException(
                 "Network policy required for PAT security. "
@@ -644,49 +1421,74 @@ def create_command(
             click.echo("Aborted.")
             return
 
-    setup_service_user(
-        user=user, pat_role=role, comment_prefix=comment_prefix, admin_role=admin_role
+    # The service user and the network rule/policy are independent; the
+    # network policy assignment and the auth policy need the user first. The
+    # auth policy also waits for the network step, which creates the database.
+    graph = StepGraph()
+    graph.add(
+        "service_user",
+        lambda: setup_service_user(
+            user=user, pat_role=role, comment_prefix=comment_prefix, admin_role=admin_role
+        ),
     )
 
     if not skip_network:
         click.echo(f"Setting up network rule and policy ({len(cidrs)} CIDRs)...")
-        rule_fqn, policy_name = setup_network_for_user(
+
+        def network_step() -> tuple[list[str], str]:
+            rule_refs, policy_name = setup_network_for_user(
+                user=user,
+                db=db,
+                cidrs=cidrs,
+                force=force,
+                comment_prefix=comment_prefix,
+                admin_role=admin_role,
+            )
+            for rule_fqn in rule_refs:
+                click.echo(f"✓ Network rule: {rule_fqn}")
+            click.echo(f"✓ Network policy: {policy_name}")
+            return rule_refs, policy_name
+
+        def assign_network_step() -> None:
+            _, policy_name = graph.results["network"]
+            assign_network_policy_to_user(user, policy_name, admin_role=admin_role)
+            click.echo(f"✓ Assigned network policy to user {user}")
+
+        graph.add("network", network_step)
+        graph.add("assign_network", assign_network_step, deps=["service_user", "network"])
+    else:
+        click.echo("Network setup skipped (delegated to snow-utils-networks skill)")
+
+    graph.add(
+        "auth_policy",
+        lambda: setup_auth_policy(
             user=user,
             db=db,
-            cidrs=cidrs,
-            force=force,
+            default_expiry_days=default_expiry_days,
+            max_expiry_days=max_expiry_days,
             comment_prefix=comment_prefix,
             admin_role=admin_role,
-        )
-        click.echo(f"✓ Network rule: {rule_fqn}")
-        click.echo(f"✓ Network policy: {policy_name}")
-        assign_network_policy_to_user(user, policy_name, admin_role=admin_role)
-        click.echo(f"✓ Assigned network policy to user {user}")
-    else:
-        click.echo("Network setup skipped (delegated to snow-utils-networks skill)")
-
-    setup_auth_policy(
-        user=user,
-        db=db,
-        default_expiry_days=default_expiry_days,
-        max_expiry_days=max_expiry_days,
-        comment_prefix=comment_prefix,
-        admin_role=admin_role,
+        ),
+        deps=["service_user"] if skip_network else ["service_user", "network"],
     )
+    graph.run()
 
-    password = create_or_rotate_pat(
-        user=user, pat_role=role, pat_name=pat_name, rotate=rotate, admin_role=admin_role
-    )
+    with span("create PAT"):
+        password = create_or_rotate_pat(
+            user=user, pat_role=role, pat_name=pat_name, rotate=rotate, admin_role=admin_role
+        )
 
     # When --dot-env-file is provided, write SA_PAT directly to that file
     # so the raw token never appears in shell command text (security).
     target_env = dot_env_file if dot_env_file else env_path
 
     if output == "text":
-        update_env(env_path=target_env, user=user, password=password, pat_role=role)
+        with span("update .env"):
+            update_env(env_path=target_env, user=user, password=password, pat_role=role)
 
     if not skip_verify and output == "text":
-        verify_connection(user=user, password=password, pat_role=role)
+        with span("verify connection"):
+            verify_connection(user=user, password=password, pat_role=role)
 
     if output == "json":
         result = build_result("success", password)
@@ -708,6 +1510,324 @@ def create_command(
     click.echo("=" * 50)
 
 
+@cli.command(name="create-many")
+@click.option(
+    "--manifest",
+    "-m",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="YAML/JSON/CSV manifest of users (columns: user, role, db, cidrs, pat_name, env_file)",
+)
+@click.option("--role", "-r", envvar="SA_ROLE", default=None, help="Default PAT role for entries")
+@click.option(
+    "--db", "-d", envvar="SNOW_UTILS_DB", default=None, help="Default database for entries"
+)
+@click.option("--rotate/--no-rotate", default=True, help="Rotate existing PATs (default: True)")
+@click.option(
+    "--allow-local/--no-local",
+    "allow_local",
+    default=True,
+    help="Include local IP for every user (default: True)",
+)
+@click.option("--allow-gh", is_flag=True, default=False, help="Include GitHub Actions IPs")
+@click.option("--allow-google", is_flag=True, default=False, help="Include Google IPs")
+@click.option(
+    "--refresh-presets",
+    is_flag=True,
+    help="Re-download GitHub/Google IP ranges instead of using the cache",
+)
+@click.option(
+    "--aggregate",
+    is_flag=True,
+    help="Collapse overlapping/adjacent IPv4 CIDRs into the minimal covering set",
+)
+@click.option(
+    "--max-cidrs",
+    type=click.IntRange(min=1),
+    help="Merge CIDRs into supernets until at most N remain (lossy, widens access)",
+)
+@click.option("--default-expiry-days", default=15, type=int, help="Default PAT expiry days")
+@click.option("--max-expiry-days", default=365, type=int, help="Maximum PAT expiry days")
+@click.option(
+    "--admin-role",
+    "-a",
+    default="accountadmin",
+    help="Admin role for creating resources (default: ACCOUNTADMIN)",
+)
+@click.option("--force", "-f", is_flag=True, help="Overwrite existing network rules/policies")
+@click.option("--skip-network", is_flag=True, help="Skip network rule/policy creation")
+@click.option(
+    "--batch-size",
+    default=25,
+    type=click.IntRange(1),
+    help="Users per batched SQL script (default: 25)",
+)
+@click.option(
+    "--env-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Write each token to <env-dir>/<USER>.env when the entry has no env_file",
+)
+@click.option("--verify", is_flag=True, help="Verify each new PAT (one connection per user)")
+@click.option("--dry-run", is_flag=True, help="Preview batched SQL without making changes")
+@click.option(
+    "--output",
+    "-o",
+    type=click.Choice(["text", "json"]),
+    default="text",
+    help="Output format",
+)
+@click.option(
+    "--yes",
+    "-y",
+    is_flag=True,
+    default=False,
+    help="Skip interactive confirmation (use after reviewing dry-run output)",
+)
+@click.pass_context
+def create_many_command(
+    ctx: click.Context,
+    manifest: Path,
+    role: str | None,
+    db: str | None,
+    rotate: bool,
+    allow_local: bool,
+    allow_gh: bool,
+    allow_google: bool,
+    refresh_presets: bool,
+    aggregate: bool,
+    max_cidrs: int | None,
+    default_expiry_days: int,
+    max_expiry_days: int,
+    admin_role: str,
+    force: bool,
+    skip_network: bool,
+    batch_size: int,
+    env_dir: Path | None,
+    verify: bool,
+    dry_run: bool,
+    output: str,
+    yes: bool,
+) -> None:
+    """
+    Create or rotate PATs for many service users from a manifest.
+
+    Service users, network rules/policies and authentication policies are
+    merged into a few large SQL scripts (--batch-size users each) instead of
+    several snow invocations per user. PATs are then created per user and
+    results are reported per user.
+
+    \b
+    Manifest (YAML):
+        users:
+          - user: CI_APP1_SA
+            role: CI_ROLE
+            db: SNOW_UTILS
+            cidrs: [10.0.0.0/8]
+            env_file: app1/.env
+
+    \b
+    Manifest (CSV):
+        user,role,db,cidrs,env_file
+        CI_APP1_SA,CI_ROLE,SNOW_UTILS,10.0.0.0/8;192.168.0.0/16,app1/.env
+
+    \b
+    Examples:
+        pat.py create-many --manifest users.yaml --env-dir envs/
+        pat.py create-many --manifest users.csv --allow-gh --no-local --yes -o json
+    """
+    from snow_utils.network import aggregate_cidr_values
+
+    rows = load_manifest(manifest, key="users")
+    if not rows:
+        raise click.ClickException(f"Manifest {manifest} has no entries")
+
+    shared_cidrs: list[str] = []
+    if not skip_network:
+        set_preset_options(refresh=refresh_presets)
+        shared_cidrs = collect_ipv4_cidrs(
+            with_local=allow_local, with_gh=allow_gh, with_google=allow_google
+        )
+
+    specs: list[ServiceUserSpec] = []
+    for number, row in enumerate(rows, 1):
+        user = row.get("user")
+        entry_role = row.get("role") or role
+        entry_db = row.get("db") or db
+        if not user or not entry_role or not entry_db:
+            raise click.ClickException(
+                f"Manifest entry {number} needs user, role and db "
+                "(role/db may come from --role/--db)"
+            )
+        env_file = row.get("env_file")
+        if env_file:
+            env_path = Path(env_file)
+        else:
+            env_path = env_dir / f"{user.upper()}.env" if env_dir else None
+        spec = ServiceUserSpec(
+            user=user,
+            role=entry_role,
+            db=entry_db,
+            pat_name=row.get("pat_name") or f"{user}_pat".upper(),
+            comment_prefix=(
+                row.get("comment") or ctx.obj.get("comment") or infer_comment_prefix(user)
+            ),
+            cidrs=list(dict.fromkeys(shared_cidrs + split_list_value(row.get("cidrs")))),
+            env_file=env_path,
+        )
+        if spec.cidrs and (aggregate or max_cidrs):
+            spec.cidrs = aggregate_cidr_values(spec.cidrs, max_cidrs, echo=False)
+        if not skip_network and not spec.cidrs:
+            raise click.ClickException(
+                f"Network policy required for PAT security but user {user} has no CIDRs"
+            )
+        specs.append(spec)
+
+    counts = Counter(spec.user.upper() for spec in specs)
+    duplicates = sorted(user for user, count in counts.items() if count > 1)
+    if duplicates:
+        raise click.ClickException(f"Duplicate users in manifest: {', '.join(duplicates)}")
+
+    if output == "text" and not dry_run:
+        missing = [s.user for s in specs if s.env_file is None]
+        if missing:
+            raise click.ClickException(
+                f"{len(missing)} entries have no env_file (e.g. {missing[0]}). "
+                "Set env_file per entry, pass --env-dir, or use --output json."
+            )
+
+    if output == "json" and not dry_run and not yes:
+        raise click.UsageError("--output json creates without confirmation; pass --yes")
+
+    if dry_run:
+        set_masking(False)
+        if output == "json":
+            click.echo(
+                json.dumps(
+                    [
+                        {
+                            "status": "dry_run",
+                            "user": s.user,
+                            "pat_name": s.pat_name,
+                            "pat_role": s.role,
+                            "database": s.db,
+                            "cidrs_count": len(s.cidrs),
+                        }
+                        for s in specs
+                    ],
+                    indent=2,
+                )
+            )
+            return
+        click.echo(f"SQL that would be executed for {len(specs)} users:")
+        for start in range(0, len(specs), batch_size):
+            batch = specs[start : start + batch_size]
+            click.echo("─" * 60)
+            click.echo(f"-- Batch {start // batch_size + 1} ({len(batch)} users)")
+            click.echo("─" * 60)
+            for spec in batch:
+                click.echo(
+                    get_bulk_user_sql(
+                        spec, default_expiry_days, max_expiry_days, force, skip_network, admin_role
+                    )
+                )
+                click.echo()
+            for spec in batch:
+                click.echo(get_pat_sql(spec.user, spec.role, spec.pat_name))
+        click.echo("─" * 60)
+        return
+
+    if output == "text":
+        click.echo("=" * 50)
+        click.echo("Snowflake PAT Manager - Create Many")
+        click.echo("=" * 50)
+        click.echo(f"Manifest: {manifest}")
+        click.echo(f"Users:    {len(specs)}")
+        click.echo(f"Batches:  {(len(specs) + batch_size - 1) // batch_size}")
+        click.echo()
+        if not yes and not click.confirm("Proceed with resource creation?", default=True):
+            click.echo("Aborted.")
+            return
+
+    results = provision_service_users(
+        specs,
+        default_expiry_days=default_expiry_days,
+        max_expiry_days=max_expiry_days,
+        force=force,
+        skip_network=skip_network,
+        admin_role=admin_role,
+        batch_size=batch_size,
+    )
+
+    report = []
+    for spec in specs:
+        entry = {
+            "user": spec.user,
+            "pat_name": spec.pat_name,
+            "pat_role": spec.role,
+            "database": spec.db,
+            **results[spec.user],
+        }
+        if not skip_network:
+            entry["cidrs_count"] = len(spec.cidrs)
+        if entry["status"] == "provisioned":
+            token = None
+            try:
+                token = create_or_rotate_pat(
+                    user=spec.user,
+                    pat_role=spec.role,
+                    pat_name=spec.pat_name,
+                    rotate=rotate,
+                    admin_role=admin_role,
+                )
+                if spec.env_file:
+                    update_env(
+                        env_path=spec.env_file,
+                        user=spec.user,
+                        password=token,
+                        pat_role=spec.role,
+                        create=True,
+                    )
+                    entry["pat_written_to"] = str(spec.env_file)
+                elif output == "json":
+                    entry["token"] = token
+                if verify:
+                    verify_connection(user=spec.user, password=token, pat_role=spec.role)
+                entry["status"] = "success"
+            except click.ClickException as e:
+                entry["status"] = "failed"
+                entry["error"] = e.message
+            except OSError as e:
+                entry["status"] = "failed"
+                if token is None:
+                    entry["error"] = str(e)
+                else:
+                    # The PAT exists (and any rotated token is revoked); keep the new one.
+                    entry["error"] = f"Created, but writing {spec.env_file} failed: {e}"
+                    entry["token"] = token
+        report.append(entry)
+
+    failed = [e for e in report if e["status"] != "success"]
+
+    if output == "json":
+        click.echo(json.dumps(report, indent=2))
+    else:
+        click.echo()
+        click.echo("=" * 50)
+        width = max(len(e["user"]) for e in report)
+        for e in report:
+            mark = "✓" if e["status"] == "success" else "✗"
+            detail = e.get("pat_written_to") or e.get("error", "")
+            if e.get("token"):
+                detail += f"\n    New token (store it now, it is not shown again): {e['token']}"
+            click.echo(f"{mark} {e['user']:<{width}}  {e['status']:<8}  {detail}")
+        click.echo("=" * 50)
+        click.echo(f"{len(report) - len(failed)} succeeded, {len(failed)} failed")
+
+    if failed:
+        ctx.exit(1)
+
+
 @cli.command(name="remove")
 @click.option("--user", "-u", envvar="SA_USER", required=True, help="Service account user name")
 @click.option("--db", "-d", envvar="SNOW_UTILS_DB", required=True, help="Database for PAT objects")
@@ -747,6 +1867,8 @@ def remove_command(
     4. Drop service user (if --drop-user)
     5. Clear .env credentials
     """
+    from snow_utils.network import cleanup_network_for_user
+
     click.echo("=" * 50)
     click.echo("Snowflake PAT Manager - Remove")
     click.echo("=" * 50)
@@ -916,17 +2038,10 @@ def verify_command(
         # Verify reading from .env
         pat.py verify --user my_sa --role demo_role --env-path .env
     """
-    if not password:
-        if env_path.exists():
-            content = env_path.read_text()
-            import re
-
-            match = re.search(
-                r'^SA_PAT\s*=\s*["\']?([^"\'#\n]+)["\']?', content, re.MULTILINE
-            )
-            if match:
-                password = match.group(1).strip()
-                click.echo(f"Using token from {env_path}")
+    if not password and env_path.exists():
+        password = read_env_file(env_path).get("SA_PAT")
+        if password:
+            click.echo(f"Using token from {env_path}")
 
     if not password:
         raise click.ClickException(
@@ -948,5 +2063,489 @@ def verify_command(
     click.echo("=" * 50)
 
 
+def print_pat_table(rows: list[dict], source: str, fetched_at: float) -> None:
+    """Print audit rows as a text table."""
+    age = int(time.time() - fetched_at)
+    cached = f", cached {age // 60} min ago" if age >= 60 else ""
+    click.echo(f"{len(rows)} PATs (source: {source}{cached})")
+    if not rows:
+        return
+    headers = ("USER", "PAT", "ROLE", "STATUS", "EXPIRES", "DAYS LEFT")
+    table = [
+        (
+            row["user"],
+            row["name"],
+            row["role_restriction"] or "-",
+            row["status"] or "-",
+            (row["expires_at"] or "-")[:16].replace("T", " "),
+            "-" if row["days_left"] is None else f"{row['days_left']:.1f}",
+        )
+        for row in rows
+    ]
+    widths = [max(len(str(cells[i])) for cells in [headers, *table]) for i in range(len(headers))]
+    click.echo()
+    for cells in [headers, *table]:
+        click.echo("  ".join(str(c).ljust(w) for c, w in zip(cells, widths)).rstrip())
+
+
+@cli.command(name="audit")
+@click.option(
+    "--user", "-u", "users", multiple=True, help="Only these users (repeatable; default: all)"
+)
+@click.option(
+    "--role", "-r", "roles", multiple=True, help="Only PATs restricted to these roles (repeatable)"
+)
+@click.option(
+    "--expiring-within",
+    "-e",
+    default=None,
+    help="Only PATs expiring within this window, e.g. 7d, 12h, 2w",
+)
+@click.option(
+    "--include-expired",
+    is_flag=True,
+    help="With --expiring-within, also list PATs that already expired",
+)
+@click.option(
+    "--source",
+    type=click.Choice(["auto", "account-usage", "show"]),
+    default="auto",
+    show_default=True,
+    help="account-usage: one query (lags up to ~2h); show: SHOW USER PATS per user (live)",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Concurrent SHOW USER PATS queries (default: SNOW_UTILS_MAX_WORKERS or 4)",
+)
+@click.option("--refresh", is_flag=True, help="Re-read PATs instead of using the cached audit")
+@click.option(
+    "--admin-role",
+    "-a",
+    default="accountadmin",
+    help="Role for reading PATs (default: ACCOUNTADMIN)",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Choice(["text", "json", "csv"]),
+    default="text",
+    help="Output format",
+)
+@click.pass_context
+def audit_command(
+    ctx: click.Context,
+    users: tuple[str, ...],
+    roles: tuple[str, ...],
+    expiring_within: str | None,
+    include_expired: bool,
+    source: str,
+    workers: int | None,
+    refresh: bool,
+    admin_role: str,
+    output: str,
+) -> None:
+    """
+    Audit PATs and their expiry across the account.
+
+    Reads every PAT with one ACCOUNT_USAGE query (or SHOW USER PATS per
+    user, concurrently, when that view is not readable or --user is given).
+    Results are cached for SNOW_UTILS_PAT_AUDIT_TTL seconds (default 900);
+    PAT changes made with snow-utils drop the cache. Users whose PATs could
+    not be listed are reported on stderr and the exit code is 1.
+
+    \b
+    Examples:
+        # PATs expiring in the next week, as JSON for alerting
+        pat.py audit --expiring-within 7d -o json
+
+        # Live state of two users' PATs as CSV
+        pat.py audit -u my_sa -u other_sa --source show -o csv
+    """
+    try:
+        window = parse_duration(expiring_within) if expiring_within else None
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--expiring-within")
+
+    records, used, fetched_at, failed = load_pat_audit(
+        list(users), source, admin_role, max_workers=workers, refresh=refresh
+    )
+    if failed:
+        click.echo(
+            f"⚠ Could not list PATs for {len(failed)} users (left out): {', '.join(failed)}",
+            err=True,
+        )
+    now = datetime.now(UTC)
+    records = filter_pat_records(records, roles, window, include_expired, now)
+    rows = []
+    for record in records:
+        days_left = record.days_left(now)
+        row = asdict(record)
+        row["days_left"] = None if days_left is None else round(days_left, 1)
+        rows.append(row)
+
+    if output == "json":
+        click.echo(json.dumps(rows, indent=2))
+    elif output == "csv":
+        import csv
+
+        fieldnames = [f.name for f in fields(PatRecord)] + ["days_left"]
+        writer = csv.DictWriter(click.get_text_stream("stdout"), fieldnames, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        print_pat_table(rows, used, fetched_at)
+
+    if failed:
+        ctx.exit(1)
+
+
+
+@cli.command(name="rotate-many")
+@click.option(
+    "--manifest",
+    "-m",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="YAML/JSON/CSV manifest of PATs to rotate (columns: user, role, pat_name, env_file)",
+)
+@click.option(
+    "--user", "-u", "users", multiple=True, help="Rotate PATs of these users (repeatable)"
+)
+@click.option(
+    "--pattern",
+    "-p",
+    "patterns",
+    multiple=True,
+    help="Only PATs whose user or PAT name matches this glob, e.g. 'CI_*' (repeatable)",
+)
+@click.option(
+    "--expiring-within",
+    "-e",
+    default=None,
+    help="Only PATs expiring within this window, e.g. 7d, 12h, 2w",
+)
+@click.option(
+    "--include-expired",
+    is_flag=True,
+    help="With --expiring-within, also rotate PATs that already expired",
+)
+@click.option(
+    "--role", "-r", envvar="SA_ROLE", default=None, help="Default PAT role for manifest entries"
+)
+@click.option(
+    "--source",
+    type=click.Choice(["auto", "account-usage", "show"]),
+    default="auto",
+    show_default=True,
+    help="Where to list PATs for --user/--pattern/--expiring-within (see 'audit')",
+)
+@click.option(
+    "--env-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Write each token to <env-dir>/<USER>.env when the entry has no env_file",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Concurrent rotations, i.e. the Snowflake concurrency limit "
+    "(default: SNOW_UTILS_MAX_WORKERS or 4)",
+)
+@click.option(
+    "--rate",
+    type=click.FloatRange(min=0),
+    default=0.0,
+    help="Start at most this many rotations per second (default: no limit)",
+)
+@click.option(
+    "--verify-workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Concurrent verification connections (default: --workers)",
+)
+@click.option(
+    "--retries",
+    type=click.IntRange(min=0),
+    default=2,
+    show_default=True,
+    help="Retries per failed rotation or verification",
+)
+@click.option("--skip-verify", is_flag=True, help="Skip connection verification")
+@click.option(
+    "--report",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write a JSON report (per-PAT status, attempts and latency; no tokens)",
+)
+@click.option(
+    "--admin-role",
+    "-a",
+    default="accountadmin",
+    help="Admin role for rotating PATs (default: ACCOUNTADMIN)",
+)
+@click.option("--refresh", is_flag=True, help="Re-list PATs instead of using the cached audit")
+@click.option("--dry-run", is_flag=True, help="List the PATs that would be rotated")
+@click.option(
+    "-o", "--output", type=click.Choice(["text", "json"]), default="text", help="Output format"
+)
+@click.option(
+    "--yes",
+    "-y",
+    is_flag=True,
+    default=False,
+    help="Skip interactive confirmation (required with --output json)",
+)
+@click.pass_context
+def rotate_many_command(
+    ctx: click.Context,
+    manifest: Path | None,
+    users: tuple[str, ...],
+    patterns: tuple[str, ...],
+    expiring_within: str | None,
+    include_expired: bool,
+    role: str | None,
+    source: str,
+    env_dir: Path | None,
+    workers: int | None,
+    rate: float,
+    verify_workers: int | None,
+    retries: int,
+    skip_verify: bool,
+    report: Path | None,
+    admin_role: str,
+    refresh: bool,
+    dry_run: bool,
+    output: str,
+    yes: bool,
+) -> None:
+    """
+    Rotate many PATs concurrently.
+
+    PATs are selected from a manifest and/or the account's PAT list
+    (--user, --pattern, --expiring-within; see 'audit'). Rotations run
+    --workers at a time, each new token is written to its .env file and
+    verified on a separate pool while the remaining rotations continue.
+    Failed items are retried; a report with per-PAT latency is written
+    with --report.
+
+    \b
+    Manifest (YAML):
+        pats:
+          - user: CI_APP1_SA
+            role: CI_ROLE
+            env_file: app1/.env
+
+    \b
+    Examples:
+        # Quarterly rotation of everything expiring within two weeks
+        pat.py rotate-many -e 14d --env-dir envs/ --workers 8 --report rotation.json
+
+        # Manifest-driven, at most 2 rotations per second
+        pat.py rotate-many -m pats.yaml --rate 2 --yes
+    """
+    import fnmatch
+
+    if not (manifest or users or patterns or expiring_within):
+        raise click.UsageError(
+            "Select PATs with --manifest, --user, --pattern and/or --expiring-within"
+        )
+    if output == "json" and not dry_run and not yes:
+        # JSON output cannot prompt, and rotation revokes the current tokens.
+        raise click.UsageError("--output json rotates without confirmation; pass --yes")
+    try:
+        window = parse_duration(expiring_within) if expiring_within else None
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--expiring-within")
+
+    targets: list[RotationTarget] = []
+    if manifest:
+        rows = load_manifest(manifest, key="pats")
+        if not rows:
+            raise click.ClickException(f"Manifest {manifest} has no entries")
+        for number, row in enumerate(rows, 1):
+            user = row.get("user")
+            entry_role = row.get("role") or role
+            if not user or not entry_role:
+                raise click.ClickException(
+                    f"Manifest entry {number} needs user and role (role may come from --role)"
+                )
+            env_file = row.get("env_file")
+            targets.append(
+                RotationTarget(
+                    user=user.upper(),
+                    pat_name=(row.get("pat_name") or f"{user}_pat").upper(),
+                    role=entry_role,
+                    env_file=Path(env_file) if env_file else None,
+                )
+            )
+
+    if window is not None or not manifest:
+        listed_users = list(users) or sorted({t.user for t in targets})
+        records, _, _, failed = load_pat_audit(
+            listed_users, source, admin_role, max_workers=workers, refresh=refresh
+        )
+        if failed:
+            click.echo(
+                f"⚠ Could not list PATs for {len(failed)} users (not rotated): {', '.join(failed)}",
+                err=True,
+            )
+        records = filter_pat_records(records, (), window, include_expired)
+        if manifest:
+            keep = {(r.user, r.name.upper()) for r in records}
+            targets = [t for t in targets if (t.user, t.pat_name) in keep]
+        else:
+            targets = [
+                RotationTarget(r.user, r.name.upper(), r.role_restriction or role or "")
+                for r in records
+            ]
+
+    if users:
+        wanted = {u.upper() for u in users}
+        targets = [t for t in targets if t.user in wanted]
+    if patterns:
+        globs = [p.upper() for p in patterns]
+        targets = [
+            t
+            for t in targets
+            if any(fnmatch.fnmatch(name, g) for g in globs for name in (t.user, t.pat_name))
+        ]
+
+    for target in targets:
+        if target.env_file is None and env_dir:
+            target.env_file = env_dir / f"{target.user}.env"
+        if not target.role:
+            raise click.ClickException(
+                f"PAT {target.pat_name} of {target.user} has no role restriction; pass --role"
+            )
+    counts = Counter((t.user, t.pat_name) for t in targets)
+    duplicates = sorted(f"{u}.{n}" for (u, n), count in counts.items() if count > 1)
+    if duplicates:
+        raise click.ClickException(f"Duplicate PATs selected: {', '.join(duplicates)}")
+    counts = Counter(t.env_file.resolve() for t in targets if t.env_file)
+    shared = sorted(str(path) for path, count in counts.items() if count > 1)
+    if shared:
+        raise click.ClickException(f"Several PATs would be written to {shared[0]}")
+
+    if not targets:
+        if output == "json":
+            click.echo("[]")
+        else:
+            click.echo("No PATs match the selection")
+        return
+
+    if output == "text" and not dry_run:
+        missing = [t.user for t in targets if t.env_file is None]
+        if missing:
+            raise click.ClickException(
+                f"{len(missing)} PATs have no env_file (e.g. {missing[0]}). "
+                "Set env_file per entry, pass --env-dir, or use --output json."
+            )
+
+    workers = min(workers or default_max_workers(), len(targets))
+    if dry_run:
+        rows = [
+            {
+                "status": "dry_run",
+                "user": t.user,
+                "pat_name": t.pat_name,
+                "pat_role": t.role,
+                "env_file": str(t.env_file) if t.env_file else None,
+            }
+            for t in targets
+        ]
+        if output == "json":
+            click.echo(json.dumps(rows, indent=2))
+            return
+        click.echo(f"PATs that would be rotated ({len(targets)}, {workers} at a time):")
+        width = max(len(t.user) for t in targets)
+        name_width = max(len(t.pat_name) for t in targets)
+        for t in targets:
+            click.echo(
+                f"  {t.user:<{width}}  {t.pat_name:<{name_width}}  role {t.role:<12} "
+                f"-> {t.env_file or '(token in JSON output)'}"
+            )
+        return
+
+    if output == "text":
+        click.echo("=" * 50)
+        click.echo("Snowflake PAT Manager - Rotate Many")
+        click.echo("=" * 50)
+        click.echo(f"PATs:     {len(targets)}")
+        click.echo(f"Workers:  {workers}" + (f" (max {rate:g}/s)" if rate else ""))
+        click.echo(f"Verify:   {'no' if skip_verify else 'yes'}")
+        click.echo()
+        if not yes and not click.confirm(
+            "Rotate these PATs? Current tokens stop working immediately.", default=False
+        ):
+            click.echo("Aborted.")
+            return
+
+    width = max(len(t.user) for t in targets)
+
+    def progress(entry: dict) -> None:
+        if output != "text":
+            return
+        mark = "✗" if entry["status"] == "failed" else "✓"
+        detail = entry.get("error") or entry.get("pat_written_to", "")
+        if entry.get("token"):
+            detail += f"\n    New token (store it now, it is not shown again): {entry['token']}"
+        click.echo(
+            f"{mark} {entry['user']:<{width}}  {entry['status']:<8} "
+            f"{entry['latency_s']['total']:>6.1f}s  {detail}"
+        )
+
+    started = time.monotonic()
+    started_at = datetime.now(UTC).isoformat()
+    results = rotate_pats(
+        targets,
+        admin_role=admin_role,
+        workers=workers,
+        rate=rate,
+        retries=retries,
+        verify=not skip_verify,
+        verify_workers=verify_workers,
+        include_tokens=output == "json",
+        on_done=progress,
+    )
+    elapsed = time.monotonic() - started
+    failed = [e for e in results if e["status"] == "failed"]
+
+    if report:
+        totals = sorted(e["latency_s"]["total"] for e in results)
+        summary = {
+            "started_at": started_at,
+            "elapsed_s": round(elapsed, 3),
+            "workers": workers,
+            "rate": rate or None,
+            "total": len(results),
+            "succeeded": len(results) - len(failed),
+            "failed": len(failed),
+            "latency_s": {
+                "p50": totals[len(totals) // 2],
+                "p95": totals[min(len(totals) - 1, int(len(totals) * 0.95))],
+                "max": totals[-1],
+            },
+        }
+        items = [{k: v for k, v in e.items() if k != "token"} for e in results]
+        report.parent.mkdir(parents=True, exist_ok=True)
+        report.write_text(json.dumps({"summary": summary, "items": items}, indent=2))
+
+    if output == "json":
+        click.echo(json.dumps(results, indent=2))
+    else:
+        click.echo("=" * 50)
+        click.echo(
+            f"{len(results) - len(failed)} succeeded, {len(failed)} failed in {elapsed:.1f}s"
+        )
+        if report:
+            click.echo(f"Report written to {report}")
+
+    if failed:
+        ctx.exit(1)
+
+
 if __name__ == "__main__":
     cli()
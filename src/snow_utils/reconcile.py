@@ -0,0 +1,1054 @@
+#!/usr/bin/env python3
+# Copyright 2026 Snowflake Inc.
+# Generated with Cortex Code
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Declarative desired state: ``snow-utils plan`` and ``snow-utils apply``.
+
+A state file (YAML or JSON) declares the objects snow-utils manages:
+
+\b
+    admin_role: ACCOUNTADMIN
+    service_users:        # role, user, network rule/policy, PAT auth policy
+      - {user: ci_sa, role: ci_role, db: ci_db, cidrs: "1.2.3.4/32"}
+    network_rules:
+      - {name: egress_api, db: ci_db, mode: EGRESS, type: HOST_PORT,
+         values: "api.example.com:443"}
+    network_policies:
+      - {name: ci_policy, rules: "CI_DB.NETWORKS.EGRESS_API"}
+    external_volumes:     # Snowflake side only; AWS is left to extvolume
+      - {name: ci_vol, bucket: ci-bucket, role_arn: "arn:aws:iam::...",
+         external_id: ci_ext_id}
+
+``plan`` reads the live state in bulk (one SHOW per object kind and schema,
+then DESC/SHOW probes for the objects that exist, run concurrently) and
+lists only the statements needed to converge: missing objects are created,
+rule values are added/removed individually, comments and policy rule lists
+are altered in place, and objects that already match cost nothing.
+``apply`` runs those statements as one script, so a converged account sees
+no writes at all.
+
+Objects missing from the state file are left alone, and PATs are not
+managed (tokens are secrets; use ``pat create`` / ``pat create-many``).
+"""
+
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import click
+from dotenv import load_dotenv
+from snow_utils_common import (
+    NetworkRuleMode,
+    NetworkRuleType,
+    StepGraph,
+    get_inventory,
+    load_manifest_document,
+    manifest_entries,
+    run_snow_sql_stdin,
+    set_snow_cli_options,
+    setup_tracing,
+    split_list_value,
+    validate_mode_type,
+)
+
+from snow_utils.network import (
+    _parse_name_list,
+    _user_rule_values,
+    diff_rule_values,
+    get_incremental_update_network_rule_sql,
+    get_max_values_per_rule,
+    get_network_policy_sql,
+    get_network_rule_sql,
+    get_network_rule_values,
+    get_policy_rule_refs,
+    get_set_network_policy_rules_sql,
+    get_update_network_rule_sql,
+    get_user_network_comment,
+)
+from snow_utils.pat import (
+    format_comment,
+    get_auth_policy_ddl,
+    get_auth_policy_name,
+    infer_comment_prefix,
+)
+
+load_dotenv()
+
+SECTIONS = ("service_users", "network_rules", "network_policies", "external_volumes")
+
+# Changes are applied in this order: grantees before grants, schemas and rules
+# before the policies that reference them, policies before their assignment.
+PHASES = (
+    "role",
+    "user",
+    "grant",
+    "schema",
+    "detach",
+    "rule",
+    "policy",
+    "network_policy_assignment",
+    "auth_policy",
+    "auth_policy_assignment",
+    "volume",
+)
+
+
+# =============================================================================
+# Desired state
+# =============================================================================
+
+
+@dataclass
+class RuleState:
+    """A network rule as declared (or derived from a service user)."""
+
+    name: str
+    db: str
+    schema: str
+    values: list[str]
+    mode: str = "INGRESS"
+    type: str = "IPV4"
+    comment: str | None = None
+
+    @property
+    def scope(self) -> str:
+        return f"{self.db}.{self.schema}"
+
+    @property
+    def fqn(self) -> str:
+        return f"{self.scope}.{self.name}"
+
+
+@dataclass
+class PolicyState:
+    """A network policy and the fully qualified rules it allows."""
+
+    name: str
+    rules: list[str]
+    comment: str | None = None
+
+
+@dataclass
+class UserState:
+    """A PAT service user with its role and authentication policy."""
+
+    user: str
+    role: str
+    db: str
+    comment_prefix: str
+    network_policy: str | None = None
+    default_expiry_days: int = 15
+    max_expiry_days: int = 365
+
+
+@dataclass
+class VolumeState:
+    """The Snowflake side of an external volume."""
+
+    name: str
+    bucket: str
+    role_arn: str
+    external_id: str
+    storage_location: str
+    allow_writes: bool = True
+    comment: str = ""
+
+
+@dataclass
+class DesiredState:
+    """Everything a state file declares, with service users expanded."""
+
+    admin_role: str = "ACCOUNTADMIN"
+    users: list[UserState] = field(default_factory=list)
+    rules: list[RuleState] = field(default_factory=list)
+    policies: list[PolicyState] = field(default_factory=list)
+    volumes: list[VolumeState] = field(default_factory=list)
+
+
+def _flag(value: Any, default: bool) -> bool:
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() not in ("false", "no", "0", "off")
+
+
+def _int(row: dict, key: str, default: int, where: str) -> int:
+    try:
+        return int(row.get(key, default))
+    except (TypeError, ValueError):
+        raise click.ClickException(f"{where}: '{key}' must be a whole number of days")
+
+
+def _require(row: dict, keys: tuple[str, ...], where: str) -> None:
+    missing = [k for k in keys if not row.get(k)]
+    if missing:
+        raise click.ClickException(f"{where}: missing {', '.join(missing)}")
+
+
+def _rule_values(row: dict, where: str) -> list[str]:
+    values = list(dict.fromkeys(split_list_value(row.get("values"))))
+    if not values:
+        raise click.ClickException(f"{where}: 'values' is empty")
+    return values
+
+
+def load_desired_state(path: str | Path) -> DesiredState:
+    """
+    Load and validate a state file.
+
+    Each service user expands to the objects ``pat create`` provisions: its
+    network rule (sharded above SNOW_UTILS_MAX_RULE_VALUES CIDRs) and
+    network policy in ``<db>.NETWORKS`` and its authentication policy in
+    ``<db>.POLICIES``.
+
+    Raises:
+        click.ClickException: If the file is malformed or declares an object twice
+    """
+    document = load_manifest_document(path)
+    if not isinstance(document, dict):
+        raise click.ClickException(
+            f"State file {path} must be a mapping with any of: {', '.join(SECTIONS)}"
+        )
+    unknown = sorted(set(document) - {*SECTIONS, "admin_role"})
+    if unknown:
+        raise click.ClickException(f"State file {path}: unknown section(s) {', '.join(unknown)}")
+
+    state = DesiredState(admin_role=str(document.get("admin_role") or "ACCOUNTADMIN").upper())
+    sections = {s: manifest_entries(document, path, s) if document.get(s) else [] for s in SECTIONS}
+
+    for number, row in enumerate(sections["service_users"], 1):
+        where = f"service_users[{number}]"
+        _require(row, ("user", "role", "db"), where)
+        user, role, db = (str(row[k]).upper() for k in ("user", "role", "db"))
+        comment_prefix = str(row.get("comment") or infer_comment_prefix(user))
+        spec = UserState(
+            user=user,
+            role=role,
+            db=db,
+            comment_prefix=comment_prefix,
+            default_expiry_days=_int(row, "default_expiry_days", 15, where),
+            max_expiry_days=_int(row, "max_expiry_days", 365, where),
+        )
+        if _flag(row.get("network"), True):
+            cidrs = list(dict.fromkeys(split_list_value(row.get("cidrs"))))
+            if not cidrs:
+                raise click.ClickException(
+                    f"{where}: 'cidrs' is required (PATs need a network policy), "
+                    "or set network: false"
+                )
+            comment = get_user_network_comment(user, db, comment_prefix)
+            rules = _user_rule_values(user, cidrs)
+            for rule_name, values in rules.items():
+                state.rules.append(RuleState(rule_name, db, "NETWORKS", values, comment=comment))
+            spec.network_policy = f"{user}_NETWORK_POLICY"
+            refs = [f"{db}.NETWORKS.{rule_name}" for rule_name in rules]
+            state.policies.append(PolicyState(spec.network_policy, refs, comment))
+        state.users.append(spec)
+
+    for number, row in enumerate(sections["network_rules"], 1):
+        where = f"network_rules[{number}]"
+        _require(row, ("name", "db"), where)
+        mode = str(row.get("mode") or "INGRESS").upper()
+        rule_type = str(row.get("type") or "IPV4").upper()
+        try:
+            valid = validate_mode_type(NetworkRuleMode(mode), NetworkRuleType(rule_type))
+        except ValueError:
+            valid = False
+        if not valid:
+            raise click.ClickException(f"{where}: invalid mode/type {mode}/{rule_type}")
+        values = _rule_values(row, where)
+        if len(values) > get_max_values_per_rule():
+            raise click.ClickException(
+                f"{where}: {len(values)} values exceed the {get_max_values_per_rule()} "
+                "per rule; split them across rules"
+            )
+        state.rules.append(
+            RuleState(
+                name=str(row["name"]).upper(),
+                db=str(row["db"]).upper(),
+                schema=str(row.get("schema") or "NETWORKS").upper(),
+                values=values,
+                mode=mode,
+                type=rule_type,
+                comment=row.get("comment"),
+            )
+        )
+
+    for number, row in enumerate(sections["network_policies"], 1):
+        where = f"network_policies[{number}]"
+        _require(row, ("name", "rules"), where)
+        refs = [ref.upper() for ref in split_list_value(row["rules"])]
+        state.policies.append(PolicyState(str(row["name"]).upper(), refs, row.get("comment")))
+
+    for number, row in enumerate(sections["external_volumes"], 1):
+        where = f"external_volumes[{number}]"
+        _require(row, ("name", "bucket", "role_arn", "external_id"), where)
+        state.volumes.append(
+            VolumeState(
+                name=str(row["name"]).upper(),
+                bucket=str(row["bucket"]),
+                role_arn=str(row["role_arn"]),
+                external_id=str(row["external_id"]),
+                storage_location=str(row.get("storage_location") or row["bucket"]),
+                allow_writes=_flag(row.get("allow_writes"), True),
+                comment=str(row.get("comment") or ""),
+            )
+        )
+
+    for kind, names in (
+        ("service user", [u.user for u in state.users]),
+        ("network rule", [r.fqn for r in state.rules]),
+        ("network policy", [p.name for p in state.policies]),
+        ("external volume", [v.name for v in state.volumes]),
+    ):
+        duplicates = sorted({n for n in names if names.count(n) > 1})
+        if duplicates:
+            raise click.ClickException(
+                f"State file {path} declares {kind} {', '.join(duplicates)} more than once"
+            )
+    return state
+
+
+# =============================================================================
+# Live state
+# =============================================================================
+
+
+@dataclass
+class LiveState:
+    """What Snowflake currently has, restricted to the declared objects.
+
+    Probe results are None when the probe failed, which the planner treats
+    as "unknown" and converges unconditionally.
+    """
+
+    scopes: set[str] = field(default_factory=set)  # schemas SHOW listed anything in
+    roles: set[str] = field(default_factory=set)
+    users: set[str] = field(default_factory=set)
+    rules: dict[str, dict] = field(default_factory=dict)  # FQN -> SHOW row
+    policies: dict[str, dict] = field(default_factory=dict)
+    auth_policies: dict[str, dict] = field(default_factory=dict)  # FQN -> SHOW row
+    volumes: dict[str, dict] = field(default_factory=dict)
+    rule_values: dict[str, list[str] | None] = field(default_factory=dict)
+    policy_rules: dict[str, list[str] | None] = field(default_factory=dict)
+    role_grants: dict[str, set[tuple[str, str]] | None] = field(default_factory=dict)
+    user_network_policy: dict[str, str | None] = field(default_factory=dict)
+    user_auth_policies: dict[str, list[str] | None] = field(default_factory=dict)
+    auth_policy_props: dict[str, dict[str, str] | None] = field(default_factory=dict)
+
+
+def _name(row: dict) -> str:
+    return str(row.get("name", "")).upper()
+
+
+def _row_fqn(row: dict) -> str:
+    parts = (row.get("database_name"), row.get("schema_name"), row.get("name"))
+    return ".".join(str(p) for p in parts if p).upper()
+
+
+def fetch_live_state(
+    desired: DesiredState, admin_role: str, max_workers: int | None = None
+) -> LiveState:
+    """
+    Read the live state of every declared object.
+
+    One SHOW per object kind (per schema for rules and authentication
+    policies) finds which objects exist; DESC/SHOW probes for details then
+    run only for objects that exist, each as soon as its SHOW has finished.
+    """
+    inventory = get_inventory()
+    live = LiveState()
+    graph = StepGraph(max_workers)
+
+    def show(kind: str, scope: str | None = None) -> list[dict]:
+        # A declared schema may not exist yet; any other failed SHOW must not
+        # read as "no objects", or the plan would recreate existing ones.
+        rows = list(inventory.iter_show(kind, scope, role=admin_role, missing_ok=bool(scope)))
+        if scope and rows:
+            live.scopes.add(scope)
+        return rows
+
+    def query(kind: str, sql: str) -> list[dict] | None:
+        return inventory.query(kind, sql, role=admin_role)
+
+    # Network rules: SHOW per schema, then DESC those whose mode/type match.
+    for scope in dict.fromkeys(r.scope for r in desired.rules):
+        wanted = {r.fqn for r in desired.rules if r.scope == scope}
+
+        def show_rules(scope: str = scope, wanted: set[str] = wanted) -> None:
+            for row in show("NETWORK RULE", scope):
+                if f"{scope}.{_name(row)}" in wanted:
+                    live.rules[f"{scope}.{_name(row)}"] = row
+
+        graph.add(f"SHOW NETWORK RULES IN {scope}", show_rules)
+
+    for r in desired.rules:
+
+        def desc_rule(r: RuleState = r) -> None:
+            row = live.rules.get(r.fqn)
+            if row is not None and _same_mode_type(row, r):
+                live.rule_values[r.fqn] = get_network_rule_values(
+                    r.name, r.db, r.schema, admin_role=admin_role
+                )
+
+        graph.add(
+            f"DESC NETWORK RULE {r.fqn}", desc_rule, deps=[f"SHOW NETWORK RULES IN {r.scope}"]
+        )
+
+    # Network policies
+    if desired.policies:
+        wanted_policies = {p.name for p in desired.policies}
+
+        def show_policies() -> None:
+            for row in show("NETWORK POLICY"):
+                if _name(row) in wanted_policies:
+                    live.policies[_name(row)] = row
+
+        graph.add("SHOW NETWORK POLICIES", show_policies)
+        for p in desired.policies:
+
+            def desc_policy(name: str = p.name) -> None:
+                if name in live.policies:
+                    live.policy_rules[name] = get_policy_rule_refs(name, admin_role=admin_role)
+
+            graph.add(f"DESC NETWORK POLICY {p.name}", desc_policy, deps=["SHOW NETWORK POLICIES"])
+
+    # Roles, users and authentication policies of service users
+    if desired.users:
+        roles = {u.role for u in desired.users}
+        users = {u.user for u in desired.users}
+
+        def show_roles() -> None:
+            live.roles.update(_name(row) for row in show("ROLE") if _name(row) in roles)
+
+        def show_users() -> None:
+            live.users.update(_name(row) for row in show("USER") if _name(row) in users)
+
+        graph.add("SHOW ROLES", show_roles)
+        graph.add("SHOW USERS", show_users)
+
+        for role in sorted(roles):
+
+            def role_grants(role: str = role) -> None:
+                if role not in live.roles:
+                    return
+                rows = query("ROLE", f"SHOW GRANTS OF ROLE {role}")
+                live.role_grants[role] = (
+                    None
+                    if rows is None
+                    else {
+                        (
+                            str(g.get("granted_to", "")).upper(),
+                            str(g.get("grantee_name", "")).upper(),
+                        )
+                        for g in rows
+                    }
+                )
+
+            graph.add(f"SHOW GRANTS OF ROLE {role}", role_grants, deps=["SHOW ROLES"])
+
+        for scope in dict.fromkeys(f"{u.db}.POLICIES" for u in desired.users):
+
+            def show_auth_policies(scope: str = scope) -> None:
+                for row in show("AUTHENTICATION POLICY", scope):
+                    live.auth_policies[f"{scope}.{_name(row)}"] = row
+
+            graph.add(f"SHOW AUTHENTICATION POLICIES IN {scope}", show_auth_policies)
+
+        for u in desired.users:
+            fqn = get_auth_policy_name(u.user, u.db)
+
+            def desc_auth_policy(fqn: str = fqn) -> None:
+                if fqn in live.auth_policies:
+                    rows = query("AUTHENTICATION POLICY", f"DESC AUTHENTICATION POLICY {fqn}")
+                    live.auth_policy_props[fqn] = (
+                        None
+                        if rows is None
+                        else {
+                            str(p.get("property", "")).upper(): str(p.get("value") or "")
+                            for p in rows
+                        }
+                    )
+
+            def user_network_policy(u: UserState = u) -> None:
+                if u.user in live.users:
+                    rows = query("USER", f"SHOW PARAMETERS LIKE 'NETWORK_POLICY' IN USER {u.user}")
+                    value = rows[0].get("value") if rows else None
+                    live.user_network_policy[u.user] = str(value or "").upper() or None
+
+            def user_auth_policies(u: UserState = u) -> None:
+                if u.user in live.users:
+                    rows = query(
+                        "AUTHENTICATION POLICY", f"SHOW AUTHENTICATION POLICIES ON USER {u.user}"
+                    )
+                    live.user_auth_policies[u.user] = (
+                        None if rows is None else [_row_fqn(row) for row in rows]
+                    )
+
+            graph.add(
+                f"DESC AUTHENTICATION POLICY {fqn}",
+                desc_auth_policy,
+                deps=[f"SHOW AUTHENTICATION POLICIES IN {u.db}.POLICIES"],
+            )
+            if u.network_policy:
+                graph.add(
+                    f"SHOW NETWORK_POLICY IN USER {u.user}",
+                    user_network_policy,
+                    deps=["SHOW USERS"],
+                )
+            graph.add(
+                f"SHOW AUTHENTICATION POLICIES ON USER {u.user}",
+                user_auth_policies,
+                deps=["SHOW USERS"],
+            )
+
+    # External volumes
+    if desired.volumes:
+        wanted_volumes = {v.name for v in desired.volumes}
+
+        def show_volumes() -> None:
+            for row in show("EXTERNAL VOLUME"):
+                if _name(row) in wanted_volumes:
+                    live.volumes[_name(row)] = row
+
+        graph.add("SHOW EXTERNAL VOLUMES", show_volumes)
+
+    graph.run()
+    return live
+
+
+# =============================================================================
+# Planning
+# =============================================================================
+
+
+@dataclass
+class Change:
+    """One object whose live state differs from the desired state."""
+
+    kind: str
+    name: str
+    action: str  # create, update or replace
+    phase: str
+    statements: list[str]
+    details: list[str] = field(default_factory=list)
+
+
+@dataclass
+class Plan:
+    """Ordered changes, plus how many declared objects already match."""
+
+    changes: list[Change]
+    in_sync: int
+
+    @property
+    def statements(self) -> list[str]:
+        return [s for change in self.changes for s in change.statements]
+
+
+def _same_mode_type(row: dict, rule: RuleState) -> bool:
+    return (str(row.get("mode", "")).upper(), str(row.get("type", "")).upper()) == (
+        rule.mode,
+        rule.type,
+    )
+
+
+def _comment_drift(row: dict, comment: str | None) -> bool:
+    return comment is not None and (row.get("comment") or "") != comment
+
+
+def _truthy(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("true", "yes", "1", "on")
+
+
+def _auth_policy_drift(row: dict, props: dict[str, str] | None, user: UserState) -> list[str]:
+    """What differs between a live authentication policy and get_auth_policy_ddl."""
+    if props is None:
+        return ["properties unknown"]
+    details = []
+    if _comment_drift(row, format_comment(user.comment_prefix)):
+        details.append("comment")
+    methods = [m.upper() for m in _parse_name_list(props.get("AUTHENTICATION_METHODS", ""))]
+    if methods != ["PROGRAMMATIC_ACCESS_TOKEN"]:
+        details.append(f"authentication_methods: {', '.join(methods) or '(all)'}")
+    pat_policy = props.get("PAT_POLICY", "")
+    for key, wanted in (
+        ("DEFAULT_EXPIRY_IN_DAYS", user.default_expiry_days),
+        ("MAX_EXPIRY_IN_DAYS", user.max_expiry_days),
+    ):
+        match = re.search(rf"{key}\W*(\d+)", pat_policy, re.IGNORECASE)
+        current = int(match.group(1)) if match else None
+        if current != wanted:
+            details.append(f"{key.lower()}: {current} -> {wanted}")
+    if "ENFORCED_REQUIRED" not in pat_policy.upper():
+        details.append("network_policy_evaluation")
+    return details
+
+
+def plan_changes(desired: DesiredState, live: LiveState) -> Plan:
+    """
+    Compute the minimal statements that converge ``live`` to ``desired``.
+
+    Pure: reads nothing from Snowflake. Changes come back in PHASES order.
+    """
+    changes: list[Change] = []
+    in_sync = 0
+
+    def add(kind: str, name: str, action: str, phase: str, statements: list[str], *details):
+        changes.append(Change(kind, name, action, phase, statements, list(details)))
+
+    schemas: set[str] = set()
+    databases = {scope.split(".")[0] for scope in live.scopes}
+
+    def ensure_schema(scope: str) -> None:
+        # A schema SHOW listed objects in exists; others are created if needed.
+        if scope in live.scopes or scope in schemas:
+            return
+        schemas.add(scope)
+        db = scope.split(".")[0]
+        statements = [] if db in databases else [f"CREATE DATABASE IF NOT EXISTS {db};"]
+        databases.add(db)
+        add(
+            "SCHEMA",
+            scope,
+            "create",
+            "schema",
+            [*statements, f"CREATE SCHEMA IF NOT EXISTS {scope};"],
+        )
+
+    # Roles, users and role grants
+    roles = {u.role: u.comment_prefix for u in reversed(desired.users)}
+    for role, comment_prefix in sorted(roles.items()):
+        grants: set[tuple[str, str]] | None = set()
+        if role in live.roles:
+            in_sync += 1
+            grants = live.role_grants.get(role)
+        else:
+            comment = format_comment(comment_prefix)
+            add(
+                "ROLE",
+                role,
+                "create",
+                "role",
+                [f"CREATE ROLE IF NOT EXISTS {role} COMMENT = '{comment}';"],
+            )
+        wanted = [("ROLE", "SYSADMIN")] + [
+            ("USER", u.user) for u in desired.users if u.role == role
+        ]
+        for grantee in wanted:
+            if grants is None or grantee not in grants:
+                name = f"{role} TO {grantee[0]} {grantee[1]}"
+                add("GRANT", name, "create", "grant", [f"GRANT ROLE {name};"])
+
+    for u in desired.users:
+        if u.user in live.users:
+            in_sync += 1
+        else:
+            comment = format_comment(u.comment_prefix)
+            add(
+                "USER",
+                u.user,
+                "create",
+                "user",
+                [f"CREATE USER IF NOT EXISTS {u.user} TYPE = SERVICE COMMENT = '{comment}';"],
+            )
+
+    # Network rules: create, replace on a mode/type change, else alter in place.
+    replaced: set[str] = set()
+    for r in desired.rules:
+        create_sql = get_network_rule_sql(
+            r.name,
+            r.db,
+            r.schema,
+            r.values,
+            NetworkRuleMode(r.mode),
+            NetworkRuleType(r.type),
+            comment=r.comment or "",
+        )
+        row = live.rules.get(r.fqn)
+        if row is None:
+            ensure_schema(r.scope)
+            add("NETWORK RULE", r.fqn, "create", "rule", [create_sql], f"values: {len(r.values)}")
+            continue
+        if not _same_mode_type(row, r):
+            replaced.add(r.fqn)
+            current = f"{row.get('mode')}/{row.get('type')}"
+            add(
+                "NETWORK RULE",
+                r.fqn,
+                "replace",
+                "rule",
+                [create_sql],
+                f"mode/type: {current} -> {r.mode}/{r.type}",
+            )
+            continue
+
+        statements, details = [], []
+        current_values = live.rule_values.get(r.fqn)
+        if current_values is None:
+            statements.append(get_update_network_rule_sql(r.name, r.db, r.schema, r.values))
+            details.append(f"values: unknown -> {len(r.values)}")
+        else:
+            added, removed = diff_rule_values(current_values, r.values)
+            if added or removed:
+                statements.append(
+                    get_incremental_update_network_rule_sql(r.name, r.db, r.schema, added, removed)
+                )
+                details.append(f"values: +{len(added)} -{len(removed)}")
+        if _comment_drift(row, r.comment):
+            statements.append(f"ALTER NETWORK RULE {r.fqn} SET COMMENT = '{r.comment}';")
+            details.append("comment")
+        if statements:
+            add("NETWORK RULE", r.fqn, "update", "rule", statements, *details)
+        else:
+            in_sync += 1
+
+    # Network policies. A rule is replaced only while no policy references it,
+    # so policies holding a replaced rule drop it first and get it back after.
+    for p in desired.policies:
+        row = live.policies.get(p.name)
+        if row is None:
+            add(
+                "NETWORK POLICY",
+                p.name,
+                "create",
+                "policy",
+                [get_network_policy_sql(p.name, p.rules, comment=p.comment or "")],
+            )
+            continue
+        current = live.policy_rules.get(p.name)
+        kept = [ref for ref in current or [] if ref.upper() not in replaced]
+        if current is not None and len(kept) < len(current):
+            add(
+                "NETWORK POLICY",
+                p.name,
+                "update",
+                "detach",
+                [get_set_network_policy_rules_sql(p.name, kept)],
+                "detach rules being replaced",
+            )
+
+        statements, details = [], []
+        if current is None:
+            statements.append(get_set_network_policy_rules_sql(p.name, p.rules))
+            details.append(f"rules: unknown -> {len(p.rules)}")
+        elif sorted(ref.upper() for ref in current) != sorted(p.rules):
+            statements.append(get_set_network_policy_rules_sql(p.name, p.rules))
+            details.append(f"rules: {len(current)} -> {len(p.rules)}")
+        elif len(kept) < len(current):
+            statements.append(get_set_network_policy_rules_sql(p.name, p.rules))
+            details.append("reattach replaced rules")
+        if _comment_drift(row, p.comment):
+            statements.append(f"ALTER NETWORK POLICY {p.name} SET COMMENT = '{p.comment}';")
+            details.append("comment")
+        if statements:
+            add("NETWORK POLICY", p.name, "update", "policy", statements, *details)
+        else:
+            in_sync += 1
+
+    # Service user policy assignments and authentication policies
+    for u in desired.users:
+        exists = u.user in live.users
+        if u.network_policy:
+            current = live.user_network_policy.get(u.user) if exists else None
+            if current != u.network_policy:
+                add(
+                    "USER",
+                    u.user,
+                    "update",
+                    "network_policy_assignment",
+                    [f"ALTER USER {u.user} SET NETWORK_POLICY = '{u.network_policy}';"],
+                    f"network_policy: {current or '(none)'} -> {u.network_policy}",
+                )
+
+        fqn = get_auth_policy_name(u.user, u.db).upper()
+        ddl = get_auth_policy_ddl(
+            u.user, u.db, u.default_expiry_days, u.max_expiry_days, u.comment_prefix
+        )
+        row = live.auth_policies.get(fqn)
+        if row is None:
+            ensure_schema(f"{u.db}.POLICIES")
+            add("AUTHENTICATION POLICY", fqn, "create", "auth_policy", [ddl])
+        else:
+            drift = _auth_policy_drift(row, live.auth_policy_props.get(fqn), u)
+            if drift:
+                add("AUTHENTICATION POLICY", fqn, "update", "auth_policy", [ddl], *drift)
+            else:
+                in_sync += 1
+
+        attached = live.user_auth_policies.get(u.user) if exists else []
+        if attached is None or fqn not in attached:
+            statements = [f"ALTER USER {u.user} SET AUTHENTICATION POLICY {fqn};"]
+            if attached is None or attached:
+                statements.insert(0, f"ALTER USER {u.user} UNSET AUTHENTICATION POLICY;")
+            add(
+                "USER",
+                u.user,
+                "update",
+                "auth_policy_assignment",
+                statements,
+                f"authentication_policy: {', '.join(attached or []) or '(none)'} -> {fqn}",
+            )
+
+    # External volumes (storage locations are fixed at creation)
+    for v in desired.volumes:
+        row = live.volumes.get(v.name)
+        if row is None:
+            from snow_utils.extvolume import ExternalVolumeConfig, get_external_volume_sql
+
+            config = ExternalVolumeConfig(
+                bucket_name=v.bucket,
+                role_name="",
+                policy_name="",
+                volume_name=v.name,
+                storage_location_name=v.storage_location,
+                external_id=v.external_id,
+                aws_region="",
+                allow_writes=v.allow_writes,
+                comment=v.comment,
+            )
+            add(
+                "EXTERNAL VOLUME",
+                v.name,
+                "create",
+                "volume",
+                [get_external_volume_sql(config, v.role_arn)],
+            )
+            continue
+        statements, details = [], []
+        if _truthy(row.get("allow_writes")) != v.allow_writes:
+            statements.append(
+                f"ALTER EXTERNAL VOLUME {v.name} SET ALLOW_WRITES = {str(v.allow_writes).upper()};"
+            )
+            details.append(f"allow_writes -> {v.allow_writes}")
+        if v.comment and _comment_drift(row, v.comment):
+            statements.append(f"ALTER EXTERNAL VOLUME {v.name} SET COMMENT = '{v.comment}';")
+            details.append("comment")
+        if statements:
+            add("EXTERNAL VOLUME", v.name, "update", "volume", statements, *details)
+        else:
+            in_sync += 1
+
+    changes.sort(key=lambda change: PHASES.index(change.phase))
+    return Plan(changes, in_sync)
+
+
+def get_apply_script(plan: Plan, admin_role: str) -> str:
+    """The plan's statements as one script run with ``admin_role``."""
+    return "\n".join([f"USE ROLE {admin_role};", *plan.statements])
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+_SYMBOLS = {"create": "+", "update": "~", "replace": "-/+"}
+
+
+def _echo_plan(plan: Plan, state_file: Path, admin_role: str, output: str) -> None:
+    if output == "json":
+        report = {
+            "state_file": str(state_file),
+            "admin_role": admin_role,
+            "in_sync": plan.in_sync,
+            "changes": [asdict(change) for change in plan.changes],
+        }
+        click.echo(json.dumps(report, indent=2))
+        return
+
+    if not plan.changes:
+        click.echo(f"✓ No changes: {plan.in_sync} objects match {state_file}")
+        return
+    click.echo(
+        f"Plan for {state_file} (role {admin_role}): "
+        f"{len(plan.changes)} to change, {plan.in_sync} in sync"
+    )
+    for change in plan.changes:
+        click.echo()
+        details = f"  ({'; '.join(change.details)})" if change.details else ""
+        click.echo(f"{_SYMBOLS[change.action]} {change.kind} {change.name}{details}")
+        for statement in change.statements:
+            for line in statement.splitlines():
+                click.echo(f"    {line}")
+
+
+def _state_options(fn: Any) -> Any:
+    """Options shared by plan and apply."""
+    options = [
+        click.option(
+            "--state",
+            "-f",
+            "state_file",
+            envvar="SNOW_UTILS_STATE",
+            default="snow-utils.state.yaml",
+            show_default=True,
+            type=click.Path(dir_okay=False, path_type=Path),
+            help="Desired-state file (.yaml, .yml or .json)",
+        ),
+        click.option(
+            "--admin-role",
+            "-a",
+            default=None,
+            help="Role for reads and changes (default: the file's admin_role or ACCOUNTADMIN)",
+        ),
+        click.option(
+            "--workers",
+            type=click.IntRange(min=1),
+            default=None,
+            help="Concurrent SHOW/DESC probes (default: SNOW_UTILS_MAX_WORKERS or 4)",
+        ),
+        click.option(
+            "--output",
+            "-o",
+            type=click.Choice(["text", "json"]),
+            default="text",
+            help="Output format",
+        ),
+        click.option("--verbose", "-v", is_flag=True, help="Enable verbose output"),
+        click.option("--debug", "-d", is_flag=True, help="Enable debug output"),
+        click.option(
+            "--backend",
+            type=click.Choice(["cli", "session"]),
+            envvar="SNOW_UTILS_BACKEND",
+            default="cli",
+            help="SQL backend: 'cli' (snow sql per statement) or 'session' (one reused connection)",
+        ),
+        click.option(
+            "--trace",
+            is_flag=True,
+            help="Print a per-step timing summary when the command finishes",
+        ),
+        click.option(
+            "--trace-file",
+            envvar="SNOW_UTILS_TRACE_FILE",
+            type=click.Path(dir_okay=False, path_type=Path),
+            default=None,
+            help="Write spans as Chrome trace JSON (OTLP/JSON for *.otlp.json); implies --trace",
+        ),
+    ]
+    for option in reversed(options):
+        fn = option(fn)
+    return fn
+
+
+def _compute_plan(
+    ctx: click.Context,
+    state_file: Path,
+    admin_role: str | None,
+    workers: int | None,
+    verbose: bool,
+    debug: bool,
+    backend: str,
+    trace: bool,
+    trace_file: Path | None,
+) -> tuple[Plan, str]:
+    set_snow_cli_options(verbose=verbose, debug=debug, backend=backend)
+    setup_tracing(ctx, trace, trace_file)
+    desired = load_desired_state(state_file)
+    role = (admin_role or desired.admin_role).upper()
+    return plan_changes(desired, fetch_live_state(desired, role, workers)), role
+
+
+@click.command(name="plan", context_settings={"help_option_names": ["-h", "--help"]})
+@_state_options
+@click.option(
+    "--detailed-exitcode",
+    is_flag=True,
+    help="Exit with 2 when changes are pending (0 = in sync)",
+)
+@click.pass_context
+def plan_command(
+    ctx: click.Context,
+    state_file: Path,
+    admin_role: str | None,
+    workers: int | None,
+    output: str,
+    verbose: bool,
+    debug: bool,
+    backend: str,
+    trace: bool,
+    trace_file: Path | None,
+    detailed_exitcode: bool,
+) -> None:
+    """
+    Show the statements that would make Snowflake match a state file.
+
+    Read-only. Objects that already match are not touched; drifted ones get
+    the smallest change (e.g. ADD/REMOVE of single rule values).
+
+    \b
+    Example:
+      snow-utils plan -f snow-utils.state.yaml
+      snow-utils plan --detailed-exitcode -o json
+    """
+    plan, role = _compute_plan(
+        ctx, state_file, admin_role, workers, verbose, debug, backend, trace, trace_file
+    )
+    _echo_plan(plan, state_file, role, output)
+    if detailed_exitcode and plan.changes:
+        ctx.exit(2)
+
+
+@click.command(name="apply", context_settings={"help_option_names": ["-h", "--help"]})
+@_state_options
+@click.option("--yes", "-y", is_flag=True, help="Apply without confirmation")
+@click.pass_context
+def apply_command(
+    ctx: click.Context,
+    state_file: Path,
+    admin_role: str | None,
+    workers: int | None,
+    output: str,
+    verbose: bool,
+    debug: bool,
+    backend: str,
+    trace: bool,
+    trace_file: Path | None,
+    yes: bool,
+) -> None:
+    """
+    Make Snowflake match a state file.
+
+    Computes the plan (see 'snow-utils plan') and runs all of its
+    statements as one script. Nothing is written when nothing drifted.
+
+    \b
+    Example:
+      snow-utils apply -f snow-utils.state.yaml
+      snow-utils apply --yes -o json   # nightly convergence job
+    """
+    if output == "json" and not yes:
+        raise click.UsageError("--output json applies without confirmation; pass --yes")
+    plan, role = _compute_plan(
+        ctx, state_file, admin_role, workers, verbose, debug, backend, trace, trace_file
+    )
+    if output == "text":
+        _echo_plan(plan, state_file, role, output)
+    if plan.changes:
+        if output == "text" and not yes:
+            click.echo()
+            click.confirm(f"Apply {len(plan.changes)} changes?", abort=True)
+        run_snow_sql_stdin(get_apply_script(plan, role))
+
+    if output == "json":
+        _echo_plan(plan, state_file, role, output)
+    elif plan.changes:
+        click.echo()
+        click.echo(f"✓ Applied {len(plan.changes)} changes")
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# Copyright 2026 Snowflake Inc.
+# Generated with Cortex Code
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Warm ``snow-utils shell``: an interactive REPL and a local socket daemon.
+
+Both run ``snow-utils`` command lines in one long-lived process, so modules
+are imported once and the Snowflake session (``session`` backend), the boto3
+default session and the in-memory preset caches stay hot across commands.
+
+What is not shared: SHOW/DESC results are re-read by every command, and
+environment changes made by a command (``KEY=VALUE`` variables) are undone
+afterwards; ``.env`` (searched from the command's working directory) is
+loaded again for every command. A daemon command runs with its client's
+environment in place of the daemon's (except PINNED_ENV). The warm sessions
+follow that environment: a Snowflake session is kept per connection name and
+``SNOWFLAKE_*`` override, and the boto3 session is rebuilt when the
+``AWS_*`` variables differ. Other in-memory caches (presets, AWS account
+IDs per credential) are shared by all commands.
+
+Daemon protocol (Unix socket, one command per connection): the client sends
+one JSON line ``{"argv": [...], "cwd": "...", "env": {...}}`` and receives
+JSON lines ``{"stdout": "..."}`` / ``{"stderr": "..."}`` followed by
+``{"exit": <code>}``. ``snow-utils`` forwards commands automatically when
+``SNOW_UTILS_SOCKET`` names a running daemon.
+"""
+
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import shlex
+import signal
+import socket
+import sys
+from pathlib import Path
+
+import click
+from snow_utils_common.disk_cache import get_cache_dir
+
+# Environment variables the daemon keeps its own values for, whatever the
+# client sends (the warm session is the point of the daemon).
+PINNED_ENV = ("SNOW_UTILS_BACKEND",)
+
+
+def default_socket_path() -> Path:
+    """Daemon socket path (SNOW_UTILS_SOCKET, default <cache dir>/shell.sock)."""
+    if os.environ.get("SNOW_UTILS_SOCKET"):
+        return Path(os.environ["SNOW_UTILS_SOCKET"]).expanduser()
+    return get_cache_dir() / "shell.sock"
+
+
+def run_command(argv: list[str], env: dict[str, str] | None = None) -> int:
+    """Run one command line in this process and return its exit code.
+
+    Args:
+        argv: Arguments after ``snow-utils`` (a leading ``snow-utils`` is ignored)
+        env: Environment for this command only, replacing the shell's, e.g. a
+            daemon client's (pinned variables keep the shell's values)
+    """
+    from dotenv import find_dotenv, load_dotenv
+    from snow_utils_common import reset_inventory
+
+    from snow_utils.cli import dispatch
+
+    if argv[:1] == ["snow-utils"]:
+        argv = argv[1:]
+    if argv[:1] == ["shell"]:
+        click.echo("Error: already in the snow-utils shell", err=True)
+        return 2
+
+    saved_env = dict(os.environ)
+    if env is not None:
+        pinned = {k: os.environ[k] for k in PINNED_ENV if k in os.environ}
+        os.environ.clear()
+        os.environ.update({**env, **pinned})
+    # The CLI modules load .env only when first imported, and that load is
+    # undone with the rest of the environment; load it for every command.
+    load_dotenv(find_dotenv(usecwd=True))
+    reset_inventory()
+    try:
+        dispatch(argv, allow_task=False)
+        return 0
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        click.echo(e.code, err=True)
+        return 1
+    except Exception as e:
+        click.echo(f"Error: {type(e).__name__}: {e}", err=True)
+        return 1
+    finally:
+        os.environ.clear()
+        os.environ.update(saved_env)
+
+
+def repl() -> None:
+    """Read commands from the terminal until ``exit`` or EOF."""
+    with contextlib.suppress(ImportError):
+        import readline  # noqa: F401  (line editing and history for input())
+
+    click.echo("snow-utils shell — run commands without 'snow-utils'; 'exit' to quit.")
+    while True:
+        try:
+            line = input("snow-utils> ").strip()
+        except EOFError:
+            click.echo()
+            return
+        except KeyboardInterrupt:
+            click.echo()
+            continue
+
+        if not line:
+            continue
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            click.echo(f"Error: {e}", err=True)
+            continue
+        if argv[0] in ("exit", "quit"):
+            return
+        if argv[0] == "cd":
+            try:
+                os.chdir(Path(argv[1] if len(argv) > 1 else "~").expanduser())
+            except OSError as e:
+                click.echo(f"Error: {e}", err=True)
+            continue
+        try:
+            run_command(argv)
+        except KeyboardInterrupt:
+            click.echo("\nInterrupted", err=True)
+
+
+class _SocketStream(io.TextIOBase):
+    """Text stream that forwards writes to a daemon client as JSON lines."""
+
+    encoding = "utf-8"
+
+    def __init__(self, wfile: io.BufferedWriter, name: str) -> None:
+        self._wfile = wfile
+        self._name = name
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if not isinstance(text, str):
+            # click probes streams with b"" to tell binary from text ones.
+            raise TypeError(f"write() argument must be str, not {type(text).__name__}")
+        if text:
+            self._wfile.write(json.dumps({self._name: text}).encode() + b"\n")
+            self._wfile.flush()
+        return len(text)
+
+
+def _handle_connection(conn: socket.socket) -> None:
+    rfile = conn.makefile("rb")
+    wfile = conn.makefile("wb")
+    try:
+        request = json.loads(rfile.readline() or b"{}")
+        argv = request.get("argv") or []
+        cwd = os.getcwd()
+        saved_stdin = sys.stdin
+        # No terminal on the other end: prompts see EOF and abort.
+        sys.stdin = io.StringIO("")
+        try:
+            os.chdir(request.get("cwd") or cwd)
+            with (
+                contextlib.redirect_stdout(_SocketStream(wfile, "stdout")),
+                contextlib.redirect_stderr(_SocketStream(wfile, "stderr")),
+            ):
+                exit_code = run_command(argv, env=request.get("env"))
+        finally:
+            sys.stdin = saved_stdin
+            os.chdir(cwd)
+        wfile.write(json.dumps({"exit": exit_code}).encode() + b"\n")
+        wfile.flush()
+    except (OSError, ValueError):
+        pass  # client went away or sent garbage
+    finally:
+        rfile.close()
+        wfile.close()
+
+
+def serve_socket(path: Path) -> None:
+    """Accept commands on a Unix socket until interrupted (one at a time)."""
+    if path.exists():
+        if send_command(["--help"], path, echo=False) is not None:
+            raise click.ClickException(f"A snow-utils shell is already serving {path}")
+        path.unlink()
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o077)  # socket is private to this user
+    try:
+        server.bind(str(path))
+    finally:
+        os.umask(old_umask)
+    server.listen(16)
+    click.echo(f"snow-utils shell listening on {path} (Ctrl-C to stop)", err=True)
+    click.echo(f"  export SNOW_UTILS_SOCKET={path}", err=True)
+
+    # Stop on SIGTERM as on Ctrl-C, so the socket file is removed.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                _handle_connection(conn)
+    except KeyboardInterrupt:
+        click.echo("\nStopped", err=True)
+    finally:
+        server.close()
+        path.unlink(missing_ok=True)
+
+
+def send_command(argv: list[str], path: Path, echo: bool = True) -> int | None:
+    """Run a command in a ``snow-utils shell --serve`` daemon.
+
+    Output is copied to this process's stdout/stderr as it arrives.
+
+    Returns:
+        The command's exit code, or None if no daemon is listening on ``path``
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(str(path))
+    except OSError:
+        client.close()
+        return None
+
+    with client, client.makefile("rb") as rfile:
+        request = {"argv": argv, "cwd": os.getcwd(), "env": dict(os.environ)}
+        client.sendall(json.dumps(request).encode() + b"\n")
+        for line in rfile:
+            message = json.loads(line)
+            if "exit" in message:
+                return message["exit"]
+            if echo:
+                for stream in ("stdout", "stderr"):
+                    if stream in message:
+                        click.echo(message[stream], nl=False, err=stream == "stderr")
+    click.echo("Error: snow-utils shell closed the connection", err=True)
+    return 1
+
+
+def _has_snowflake_connector() -> bool:
+    try:
+        return importlib.util.find_spec("snowflake.connector") is not None
+    except ModuleNotFoundError:
+        return False
+
+
+@click.command(context_settings={"help_option_names": ["-h", "--help"]})
+@click.option("--serve", is_flag=True, help="Run as a daemon on a local socket instead of a REPL")
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Daemon socket (default: $SNOW_UTILS_SOCKET or <cache dir>/shell.sock)",
+)
+@click.option(
+    "--backend",
+    type=click.Choice(["cli", "session"]),
+    default=None,
+    help="SQL backend for commands run in the shell "
+    "(default: session if snowflake-connector-python is installed)",
+)
+def shell(serve: bool, socket_path: Path | None, backend: str | None) -> None:
+    """
+    Warm shell: run snow-utils commands in one long-lived process.
+
+    Keeps the Snowflake session, boto3 session and preset caches across
+    commands. Without --serve, starts an interactive prompt:
+
+    \b
+        snow-utils> networks rule list --db MY_DB
+        snow-utils> pat:create SA_USER=my_sa -- --skip-verify
+
+    With --serve, listens on a local socket; with SNOW_UTILS_SOCKET set to
+    that socket, plain 'snow-utils ...' invocations run in the daemon.
+    Prompts cannot be answered over the socket; pass --yes.
+    """
+    if backend is None:
+        backend = "session" if _has_snowflake_connector() else "cli"
+    os.environ["SNOW_UTILS_BACKEND"] = backend
+    if serve:
+        serve_socket(socket_path or default_socket_path())
+    else:
+        repl()